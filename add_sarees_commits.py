@@ -2,10 +2,23 @@ import os
 import subprocess
 import datetime
 import random
-import json
+import argparse
 
-def add_weekly_commits():
-    """Add commits for every week over past 120 days"""
+from commit_backends import PINNED_IDENTITY, git_raw_date
+from commit_plan import PlannedCommit, mutation_kind
+from mutation_buffer import MutationBuffer
+from mutators import mutation_profile
+from path_index import PathSampler
+
+def add_weekly_commits(seed=None, end_date=None):
+    """Add commits for every week over the 120 days before `end_date`
+
+    A `seed` makes the schedule, file and message choices reproducible
+    and pins the author/committer and timezone (PINNED_IDENTITY), so the
+    same seed, end date and starting commit always give the same HEAD.
+    """
+    rng = random.Random(seed)
+    identity = PINNED_IDENTITY if seed is not None else None
     
     print("📅 Adding weekly commits for past 120 days...")
     
@@ -23,34 +36,15 @@ def add_weekly_commits():
         "security: implemented security improvements"
     ]
     
-    # Your project files
-    project_files = [
-        "src/App.vue",
-        "src/main.js",
-        "src/components/CustomizationPanel.vue",
-        "src/components/FabricSelector.vue",
-        "src/components/ColorPicker.vue", 
-        "src/components/Preview3D.vue",
-        "src/styles/main.css",
-        "src/utils/helpers.js",
-        "src/data/patterns.json",
-        "package.json",
-        "vite.config.ts",
-        "tailwind.config.js",
-        "README.md",
-        "index.html",
-        "yarn.lock",
-        "eslint.config.js",
-        "package-lock.json",
-        "postcss.config.js",
-        "tailwind.config.js",
-        "tsconfig.json",
-        "tsconfig.node.json",
-        
-    ]
+    # Sample from the files git already tracks (see path_index.py), so a run
+    # never creates stray files that are not part of the project
+    project_files = PathSampler.from_index()
+    # Files are changed by kind the way fixed_weekly_commits.py does (see mutators.py)
+    profile = mutation_profile()
     
     # Calculate 120 days ago
-    end_date = datetime.datetime.now()
+    if end_date is None:
+        end_date = datetime.datetime.now()
     start_date = end_date - datetime.timedelta(days=120)
     
     commit_count = 0
@@ -66,59 +60,37 @@ def add_weekly_commits():
         print(f"\n📍 Week {week_count}: {current_date.strftime('%Y-%m-%d')}")
         
         # Each week, commit on 2-4 different days
-        days_in_week = random.randint(2, 4)
+        days_in_week = rng.randint(2, 4)
         
         for day_in_week in range(days_in_week):
             # Skip to a random day in the week (0-6 days from current week start)
-            commit_date = current_date + datetime.timedelta(days=random.randint(0, 6))
+            commit_date = current_date + datetime.timedelta(days=rng.randint(0, 6))
             
             # Don't go beyond end date
             if commit_date > end_date:
                 continue
             
             # 1-3 commits per commit day
-            commits_today = random.randint(1, 3)
+            commits_today = rng.randint(1, 3)
             
             for commit_num in range(commits_today):
                 # Working hours
-                hour = random.randint(9, 18)
-                minute = random.randint(0, 59)
+                hour = rng.randint(9, 18)
+                minute = rng.randint(0, 59)
                 
                 commit_time = commit_date.replace(hour=hour, minute=minute)
                 git_date_str = commit_time.strftime("%Y-%m-%dT%H:%M:%S")
                 
                 # Select file to modify
-                file_to_modify = random.choice(project_files)
-                os.makedirs(os.path.dirname(file_to_modify), exist_ok=True)
+                file_to_modify = rng.choice(project_files)
                 
                 # Add content to file
                 try:
-                    if file_to_modify.endswith(('.js', '.ts', '.vue')):
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n// Week {week_count} update - {commit_time.strftime('%Y-%m-%d')}\n")
-                    elif file_to_modify.endswith('.css'):
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n/* Week {week_count} update - {commit_time.strftime('%Y-%m-%d')} */\n")
-                    elif file_to_modify.endswith('.json'):
-                        if os.path.exists(file_to_modify):
-                            with open(file_to_modify, "r+", encoding="utf-8") as f:
-                                try:
-                                    data = json.load(f)
-                                    if "updates" not in data:
-                                        data["updates"] = []
-                                    data["updates"].append(f"Week {week_count} - {commit_time.strftime('%Y-%m-%d')}")
-                                    f.seek(0)
-                                    json.dump(data, f, indent=2)
-                                    f.truncate()
-                                except:
-                                    f.write(f"\n// Week {week_count} - {commit_time.strftime('%Y-%m-%d')}\n")
-                    elif file_to_modify == "README.md":
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n### Week {week_count} Updates\n")
-                            f.write(f"- Enhanced features on {commit_time.strftime('%Y-%m-%d')}\n")
-                    else:
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\nUpdate Week {week_count} - {commit_time.strftime('%Y-%m-%d')}\n")
+                    record = PlannedCommit(timestamp=git_date_str, week=week_count, commit_num=commit_num,
+                                           path=file_to_modify, kind=mutation_kind(file_to_modify), message="")
+                    buffer = MutationBuffer()
+                    profile.apply(buffer, record, commit_time)
+                    buffer.flush()
                             
                 except Exception as e:
                     print(f"⚠️  Could not modify {file_to_modify}: {e}")
@@ -130,10 +102,14 @@ def add_weekly_commits():
                 subprocess.run(["git", "add", "."], check=True)
                 
                 env = os.environ.copy()
+                if identity is not None:
+                    git_date_str = git_raw_date(commit_time, identity.tz)
+                    env["GIT_AUTHOR_NAME"] = env["GIT_COMMITTER_NAME"] = identity.name
+                    env["GIT_AUTHOR_EMAIL"] = env["GIT_COMMITTER_EMAIL"] = identity.email
                 env["GIT_AUTHOR_DATE"] = git_date_str
                 env["GIT_COMMITTER_DATE"] = git_date_str
                 
-                message = random.choice(weekly_messages)
+                message = rng.choice(weekly_messages)
                 full_message = f"{message} - Week {week_count}"
                 
                 result = subprocess.run([
@@ -151,7 +127,16 @@ def add_weekly_commits():
     
     return commit_count
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Add weekly commits over the past 120 days")
+    parser.add_argument("--seed", type=int,
+                        help="seed the schedule and pin the commit identity for reproducible history")
+    parser.add_argument("--end-date", type=datetime.datetime.fromisoformat,
+                        help="end of the 120-day window (ISO date/time, default: now)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("=" * 60)
     print("👗 HEKO SARES - WEEKLY COMMITS (120 DAYS)")
     print("=" * 60)
@@ -165,7 +150,7 @@ def main():
         os.makedirs("src/utils/weekly_updates", exist_ok=True)
         os.makedirs("src/data", exist_ok=True)
         
-        total_commits = add_weekly_commits()
+        total_commits = add_weekly_commits(seed=args.seed, end_date=args.end_date)
         
         print(f"\n🎉 SUCCESS! Added {total_commits} commits over {120//7} weeks!")
         print("\n➡️  Next: Run 'git push origin main'")
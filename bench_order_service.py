@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import tempfile
+from collections import Counter
+
+from catalog_compiler import CATALOG_PATH, read_catalog
+from order_service import ADD_ONS, DEFAULT_HOST, DEFAULT_PORT, DESIGN_PARTS, run_service
+
+BENCH_SEED = 1234
+# Share of designs saved before the customer reached these steps, so the parts are still null
+UNPICKED_PARTS = ("border", "blouse")
+UNPICKED_SHARE = 0.1
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def catalog_items(catalog):
+    """{collection: [record]} for the collections designs are made from"""
+    items = {}
+    for name in {name for parts in DESIGN_PARTS.values() for name in parts.values()}:
+        collection = catalog["collections"].get(name, {"fields": [], "rows": []})
+        items[name] = [{field: value for field, value in zip(collection["fields"], row) if value is not None}
+                       for row in collection["rows"]]
+    return items
+
+
+def make_design(product, items, rng):
+    """A CustomSaree/CustomBlouse with random parts, priced as App.tsx does"""
+    design = {}
+    total = 0
+    for part, collection in DESIGN_PARTS[product].items():
+        choice = rng.choice(items[collection]) if items[collection] else None
+        if part in UNPICKED_PARTS and rng.random() < UNPICKED_SHARE:
+            choice = None
+        design[part] = choice
+        total += (choice or {}).get("price", 0)
+    design["embroidery"] = rng.random() < 0.3
+    design["embroideryText"] = "Happy Diwali" if design["embroidery"] and rng.random() < 0.5 else ""
+    if product == "blouse":
+        design["embroideryDesign"] = "floral" if design["embroidery"] else ""
+    total += sum(amount for field, amount in ADD_ONS[product].items() if design.get(field))
+    design["totalPrice"] = total
+    return design
+
+
+def make_payload(number, items, rng, design_share=0.2, invalid_share=0.0, prefix=""):
+    """(path, body) of one order or saved design; some are deliberately mispriced"""
+    product = rng.choice(sorted(DESIGN_PARTS))
+    design = make_design(product, items, rng)
+    if rng.random() < invalid_share:
+        design["totalPrice"] += 1
+    now = datetime.datetime(2025, 10, 20) + datetime.timedelta(seconds=number)
+    if rng.random() < design_share:
+        payload = {"id": f"DES-{prefix}{number}", "name": f"Festive look {number}", "type": product, "design": design,
+                   "createdAt": now.isoformat(), "thumbnail": "", "tags": ["festival"]}
+        return "/designs", json.dumps(payload).encode("utf-8")
+    customer = {"name": f"Customer {number}", "email": f"customer{number}@example.com", "phone": "9876543210",
+                "address": f"{number} MG Road", "city": "Bengaluru", "pincode": "560001"}
+    payload = {"orderId": f"ORD-{prefix}{number}", "customer": customer, "product": product, "design": design,
+               "totalPrice": design["totalPrice"], "orderDate": now.isoformat()}
+    return "/orders", json.dumps(payload).encode("utf-8")
+
+
+async def _request(reader, writer, host, path, body):
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length:"))
+    await reader.readexactly(length)
+    return int(lines[0].split(" ", 2)[1])
+
+
+async def generate_load(host, port, payloads, connections, rate=None):
+    """Send every payload over `connections` keep-alive connections; return (latencies, statuses, seconds)
+
+    With a `rate` (requests/s) request i is due at i / rate and its
+    latency counts from then, not from when a connection got free, so a
+    stalled server shows up in the percentiles instead of slowing the
+    generator down (coordinated omission).
+    """
+    latencies = []
+    statuses = Counter()
+    position = 0
+    started = time.perf_counter()
+
+    async def worker():
+        nonlocal position
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while position < len(payloads):
+                number = position
+                position += 1
+                due = started + number / rate if rate else time.perf_counter()
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                path, body = payloads[number]
+                status = await _request(reader, writer, host, path, body)
+                latencies.append(time.perf_counter() - due)
+                statuses[status] += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def percentile(ordered, share):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(share / 100 * len(ordered)) - 1))]
+
+
+async def run_local(catalog_path, db_path, payloads, connections, rate):
+    # A service on an ephemeral port in this process, stopped once the load is done
+    ready = asyncio.get_running_loop().create_future()
+    service = asyncio.create_task(run_service(catalog_path, db_path, DEFAULT_HOST, 0,
+                                              ready=lambda server: ready.set_result(server)))
+    server = await ready
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await generate_load(DEFAULT_HOST, port, payloads, connections, rate)
+    finally:
+        service.cancel()
+        await asyncio.gather(service, return_exceptions=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the order service and report latency percentiles")
+    parser.add_argument("--requests", type=int, default=20000, help="requests to send (default: 20000)")
+    parser.add_argument("--connections", type=int, default=64, help="keep-alive connections (default: 64)")
+    parser.add_argument("--rate", type=float,
+                        help="open-loop target in requests/s (default: as fast as the server answers)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"service host (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int,
+                        help=f"load a running service on this port, e.g. {DEFAULT_PORT} "
+                             "(default: start one against a temporary database)")
+    parser.add_argument("--catalog", default=CATALOG_PATH,
+                        help=f"catalog the payloads come from (default: {CATALOG_PATH})")
+    parser.add_argument("--design-share", type=float, default=0.2,
+                        help="share of saved designs among the requests (default: 0.2)")
+    parser.add_argument("--invalid-share", type=float, default=0.0,
+                        help="share of mispriced payloads, answered with 400 (default: 0)")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED, help=f"payload seed (default: {BENCH_SEED})")
+    parser.add_argument("--json-out", metavar="PATH", help="also write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - ORDER SERVICE LOAD TEST")
+    print("=" * 70)
+
+    if not os.path.exists(args.catalog):
+        print(f"❌ No catalog at {args.catalog} (run catalog_compiler.py first)")
+        sys.exit(1)
+    items = catalog_items(read_catalog(args.catalog))
+    rng = random.Random(args.seed)
+    # Order ids carry a run stamp so reruns against one database are not duplicates
+    stamp = int(time.time())
+    payloads = [make_payload(number, items, rng, args.design_share, args.invalid_share, f"{stamp}-")
+                for number in range(args.requests)]
+    print(f"  🧾 {len(payloads)} payloads, {args.connections} connections, "
+          f"{f'{args.rate:,.0f} req/s target' if args.rate else 'closed loop'}")
+
+    if args.port is None:
+        with tempfile.TemporaryDirectory(prefix="heeko-orders-") as directory:
+            latencies, statuses, elapsed = asyncio.run(run_local(args.catalog, os.path.join(directory, "orders.db"),
+                                                                 payloads, args.connections, args.rate))
+    else:
+        latencies, statuses, elapsed = asyncio.run(generate_load(args.host, args.port, payloads, args.connections,
+                                                                 args.rate))
+
+    latencies.sort()
+    report = {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "latency_ms": {f"p{share:g}": round(percentile(latencies, share) * 1000, 2) for share in PERCENTILES},
+    }
+    report["latency_ms"]["max"] = round(latencies[-1] * 1000, 2) if latencies else 0.0
+    print(f"  ⚡ {report['requests_per_second']:,} requests/s ({report['requests']} in {elapsed:.2f}s)")
+    print(f"  📬 Statuses: {', '.join(f'{status} x{count}' for status, count in report['statuses'].items())}")
+    print(f"  ⏱️  Latency: {', '.join(f'{name} {value}ms' for name, value in report['latency_ms'].items())}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Wrote {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
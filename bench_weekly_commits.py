@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import datetime
+import platform
+import resource
+import tempfile
+import subprocess
+import concurrent.futures
+
+import fixed_weekly_commits
+from commit_backends import PINNED_IDENTITY
+from fixed_weekly_commits import BACKENDS, PROJECT_FILES, WRITERS, apply_plan, plan_commits
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BENCH_SEED = 1234
+BENCH_END_DATE = datetime.datetime(2025, 1, 1)
+
+# Average commits per week the planner produces (2-4 days x 1-3 commits)
+COMMITS_PER_WEEK = 6
+# Longest history a benchmark spans; bigger sizes get busier days instead
+# of dates reaching back decades (100k commits would start around 1625)
+BENCH_MAX_DAYS = 2 * 365
+
+# The repo the scratch repos copy PROJECT_FILES from, wherever this runs
+SOURCE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def plan_for_size(commits):
+    """Plan exactly `commits` commits on a fixed seed and end date
+
+    The window grows with the size up to BENCH_MAX_DAYS. Past that,
+    further plans over the same window are merged in by timestamp, which
+    raises the commits per day.
+    """
+    days = min(int(commits / COMMITS_PER_WEEK * 7 * 1.25) + 14, BENCH_MAX_DAYS)
+    rng = random.Random(BENCH_SEED)
+    plan = []
+    while len(plan) < commits:
+        plan.extend(plan_commits(end_date=BENCH_END_DATE, days=days, rng=rng))
+    plan.sort(key=lambda record: record.timestamp)
+    return plan[:commits]
+
+
+def create_scratch_repo(source_root):
+    """Create a throwaway repo seeded with the project files and one commit"""
+    repo = tempfile.mkdtemp(prefix="heeko-bench-")
+    for path in PROJECT_FILES:
+        source = os.path.join(source_root, path)
+        if os.path.exists(source):
+            target = os.path.join(repo, path)
+            os.makedirs(os.path.dirname(target) or repo, exist_ok=True)
+            shutil.copyfile(source, target)
+
+    env = os.environ.copy()
+    env["GIT_AUTHOR_NAME"] = env["GIT_COMMITTER_NAME"] = PINNED_IDENTITY.name
+    env["GIT_AUTHOR_EMAIL"] = env["GIT_COMMITTER_EMAIL"] = PINNED_IDENTITY.email
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "initial import"], cwd=repo, env=env, check=True)
+    return repo
+
+
+_Popen = subprocess.Popen
+
+
+class CountingPopen(_Popen):
+    """subprocess.Popen that counts every process it spawns"""
+
+    spawned = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingPopen.spawned += 1
+        super().__init__(*args, **kwargs)
+
+
+def run_case(backend, commits, source_root=SOURCE_ROOT):
+    """Run one benchmark case; meant to run in its own child process"""
+    plan = plan_for_size(commits)
+    repo = create_scratch_repo(source_root)
+    previous = os.getcwd()
+    try:
+        os.chdir(repo)
+        subprocess.Popen = CountingPopen
+        started = time.perf_counter()
+        created = apply_plan(plan, backend=backend, verbose=False, identity=PINNED_IDENTITY)
+        elapsed = time.perf_counter() - started
+    finally:
+        subprocess.Popen = _Popen
+        os.chdir(previous)
+        shutil.rmtree(repo, ignore_errors=True)
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "backend": backend,
+        "commits": created,
+        "wall_seconds": round(elapsed, 4),
+        "commits_per_second": round(created / elapsed, 2) if elapsed else None,
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "peak_child_rss_bytes": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+        "subprocesses": CountingPopen.spawned,
+    }
+
+
+def git_version():
+    result = subprocess.run(["git", "--version"], capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def run_benchmarks(backends, sizes, porcelain_limit, source_root=SOURCE_ROOT):
+    results = []
+    for commits in sizes:
+        for backend in backends:
+            if backend not in WRITERS and commits > porcelain_limit:
+                print(f"  ⏭️  {backend:<12} {commits:>8} commits: skipped (--porcelain-limit {porcelain_limit})")
+                results.append({"backend": backend, "commits": commits, "skipped": True})
+                continue
+            # A fresh process per case keeps peak RSS and spawn counts separate
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_case, backend, commits, source_root).result()
+            results.append(result)
+            print(f"  ⏱️  {backend:<12} {commits:>8} commits: {result['wall_seconds']:.2f}s, "
+                  f"{result['commits_per_second']:.0f} commits/s, "
+                  f"{result['peak_rss_bytes'] / 2**20:.1f} MiB RSS, "
+                  f"{result['subprocesses']} subprocesses")
+    return results
+
+
+def compare_reports(old_report, results, threshold):
+    """Print throughput changes against an earlier report; return regressions"""
+    previous = {
+        (r["backend"], r["commits"]): r
+        for r in old_report.get("results", [])
+        if not r.get("skipped")
+    }
+    regressions = []
+    for result in results:
+        if result.get("skipped"):
+            continue
+        old = previous.get((result["backend"], result["commits"]))
+        if not old or not old.get("commits_per_second"):
+            continue
+        change = result["commits_per_second"] / old["commits_per_second"] - 1
+        marker = "🔻" if change < -threshold else "  "
+        print(f"  {marker} {result['backend']:<12} {result['commits']:>8} commits: {change:+.1%} commits/s")
+        if change < -threshold:
+            regressions.append(result)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the weekly commit history generator")
+    parser.add_argument("--backend", dest="backends", action="append", choices=BACKENDS,
+                        help="backend to benchmark (repeatable, default: all)")
+    parser.add_argument("--sizes", type=lambda value: [int(n) for n in value.split(",")],
+                        default=DEFAULT_SIZES, help="comma-separated commit counts (default: 1000,10000,100000)")
+    parser.add_argument("--porcelain-limit", type=int, default=1000,
+                        help="skip porcelain/pipelined runs larger than this many commits (default: 1000)")
+    parser.add_argument("--report", default="bench_report.json",
+                        help="where to write the JSON report (default: bench_report.json)")
+    parser.add_argument("--compare", metavar="REPORT",
+                        help="earlier report to compare commits/s against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown treated as a regression with --compare (default: 0.1)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    backends = args.backends or list(BACKENDS)
+
+    print("=" * 70)
+    print("👗 HEKO SARES - COMMIT GENERATOR BENCHMARK")
+    print("=" * 70)
+
+    results = run_benchmarks(backends, args.sizes, args.porcelain_limit)
+    report = {
+        "generator_version": fixed_weekly_commits.GENERATOR_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git": git_version(),
+        "results": results,
+    }
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Report written to {args.report}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old_report = json.load(f)
+        print(f"\n📊 Compared with {args.compare}:")
+        if compare_reports(old_report, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os
+import ast
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+import catalog_compiler
+import facet_index
+import price_table
+import recommendation_index
+from catalog_compiler import (ASSETS_MANIFEST, CATALOG_PATH, DATA_MODULES, TYPES_MODULE, CatalogError, attach_assets,
+                              compile_catalog, parse_cached, parse_module, parse_types, read_catalog, write_catalog,
+                              write_json)
+
+BUILD_STAMP = ".catalog_build.json"
+BUILD_VERSION = 1
+
+# colors.json holds no records yet, but it is data the catalog will draw
+# on, so it is tracked with the TypeScript modules
+COLORS_DATA = "src/data/colors.json"
+SOURCES = DATA_MODULES + (COLORS_DATA, TYPES_MODULE)
+# Keys a JSON source changes without its data changing (the commit
+# generator bumps lastUpdated), left out of its content hash
+VOLATILE_KEYS = {COLORS_DATA: ("lastUpdated",)}
+
+# The artifacts derived from the catalog: (name, output, builder module,
+# collections read, or None for all of them)
+ARTIFACTS = (
+    ("price_table", price_table.PRICE_TABLE_PATH, price_table,
+     tuple(name for name, _ in price_table.SAREE_AXES), price_table.build_price_table),
+    ("recommendations", recommendation_index.RECOMMENDATIONS_PATH, recommendation_index,
+     tuple(recommendation_index.ITEM_FEATURES), recommendation_index.build_recommendations),
+    ("facet_index", facet_index.FACET_INDEX_PATH, facet_index, None, facet_index.build_facet_index),
+)
+
+WATCH_INTERVAL = 0.2
+
+# Builders import their helpers from modules next to this one
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _canonical(document):
+    return json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def source_hash(path):
+    """Content hash of a source file (None if missing), ignoring its VOLATILE_KEYS"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    volatile = VOLATILE_KEYS.get(path)
+    if volatile:
+        try:
+            document = json.loads(data)
+        except ValueError:
+            return _digest(data)
+        if isinstance(document, dict):
+            data = _canonical({key: value for key, value in document.items() if key not in volatile})
+    return _digest(data)
+
+
+def _local_imports(path):
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+    paths = (os.path.join(PROJECT_DIR, name.split(".")[0] + ".py") for name in names)
+    return [path for path in paths if os.path.exists(path)]
+
+
+def code_files(module):
+    """A builder module's file plus every project module it imports, directly or not"""
+    seen = set()
+    pending = [os.path.abspath(module.__file__)]
+    while pending:
+        path = pending.pop()
+        if path not in seen:
+            seen.add(path)
+            pending.extend(_local_imports(path))
+    return sorted(seen)
+
+
+def code_hash(module):
+    """Hash of the code_files() of a builder, so changing any of them rebuilds its artifact"""
+    digest = hashlib.sha256()
+    for path in code_files(module):
+        with open(path, "rb") as f:
+            digest.update(f"{os.path.relpath(path, PROJECT_DIR)}\0{_digest(f.read())}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def collection_hashes(catalog):
+    """{collection: content hash} of a compiled catalog"""
+    return {name: _digest(_canonical(collection)) for name, collection in catalog["collections"].items()}
+
+
+def read_stamp(path=BUILD_STAMP):
+    """The hashes the last build recorded, or an empty stamp"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stamp if stamp.get("version") == BUILD_VERSION else {}
+
+
+def _current(record, key, output):
+    return record is not None and record.get("key") == key and os.path.exists(output)
+
+
+def _compile(cache):
+    # Parse every module first: a module that does not parse (say, half
+    # saved in an editor) fails the build instead of dropping its records,
+    # so the catalog and artifacts from the last good build stay in place
+    for path in DATA_MODULES:
+        _, problems = parse_cached(path, parse_module, cache)
+        if problems:
+            raise CatalogError("; ".join(problems))
+    parse_cached(TYPES_MODULE, parse_types, cache)
+    catalog, _, problems = compile_catalog(DATA_MODULES, TYPES_MODULE, cache)
+    if os.path.exists(ASSETS_MANIFEST):
+        attach_assets(catalog, ASSETS_MANIFEST)
+    write_catalog(catalog, CATALOG_PATH)
+    return catalog, problems
+
+
+def build(cache=None, force=False, stamp_path=BUILD_STAMP):
+    """Rebuild the catalog and the artifacts whose inputs changed; return a report
+
+    The catalog is recompiled when a source, the assets manifest or the
+    compiler changed. Each artifact is keyed by the hashes of the compiled
+    collections it reads plus its builder's code, so an edit that leaves
+    those collections as they were (a review, a lastUpdated bump) stops at
+    the catalog. Pass the same `cache` dict between calls to re-parse
+    only the modules that changed.
+    """
+    started = time.perf_counter()
+    stamp = {} if force else read_stamp(stamp_path)
+    records = dict(stamp.get("artifacts", {}))
+    sources = {path: source_hash(path) for path in SOURCES}
+    previous = stamp.get("sources", {})
+    report = {"changed": [path for path in SOURCES if sources[path] != previous.get(path)],
+              "built": [], "skipped": [], "failed": {}, "problems": []}
+    collections = stamp.get("collections", {})
+
+    catalog = None
+    key = _digest(_canonical({"sources": sources, "assets": source_hash(ASSETS_MANIFEST),
+                              "code": code_hash(catalog_compiler)}))
+    if _current(records.get("catalog"), key, CATALOG_PATH):
+        report["skipped"].append("catalog")
+    else:
+        try:
+            catalog, report["problems"] = _compile(cache)
+        except (CatalogError, OSError, ValueError) as e:
+            report["failed"]["catalog"] = str(e)
+            report["seconds"] = time.perf_counter() - started
+            return report
+        collections = collection_hashes(catalog)
+        records["catalog"] = {"key": key}
+        report["built"].append("catalog")
+
+    for name, output, module, reads, builder in ARTIFACTS:
+        inputs = {collection: collections.get(collection) for collection in (reads or sorted(collections))}
+        key = _digest(_canonical({"collections": inputs, "code": code_hash(module)}))
+        if _current(records.get(name), key, output):
+            report["skipped"].append(name)
+            continue
+        try:
+            if catalog is None:
+                catalog = read_catalog(CATALOG_PATH)
+            write_json(builder(catalog), output)
+        except (OSError, ValueError) as e:
+            report["failed"][name] = str(e)
+            records.pop(name, None)
+            continue
+        records[name] = {"key": key}
+        report["built"].append(name)
+
+    write_json({"version": BUILD_VERSION, "sources": sources, "collections": collections, "artifacts": records},
+               stamp_path)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def print_report(report):
+    changed = ", ".join(os.path.basename(path) for path in report["changed"]) or "nothing"
+    print(f"  🔍 Changed: {changed}")
+    if report["built"]:
+        print(f"  🔨 Rebuilt: {', '.join(report['built'])}")
+    if report["skipped"]:
+        print(f"  ⏭️  Up to date: {', '.join(report['skipped'])}")
+    if report["problems"]:
+        print(f"  ⚠️  {len(report['problems'])} records or modules left out (see catalog_compiler.py)")
+    for name, error in report["failed"].items():
+        print(f"  ❌ {name}: {error}")
+    print(f"  ⏱️  {report['seconds'] * 1000:.0f} ms")
+
+
+def _snapshot(paths):
+    snapshot = {}
+    for path in paths:
+        try:
+            status = os.stat(path)
+            snapshot[path] = (status.st_mtime_ns, status.st_size)
+        except FileNotFoundError:
+            snapshot[path] = None
+    return snapshot
+
+
+def watch(interval=WATCH_INTERVAL, stamp_path=BUILD_STAMP):
+    """Poll the sources and builder code every `interval` seconds and rebuild on change"""
+    modules = (catalog_compiler,) + tuple(entry[2] for entry in ARTIFACTS)
+    paths = list(SOURCES) + [ASSETS_MANIFEST] + sorted({path for module in modules for path in code_files(module)})
+    cache = {}
+    last = None
+    while True:
+        snapshot = _snapshot(paths)
+        if snapshot != last:
+            if last is not None:
+                print(f"\n🔁 {time.strftime('%H:%M:%S')} change detected")
+            print_report(build(cache, stamp_path=stamp_path))
+            sys.stdout.flush()
+            # Changes made during the build are caught by the next poll
+            last = snapshot
+        time.sleep(interval)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the catalog and its derived files when the data changes")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep polling the data modules and rebuild on every save")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                        help=f"seconds between polls in --watch mode (default: {WATCH_INTERVAL})")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild everything, ignoring the recorded hashes")
+    parser.add_argument("--stamp", default=BUILD_STAMP,
+                        help=f"where the hashes of the last build are kept (default: {BUILD_STAMP})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - CATALOG BUILD")
+    print("=" * 70)
+
+    if args.watch:
+        print(f"👀 Watching {len(SOURCES)} sources every {args.interval}s (Ctrl-C to stop)")
+        try:
+            watch(args.interval, args.stamp)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped")
+        return
+
+    report = build(force=args.force, stamp_path=args.stamp)
+    print_report(report)
+    if report["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
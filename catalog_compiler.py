@@ -0,0 +1,591 @@
+import os
+import re
+import sys
+import json
+import bisect
+import hashlib
+import argparse
+import tempfile
+
+# The product modules, in merge order: for a record id present in several
+# modules, fields from later modules win (enhancedProductData is the richest)
+DATA_MODULES = (
+    "src/data/sareeData.ts",
+    "src/data/productData.ts",
+    "src/data/enhancedProductData.ts",
+)
+TYPES_MODULE = "src/types/products.ts"
+
+# Served from public/ by Vite, so the catalog is fetched at runtime
+# instead of being bundled with the components
+CATALOG_PATH = os.path.join("public", "catalog.json")
+CATALOG_VERSION = 1
+
+# Written by image_pipeline.py; its derivatives are attached to the catalog
+ASSETS_MANIFEST = os.path.join("public", "assets", "manifest.json")
+# Manifest fields the front end needs to render an item's image
+ASSET_FIELDS = ("width", "height", "placeholder", "srcset", "atlas")
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)
+  | (?P<number>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>=>|[\[\]{}(),:;.?|&<>=*+/!-])
+""", re.VERBOSE | re.DOTALL)
+
+_ESCAPE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\n|.)")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0", "\n": ""}
+
+_PRIMITIVES = {
+    "string": lambda value: isinstance(value, str),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    # `new Date('...')` literals are kept as their ISO string
+    "Date": lambda value: isinstance(value, str),
+    "null": lambda value: value is None,
+    "undefined": lambda value: value is None,
+    "any": lambda value: True,
+    "unknown": lambda value: True,
+}
+
+
+class CatalogError(ValueError):
+    """A syntax error in a TypeScript module, with the file and line it was found at"""
+
+    def __init__(self, message, path=None, line=None):
+        self.path = path
+        self.line = line
+        where = f"{path}:{line}: " if path and line else (f"{path}: " if path else "")
+        super().__init__(where + message)
+
+
+class Ref:
+    """A reference to another export's element, e.g. `colors[0]`"""
+
+    def __init__(self, collection, record):
+        self.collection = collection
+        self.record = record
+
+    def to_json(self):
+        return {"collection": self.collection, "id": self.record.get("id")}
+
+
+def _unescape(match):
+    escape = match.group(1)
+    if escape[0] == "u":
+        return chr(int(escape[1:].strip("{}"), 16))
+    if escape[0] == "x":
+        return chr(int(escape[1:], 16))
+    return _ESCAPES.get(escape, escape)
+
+
+def tokenize(source, path=None):
+    """Split TypeScript source into (kind, text, offset) tokens, dropping whitespace and comments"""
+    tokens = []
+    position = 0
+    while position < len(source):
+        match = _TOKEN.match(source, position)
+        if match is None:
+            line = source.count("\n", 0, position) + 1
+            raise CatalogError(f"unexpected character {source[position]!r}", path, line)
+        if match.lastgroup != "space":
+            tokens.append((match.lastgroup, match.group(), position))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for the object literals and types the data modules use"""
+
+    def __init__(self, source, path=None):
+        self.source = source
+        self.path = path
+        self.tokens = tokenize(source, path)
+        self.position = 0
+        self._newlines = None
+
+    def line_of(self, offset):
+        if self._newlines is None:
+            self._newlines = [i for i, char in enumerate(self.source) if char == "\n"]
+        return bisect.bisect(self._newlines, offset) + 1
+
+    def error(self, message):
+        token = self.peek()
+        offset = token[2] if token else len(self.source)
+        return CatalogError(message, self.path, self.line_of(offset))
+
+    def peek(self, ahead=0):
+        index = self.position + ahead
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def at(self, text, ahead=0):
+        token = self.peek(ahead)
+        return token is not None and token[0] in ("punct", "name") and token[1] == text
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise self.error("unexpected end of file")
+        self.position += 1
+        return token
+
+    def expect(self, text):
+        if not self.at(text):
+            found = self.peek()
+            raise self.error(f"expected {text!r}, found {found[1]!r}" if found else f"expected {text!r}")
+        return self.next()
+
+    def skip_to(self, *texts):
+        while self.peek() is not None and not any(self.at(text) for text in texts):
+            self.position += 1
+
+    # Values
+
+    def value(self, resolve):
+        kind, text, _ = self.peek() or (None, None, None)
+        if kind == "string":
+            self.next()
+            return _ESCAPE.sub(_unescape, text[1:-1])
+        if kind == "number":
+            self.next()
+            number = float(text)
+            return int(number) if number.is_integer() and not re.search(r"[.eE]", text) else number
+        if text == "[":
+            return self._array(resolve)
+        if text == "{":
+            return self._object(resolve)
+        if kind == "name":
+            return self._named(resolve)
+        raise self.error(f"unexpected {text!r}" if text else "unexpected end of file")
+
+    def _array(self, resolve):
+        self.expect("[")
+        items = []
+        while not self.at("]"):
+            items.append(self.value(resolve))
+            if not self.at("]"):
+                self.expect(",")
+        self.next()
+        return items
+
+    def _object(self, resolve):
+        self.expect("{")
+        result = {}
+        while not self.at("}"):
+            kind, key, _ = self.next()
+            if kind == "string":
+                key = _ESCAPE.sub(_unescape, key[1:-1])
+            elif kind not in ("name", "number"):
+                self.position -= 1
+                raise self.error(f"unexpected {key!r} in object literal")
+            self.expect(":")
+            result[key] = self.value(resolve)
+            if not self.at("}"):
+                self.expect(",")
+        self.next()
+        return result
+
+    def _named(self, resolve):
+        _, name, _ = self.next()
+        if name in ("true", "false"):
+            return name == "true"
+        if name in ("null", "undefined"):
+            return None
+        if name == "new" and self.at("Date"):
+            self.next()
+            self.expect("(")
+            moment = self.value(resolve)
+            self.expect(")")
+            return moment
+        if self.at("["):
+            self.next()
+            kind, index, _ = self.next()
+            if kind != "number":
+                self.position -= 1
+                raise self.error("only numeric indexes are supported")
+            self.expect("]")
+            return resolve(name, int(index))
+        self.position -= 1
+        raise self.error(f"unsupported expression {name!r}")
+
+    # Types
+
+    def type_expression(self):
+        alternatives = [self._postfix_type()]
+        while self.at("|"):
+            self.next()
+            alternatives.append(self._postfix_type())
+        return alternatives[0] if len(alternatives) == 1 else ("union", alternatives)
+
+    def _postfix_type(self):
+        if self.at("|"):
+            # A leading `|` before the first alternative
+            self.next()
+        kind, text, _ = self.next()
+        if kind == "string":
+            result = ("literal", _ESCAPE.sub(_unescape, text[1:-1]))
+        elif kind == "number":
+            result = ("literal", float(text))
+        elif text == "(":
+            result = self.type_expression()
+            self.expect(")")
+        elif text == "{":
+            self.position -= 1
+            result = ("object", self.fields())
+        elif kind == "name" and self.at("<"):
+            # Array<T>; other generics are taken as their own name
+            self.next()
+            argument = self.type_expression()
+            self.expect(">")
+            result = ("array", argument) if text in ("Array", "ReadonlyArray") else ("name", text)
+        elif kind == "name":
+            result = ("name", text)
+        else:
+            self.position -= 1
+            raise self.error(f"unexpected {text!r} in type")
+        while self.at("[") and self.at("]", 1):
+            self.position += 2
+            result = ("array", result)
+        return result
+
+    def fields(self):
+        """Parse `{ name?: type; ... }` into {name: (type, optional)}"""
+        self.expect("{")
+        fields = {}
+        while not self.at("}"):
+            _, name, _ = self.next()
+            optional = self.at("?")
+            if optional:
+                self.next()
+            self.expect(":")
+            fields[name] = (self.type_expression(), optional)
+            if self.at(";") or self.at(","):
+                self.next()
+        self.next()
+        return fields
+
+
+def parse_types(path=TYPES_MODULE):
+    """Return {name: type} for every interface and type alias declared in `path`"""
+    with open(path, "r", encoding="utf-8") as f:
+        parser = _Parser(f.read(), path)
+    types = {}
+    while parser.peek() is not None:
+        if parser.at("interface") and parser.peek(1) and parser.peek(1)[0] == "name":
+            parser.next()
+            _, name, _ = parser.next()
+            parser.skip_to("{")
+            types[name] = ("object", parser.fields())
+        elif parser.at("type") and parser.peek(1) and parser.peek(1)[0] == "name" and parser.at("=", 2):
+            parser.next()
+            _, name, _ = parser.next()
+            parser.next()
+            types[name] = parser.type_expression()
+        else:
+            parser.next()
+    return types
+
+
+def parse_module(path):
+    """Parse the `export const name: Type[] = [...]` declarations of a data module
+
+    Returns (exports, problems): exports maps each name to (type name,
+    records) and problems lists the declarations that could not be parsed
+    (the parser skips to the next export and carries on).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        parser = _Parser(f.read(), path)
+    exports = {}
+    problems = []
+
+    def resolve(name, index):
+        if name not in exports or not 0 <= index < len(exports[name][1]):
+            raise parser.error(f"{name}[{index}] does not refer to an earlier export")
+        return Ref(name, exports[name][1][index])
+
+    while parser.peek() is not None:
+        if not (parser.at("export") and parser.at("const", 1)):
+            parser.next()
+            continue
+        parser.position += 2
+        _, name, _ = parser.next()
+        if not parser.at(":"):
+            continue
+        start = parser.position
+        try:
+            parser.next()
+            declared = parser.type_expression()
+            if declared[0] != "array" or declared[1][0] != "name":
+                # Not a catalog collection (e.g. a helper or a single object)
+                continue
+            parser.expect("=")
+            records = parser.value(resolve)
+            if not isinstance(records, list):
+                raise parser.error(f"{name} is not an array literal")
+            exports[name] = (declared[1][1], records)
+        except CatalogError as error:
+            problems.append(f"{name}: {error}")
+            parser.position = max(parser.position, start + 1)
+            parser.skip_to("export")
+    return exports, problems
+
+
+def validate(value, expected, types, where="value"):
+    """Return the ways `value` does not match the type `expected` (empty if it does)"""
+    if isinstance(value, Ref):
+        value = value.record
+    kind = expected[0]
+    if kind == "name":
+        name = expected[1]
+        if name in _PRIMITIVES:
+            return [] if _PRIMITIVES[name](value) else [f"{where}: expected {name}, got {value!r}"]
+        if name not in types:
+            return [f"{where}: unknown type {name}"]
+        return validate(value, types[name], types, where)
+    if kind == "literal":
+        return [] if value == expected[1] else [f"{where}: expected {expected[1]!r}, got {value!r}"]
+    if kind == "array":
+        if not isinstance(value, list):
+            return [f"{where}: expected an array, got {value!r}"]
+        return [problem for index, item in enumerate(value)
+                for problem in validate(item, expected[1], types, f"{where}[{index}]")]
+    if kind == "union":
+        for alternative in expected[1]:
+            if not validate(value, alternative, types, where):
+                return []
+        return [f"{where}: {value!r} matches none of {_describe(expected, types)}"]
+    if not isinstance(value, dict):
+        return [f"{where}: expected an object, got {value!r}"]
+    problems = []
+    for field, (field_type, optional) in expected[1].items():
+        if field not in value:
+            if not optional:
+                problems.append(f"{where}.{field}: missing")
+        # An optional field may also be set to undefined; a null is only
+        # accepted where the type says so (`T | null`)
+        elif value[field] is not None or not optional:
+            problems.extend(validate(value[field], field_type, types, f"{where}.{field}"))
+    problems.extend(f"{where}.{field}: not declared" for field in value if field not in expected[1])
+    return problems
+
+
+def _describe(expected, types):
+    kind = expected[0]
+    if kind == "union":
+        return " | ".join(_describe(alternative, types) for alternative in expected[1])
+    if kind == "literal":
+        return repr(expected[1])
+    if kind == "array":
+        return _describe(expected[1], types) + "[]"
+    return expected[1] if kind == "name" else "object"
+
+
+def facet_fields(fields, types):
+    """Fields whose type is a union of string literals; they get a value -> rows index"""
+    facets = []
+    for field, (field_type, _) in fields.items():
+        while field_type[0] == "name" and field_type[1] in types:
+            field_type = types[field_type[1]]
+        if field_type[0] == "union" and all(alternative[0] == "literal" for alternative in field_type[1]):
+            facets.append(field)
+    return facets
+
+
+def parse_cached(path, parse, cache=None):
+    """`parse(path)`, reusing the result kept in `cache` while the file's bytes are unchanged"""
+    if cache is None:
+        return parse(path)
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    hit = cache.get((parse.__name__, path))
+    if hit is not None and hit[0] == digest:
+        return hit[1]
+    result = parse(path)
+    cache[(parse.__name__, path)] = (digest, result)
+    return result
+
+
+def compile_catalog(modules=DATA_MODULES, types_path=TYPES_MODULE, cache=None):
+    """Merge, validate and index the data modules; return (catalog, stats, problems)
+
+    Records are deduplicated by id within each collection (fields from
+    later modules win). Records that fail validation against their
+    declared interface, and collections whose interface is not declared
+    in `types_path`, are left out and reported in `problems`. With a
+    `cache` dict, only modules whose bytes changed since the last call
+    with that dict are parsed again.
+    """
+    types = parse_cached(types_path, parse_types, cache)
+    problems = []
+    merged = {}
+    stats = {}
+    for path in modules:
+        try:
+            exports, module_problems = parse_cached(path, parse_module, cache)
+        except CatalogError as error:
+            problems.append(str(error))
+            continue
+        problems.extend(module_problems)
+        for name, (type_name, records) in exports.items():
+            if type_name not in types:
+                problems.append(f"{path}: {name}: {type_name} is not declared in {types_path}")
+                continue
+            collection = merged.setdefault(name, {"type": type_name, "records": {}})
+            counts = stats.setdefault(name, {"records": 0, "conflicts": 0})
+            for index, record in enumerate(records):
+                where = f"{path}: {name}[{index}]"
+                if not isinstance(record, dict) or not isinstance(record.get("id"), str):
+                    problems.append(f"{where}: record has no string id")
+                    continue
+                counts["records"] += 1
+                existing = collection["records"].get(record["id"])
+                if existing is None:
+                    collection["records"][record["id"]] = dict(record)
+                    continue
+                if any(field in existing and _plain(existing[field]) != _plain(value)
+                       for field, value in record.items()):
+                    counts["conflicts"] += 1
+                existing.update(record)
+
+    catalog = {"version": CATALOG_VERSION, "collections": {}}
+    for name, collection in merged.items():
+        interface = types[collection["type"]]
+        fields = list(interface[1])
+        valid = []
+        for record_id, record in collection["records"].items():
+            record_problems = validate(record, interface, types, f"{name}/{record_id}")
+            if record_problems:
+                problems.extend(record_problems)
+            else:
+                valid.append(record)
+        catalog["collections"][name] = build_collection(collection["type"], fields, valid,
+                                                         facet_fields(interface[1], types))
+        stats[name]["unique"] = len(valid)
+    return catalog, stats, problems
+
+
+def _plain(value):
+    if isinstance(value, Ref):
+        return value.to_json()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def build_collection(type_name, fields, records, facets):
+    """Columnar rows (trailing unset fields trimmed) plus id and facet indexes"""
+    rows = []
+    index = {"id": {}}
+    for facet in facets:
+        index[facet] = {}
+    for position, record in enumerate(records):
+        row = [_plain(record.get(field)) for field in fields]
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+        index["id"][record["id"]] = position
+        for facet in facets:
+            if record.get(facet) is not None:
+                index[facet].setdefault(record[facet], []).append(position)
+    return {"type": type_name, "fields": fields, "rows": rows, "index": index}
+
+
+def attach_assets(catalog, manifest_path=ASSETS_MANIFEST):
+    """Reference the image derivatives of the catalog's items; return how many have some
+
+    Adds catalog["assets"] = {collection: {id: {width, height, placeholder,
+    srcset, atlas}}} from the image pipeline's manifest, leaving out
+    images of items the catalog does not have.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    assets = {}
+    for key, entry in manifest.get("images", {}).items():
+        name, _, record_id = key.partition("/")
+        collection = catalog["collections"].get(name)
+        if collection is None or record_id not in collection["index"]["id"]:
+            continue
+        assets.setdefault(name, {})[record_id] = {field: entry[field] for field in ASSET_FIELDS if field in entry}
+    catalog["assets"] = assets
+    return sum(map(len, assets.values()))
+
+
+def read_catalog(path=CATALOG_PATH):
+    """Load a catalog written by write_catalog()"""
+    with open(path, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    if catalog.get("version") != CATALOG_VERSION:
+        raise ValueError(f"{path}: catalog version {catalog.get('version')}, expected {CATALOG_VERSION}")
+    return catalog
+
+
+def column(collection, field):
+    """Values of `field` for every row of a compiled collection (None where unset)"""
+    position = collection["fields"].index(field)
+    return [row[position] if position < len(row) else None for row in collection["rows"]]
+
+
+def write_catalog(catalog, path=CATALOG_PATH):
+    """Write the catalog as compact JSON, atomically; return its size in bytes"""
+    return write_json(catalog, path)
+
+
+def write_json(document, path):
+    """Write `document` as compact JSON through a temporary file; return its size in bytes"""
+    data = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(data)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compile src/data/*.ts into one indexed catalog")
+    parser.add_argument("modules", nargs="*", default=list(DATA_MODULES),
+                        help="data modules in merge order (default: the three src/data modules)")
+    parser.add_argument("--types", default=TYPES_MODULE,
+                        help=f"TypeScript module declaring the interfaces (default: {TYPES_MODULE})")
+    parser.add_argument("--out", default=CATALOG_PATH,
+                        help=f"where to write the catalog (default: {CATALOG_PATH})")
+    parser.add_argument("--assets", default=ASSETS_MANIFEST,
+                        help=f"image manifest to reference, if it exists (default: {ASSETS_MANIFEST})")
+    parser.add_argument("--strict", action="store_true",
+                        help="exit with status 1 if any record or module had problems")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - CATALOG COMPILER")
+    print("=" * 70)
+
+    catalog, stats, problems = compile_catalog(args.modules, args.types)
+    for name, counts in stats.items():
+        conflicts = f", {counts['conflicts']} merged with differing fields" if counts["conflicts"] else ""
+        print(f"  📦 {name:<16} {counts['unique']:>4} unique of {counts['records']:>4} records{conflicts}")
+    for problem in problems:
+        print(f"  ⚠️  {problem}")
+    if args.assets and os.path.exists(args.assets):
+        print(f"  🖼️  {attach_assets(catalog, args.assets)} items reference derivatives in {args.assets}")
+
+    size = write_catalog(catalog, args.out)
+    source_size = sum(os.path.getsize(path) for path in args.modules)
+    print(f"\n📝 Wrote {args.out}: {size} bytes from {source_size} bytes of modules")
+    if args.strict and problems:
+        print(f"❌ {len(problems)} problems (--strict)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import datetime
+import hashlib
+import os
+import subprocess
+import zlib
+from collections import namedtuple
+
+# Author/committer identity plus the UTC offset commit dates are recorded in
+Identity = namedtuple("Identity", "name email tz")
+
+# Identity used for reproducible fixtures: independent of git config and
+# of the machine's local timezone
+PINNED_IDENTITY = Identity("Heeko Sarees", "dev@heekosarees.example", "+0000")
+
+
+def git_identity(var="GIT_AUTHOR_IDENT"):
+    """Return (name, email) for the identity git would use for commits"""
+    result = subprocess.run(["git", "var", var], capture_output=True, text=True, check=True)
+    # "Name <email> 1700000000 +0000" -> drop the trailing timestamp and zone
+    ident = result.stdout.strip().rsplit(" ", 2)[0]
+    name, email = ident.rsplit(" <", 1)
+    return name, email.rstrip(">")
+
+
+def git_raw_date(commit_time, tz=None):
+    """Format a naive datetime as git's raw "<epoch> <tz>" date
+
+    The datetime is taken as local time, or as wall-clock time at the
+    fixed offset `tz` (e.g. "+0530") when one is given.
+    """
+    if tz is None:
+        local_time = commit_time.astimezone()
+    else:
+        sign = -1 if tz.startswith("-") else 1
+        offset = datetime.timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+        local_time = commit_time.replace(tzinfo=datetime.timezone(offset))
+    return f"{int(local_time.timestamp())} {local_time.strftime('%z')}"
+
+
+def current_branch_ref():
+    """Return the ref HEAD points at, e.g. refs/heads/main"""
+    result = subprocess.run(["git", "symbolic-ref", "HEAD"], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def resolve_head():
+    """Return the commit HEAD resolves to, or None on an unborn branch"""
+    return resolve_ref("HEAD")
+
+
+def resolve_ref(ref):
+    """Return the commit `ref` resolves to, or None if it does not exist"""
+    result = subprocess.run(["git", "rev-parse", "--verify", "-q", f"{ref}^{{commit}}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def special_modes(commit):
+    """Return {path: mode} for the entries of `commit`'s tree that are not plain 100644 files"""
+    result = subprocess.run(["git", "ls-tree", "-r", "-z", "--full-tree", commit], capture_output=True, check=True)
+    modes = {}
+    for record in result.stdout.split(b"\0"):
+        if not record:
+            continue
+        info, path = record.split(b"\t", 1)
+        mode = info.split(b" ", 1)[0].decode("ascii")
+        if mode != "100644":
+            modes[path.decode("utf-8", "surrogateescape")] = mode
+    return modes
+
+
+def tracked_paths():
+    """Return the set of paths currently in the index"""
+    result = subprocess.run(["git", "ls-files", "-z"], capture_output=True, check=True)
+    return {path for path in result.stdout.decode("utf-8", "surrogateescape").split("\0") if path}
+
+
+def last_commit():
+    """Return (commit time, subject) of HEAD, or None on an unborn branch
+
+    The time is the naive wall-clock time in the zone the commit was
+    recorded in, i.e. the same form planned timestamps use.
+    """
+    result = subprocess.run(
+        ["git", "log", "-1", "--date=format:%Y-%m-%dT%H:%M:%S", "--format=%cd%x00%s"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    date, subject = result.stdout.rstrip("\n").split("\0", 1)
+    return datetime.datetime.fromisoformat(date), subject
+
+
+class CommitWriter:
+    """Shared setup for backends that write commits without `git commit`"""
+
+    # Whether fork()/merge commits (see topology.py) are supported
+    supports_branches = False
+
+    def __init__(self, ref=None, identity=None):
+        self.ref = ref or current_branch_ref()
+        self.parent = resolve_head()
+        if identity is not None:
+            self.author = self.committer = (identity.name, identity.email)
+            self.tz = identity.tz
+        else:
+            self.author = git_identity("GIT_AUTHOR_IDENT")
+            self.committer = git_identity("GIT_COMMITTER_IDENT")
+            self.tz = None
+
+    def signature(self, commit_time):
+        """Return the author and committer header lines for a commit"""
+        date = git_raw_date(commit_time, self.tz)
+        author_name, author_email = self.author
+        committer_name, committer_email = self.committer
+        return (
+            f"author {author_name} <{author_email}> {date}\n"
+            f"committer {committer_name} <{committer_email}> {date}\n"
+        )
+
+
+class FastImportBackend(CommitWriter):
+    """Stream commits into a single `git fast-import` process.
+
+    Each commit only carries the files that were touched, so the resulting
+    tree is the parent tree plus those files -- the same tree the porcelain
+    loop produces when nothing else in the working tree is dirty.
+    """
+
+    name = "fast-import"
+    supports_branches = True
+    STREAM_BUFFER = 4 * 1024 * 1024
+
+    def __init__(self, ref=None, identity=None):
+        super().__init__(ref, identity)
+        # Tip of every branch used so far: a commit SHA or a ":mark". Other
+        # branches are looked up on first use, so a new writer can carry on
+        # where a previous one (e.g. the last streaming batch) stopped.
+        self.tips = {self.ref: self.parent}
+        # Modes of each branch's existing non-regular files, from the tree it
+        # started at; commits only ever add regular files, so they never change
+        self.modes = {}
+        self.marks = 0
+        self.process = subprocess.Popen(
+            ["git", "fast-import", "--quiet", "--done"],
+            stdin=subprocess.PIPE,
+        )
+        # Commands are gathered here and handed to the pipe STREAM_BUFFER
+        # bytes at a time: many small writes each wake fast-import up for
+        # a few hundred bytes, which made the pipe the bottleneck
+        self.stream = bytearray()
+
+    def _flush(self, force=False):
+        if self.stream and (force or len(self.stream) >= self.STREAM_BUFFER):
+            self.process.stdin.write(self.stream)
+            self.stream = bytearray()
+
+    def branch_ref(self, branch):
+        """Full ref for a plan branch name (None: the checked-out branch)"""
+        return self.ref if branch is None else f"refs/heads/{branch}"
+
+    def _tip(self, ref):
+        if ref not in self.tips:
+            self.tips[ref] = resolve_ref(ref)
+        return self.tips[ref]
+
+    def _modes(self, ref):
+        if ref not in self.modes:
+            tip = self._tip(ref)
+            self.modes[ref] = special_modes(tip) if tip else {}
+        return self.modes[ref]
+
+    def _data(self, payload):
+        self.stream += b"data %d\n" % len(payload)
+        self.stream += payload
+        self.stream += b"\n"
+
+    def fork(self, branch, source=None):
+        """Start `branch` at the current tip of `source`"""
+        tip = self._tip(self.branch_ref(source))
+        ref = self.branch_ref(branch)
+        self.modes[ref] = self._modes(self.branch_ref(source))
+        self.tips[ref] = tip
+        if tip:
+            self.stream += f"reset {ref}\nfrom {tip}\n\n".encode("utf-8")
+
+    def commit(self, changes, message, commit_time, branch=None, merge=None):
+        """Queue a commit of `changes` ((path, content) pairs) with the given date
+
+        The commit goes on `branch` and, with `merge`, gets that branch's
+        tip as a second parent.
+        """
+        ref = self.branch_ref(branch)
+        self.marks += 1
+        mark = f":{self.marks}"
+        header = f"commit {ref}\nmark {mark}\n" + self.signature(commit_time)
+        self.stream += header.encode("utf-8")
+        # `git commit -m` always terminates the message with a newline
+        self._data(f"{message}\n".encode("utf-8"))
+        tip = self._tip(ref)
+        modes = self._modes(ref)
+        if tip:
+            self.stream += f"from {tip}\n".encode("utf-8")
+        if merge is not None:
+            self.stream += f"merge {self._tip(self.branch_ref(merge))}\n".encode("utf-8")
+        self.tips[ref] = mark
+
+        for path, content in changes:
+            # Like ObjectWriterBackend: an existing file keeps its mode, a new one is 100644
+            mode = modes.get(path, "100644")
+            self.stream += f"M {mode} inline {path}\n".encode("utf-8")
+            self._data(content)
+        self.stream += b"\n"
+        self._flush()
+
+    def close(self):
+        """Finish the import and sync the index with the new HEAD"""
+        self.stream += b"done\n"
+        self._flush(force=True)
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"git fast-import exited with status {self.process.returncode}")
+        # fast-import only moves the ref; refresh the index so `git status` is clean
+        subprocess.run(["git", "reset", "-q"], check=True)
+
+
+class _Tree:
+    """A directory in the in-memory tree: name -> (mode, sha) or _Tree"""
+
+    __slots__ = ("entries", "sha")
+
+    def __init__(self):
+        self.entries = {}
+        self.sha = None
+
+
+def _tree_sort_key(item):
+    # git orders tree entries as if directory names ended with "/"
+    name, entry = item
+    return name + b"/" if isinstance(entry, _Tree) else name
+
+
+class ObjectWriterBackend(CommitWriter):
+    """Write blobs, trees and commits as loose objects from Python.
+
+    The parent tree is listed once with `git ls-tree` and kept in memory;
+    every commit then only hashes the new blob and the trees on its path,
+    zlib-compresses them into .git/objects and never starts a process.
+    The branch ref is written once, when the backend is closed.
+    """
+
+    name = "objects"
+
+    def __init__(self, ref=None, identity=None, git_dir=".git"):
+        super().__init__(ref, identity)
+        self.git_dir = git_dir
+        self.head = self.parent
+        self.root = _Tree()
+        if self.head:
+            self._load_tree(self.head)
+
+    def _load_tree(self, commit):
+        result = subprocess.run(["git", "ls-tree", "-r", "-z", "--full-tree", commit],
+                                capture_output=True, check=True)
+        for record in result.stdout.split(b"\0"):
+            if not record:
+                continue
+            info, path = record.split(b"\t", 1)
+            mode, _, sha = info.split(b" ")
+            self._set(path, mode, bytes.fromhex(sha.decode("ascii")))
+
+    def _set(self, path, mode, sha):
+        node = self.root
+        *dirs, name = path.split(b"/")
+        node.sha = None
+        for part in dirs:
+            child = node.entries.get(part)
+            if not isinstance(child, _Tree):
+                child = node.entries[part] = _Tree()
+            node = child
+            node.sha = None
+        if mode is None:
+            existing = node.entries.get(name)
+            mode = existing[0] if isinstance(existing, tuple) else b"100644"
+        node.entries[name] = (mode, sha)
+
+    def write_object(self, kind, data):
+        """Store a loose object and return its binary SHA-1"""
+        raw = b"%s %d\0" % (kind, len(data)) + data
+        sha = hashlib.sha1(raw).digest()
+        hex_sha = sha.hex()
+        directory = os.path.join(self.git_dir, "objects", hex_sha[:2])
+        path = os.path.join(directory, hex_sha[2:])
+        if not os.path.exists(path):
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f"{path}.tmp{os.getpid()}"
+            with open(temp_path, "wb") as f:
+                f.write(zlib.compress(raw, 1))
+            os.replace(temp_path, path)
+        return sha
+
+    def _write_tree(self, node):
+        if node.sha is None:
+            parts = []
+            for name, entry in sorted(node.entries.items(), key=_tree_sort_key):
+                if isinstance(entry, _Tree):
+                    parts.append(b"40000 " + name + b"\0" + self._write_tree(entry))
+                else:
+                    mode, sha = entry
+                    parts.append(mode + b" " + name + b"\0" + sha)
+            node.sha = self.write_object(b"tree", b"".join(parts))
+        return node.sha
+
+    def commit(self, changes, message, commit_time, branch=None):
+        """Write a commit of `changes` ((path, content) pairs) with the given date"""
+        for path, content in changes:
+            self._set(path.encode("utf-8"), None, self.write_object(b"blob", content))
+
+        body = f"tree {self._write_tree(self.root).hex()}\n"
+        if self.head:
+            body += f"parent {self.head}\n"
+        # `git commit -m` always terminates the message with a newline
+        body += self.signature(commit_time) + f"\n{message}\n"
+        self.head = self.write_object(b"commit", body.encode("utf-8")).hex()
+
+    def close(self):
+        """Point the branch at the last commit and sync the index with it"""
+        if self.head == self.parent:
+            return
+        ref_path = os.path.join(self.git_dir, self.ref)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        with open(ref_path + ".lock", "w", encoding="ascii") as f:
+            f.write(self.head + "\n")
+        os.replace(ref_path + ".lock", ref_path)
+        subprocess.run(["git", "reset", "-q"], check=True)
@@ -0,0 +1,115 @@
+import datetime
+import json
+import random
+from collections import namedtuple
+
+# One planned commit. `timestamp` is a naive local time in ISO format, the
+# same string the porcelain backend hands to GIT_AUTHOR_DATE. `branch` is
+# None for the checked-out branch; for "fork" and "merge" records `source`
+# names the branch forked from / merged in (see topology.py).
+PlannedCommit = namedtuple("PlannedCommit", "timestamp week commit_num path kind message branch source",
+                           defaults=(None, None))
+
+PLAN_FIELDS = PlannedCommit._fields
+
+
+def mutation_kind(path):
+    """Map a file path to the kind of content change applied to it"""
+    if path.endswith(('.js', '.jsx', '.ts', '.tsx')):
+        return "code"
+    if path.endswith('.css'):
+        return "css"
+    if path.endswith('.json'):
+        return "json"
+    if path == "README.md":
+        return "readme"
+    return "text"
+
+
+def plan_weekly_commits(messages, files, end_date=None, days=120, total_weeks=None, rng=random,
+                        start_date=None, first_week=1, clip=False):
+    """Plan commits for every week in the `days` window ending at `end_date`
+
+    Draws from `rng` in the same order the original nested loop did, so a
+    seeded generator yields the same schedule, files and messages.
+    `start_date` overrides where the first week begins and `first_week`
+    the number it is labelled with; `clip` drops commits whose time of day
+    falls after `end_date` on the last day.
+    """
+    return list(iter_weekly_commits(messages, files, end_date=end_date, days=days, total_weeks=total_weeks,
+                                    rng=rng, start_date=start_date, first_week=first_week, clip=clip))
+
+
+def iter_weekly_commits(messages, files, end_date=None, days=120, total_weeks=None, rng=random,
+                        start_date=None, first_week=1, clip=False):
+    """Lazy plan_weekly_commits(): yields each record as soon as it is drawn"""
+    if end_date is None:
+        end_date = datetime.datetime.now()
+    if start_date is None:
+        start_date = end_date - datetime.timedelta(days=days)
+    if total_weeks is None:
+        total_weeks = days // 7
+
+    for week_index in range(total_weeks):
+        week = first_week + week_index
+        week_start = start_date + datetime.timedelta(days=week_index*7)
+
+        # 2-4 commit days per week
+        commit_days = rng.randint(2, 4)
+
+        for day_in_week in range(commit_days):
+            # Pick a random weekday (0=Monday, 4=Friday)
+            day_offset = rng.randint(0, 4)
+            commit_date = week_start + datetime.timedelta(days=day_offset)
+
+            # Don't go beyond the end of the window
+            if commit_date > end_date:
+                continue
+
+            # 1-3 commits per day
+            commits_today = rng.randint(1, 3)
+
+            for commit_num in range(commits_today):
+                # Random time during working hours (9 AM - 6 PM)
+                hour = rng.randint(9, 18)
+                minute = rng.randint(0, 59)
+                second = rng.randint(0, 59)
+                commit_time = commit_date.replace(hour=hour, minute=minute, second=second, microsecond=0)
+
+                path = rng.choice(files)
+                message = rng.choice(messages)
+                if clip and commit_time > end_date:
+                    continue
+                yield PlannedCommit(
+                    timestamp=commit_time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    week=week,
+                    commit_num=commit_num,
+                    path=path,
+                    kind=mutation_kind(path),
+                    message=f"{message} - Week {week}",
+                )
+
+
+def write_plan(plan, plan_path):
+    """Write a plan as JSON Lines, one commit per line, and return how many were written"""
+    count = 0
+    with open(plan_path, "w", encoding="utf-8") as f:
+        for record in plan:
+            count += 1
+            data = record._asdict()
+            # Linear plans keep their original, shorter records
+            for field in ("branch", "source"):
+                if data[field] is None:
+                    del data[field]
+            f.write(json.dumps(data, ensure_ascii=False))
+            f.write("\n")
+    return count
+
+
+def read_plan(plan_path):
+    """Stream PlannedCommit records back from a JSON Lines plan"""
+    with open(plan_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                yield PlannedCommit(*(data.get(field) for field in PLAN_FIELDS))
@@ -0,0 +1,195 @@
+import os
+import sys
+import base64
+import argparse
+import json
+import time
+
+import numpy as np
+
+from catalog_compiler import CATALOG_PATH, column, read_catalog, write_json
+from price_table import PRICE_RANGES
+
+FACET_INDEX_PATH = os.path.join("public", "facet_index.json")
+FACET_INDEX_VERSION = 1
+
+# List fields whose values mean the same thing in every collection
+# (OccasionFilter's OccasionType), so they get one bitmap per value
+SHARED_FACETS = ("occasion",)
+
+# FilterPanel's popularity options, as inclusive bounds like PRICE_RANGES;
+# the thresholds are ColorSelection's star and trending icons
+POPULARITY_TIERS = (("popular", 90, None), ("trending", 80, 89))
+
+# Numeric fields bucketed into named ranges
+RANGE_FACETS = {"price": PRICE_RANGES, "popularity": POPULARITY_TIERS}
+
+
+def facet_masks(catalog):
+    """Return (collections, masks): [name, first row, rows] per collection and a bool mask per facet
+
+    Rows are numbered across the whole catalog, collection after
+    collection. Facet keys are "collection.field=value" for the
+    catalog's literal-union indexes and "field=value" for shared and
+    range facets, which span collections.
+    """
+    total = sum(len(collection["rows"]) for collection in catalog["collections"].values())
+    collections = []
+    masks = {}
+
+    def mask(key):
+        if key not in masks:
+            masks[key] = np.zeros(total, dtype=bool)
+        return masks[key]
+
+    start = 0
+    for name, collection in catalog["collections"].items():
+        count = len(collection["rows"])
+        collections.append([name, start, count])
+        fields = collection["fields"]
+        for facet, values in collection["index"].items():
+            if facet == "id":
+                continue
+            for value, rows in values.items():
+                mask(f"{name}.{facet}={value}")[start + np.asarray(rows, dtype=np.int64)] = True
+        for field in SHARED_FACETS:
+            if field in fields:
+                for row, values in enumerate(column(collection, field)):
+                    for value in values or ():
+                        mask(f"{field}={value}")[start + row] = True
+        for field, ranges in RANGE_FACETS.items():
+            if field not in fields:
+                continue
+            values = np.rint(np.array([np.nan if value is None else value for value in column(collection, field)],
+                                      dtype=np.float64))
+            for range_name, low, high in ranges:
+                # NaN (unset) compares false, so items without a value match no range
+                inside = (values >= low) & (values <= (np.inf if high is None else high))
+                mask(f"{field}={range_name}")[start:start + count] |= inside
+        start += count
+    return collections, masks
+
+
+def encode_bitmap(mask):
+    """Compress a bool mask to whichever JSON form is smaller
+
+    {"count": n, "runs": [gap, length, gap, length, ...]}: runs of set
+    rows, each gap counted from the end of the previous run.
+    {"count": n, "bits": base64}: the mask packed little-endian (row 0 is
+    the low bit of byte 0), padded to whole 32-bit words so the front end
+    can AND/OR it as a Uint32Array.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    gaps = starts - np.concatenate(([0], ends[:-1]))
+    runs = np.column_stack((gaps, ends - starts)).ravel().tolist()
+    packed = np.packbits(mask, bitorder="little")
+    packed = np.concatenate((packed, np.zeros(-packed.size % 4, dtype=np.uint8)))
+    bits = base64.b64encode(packed.tobytes()).decode("ascii")
+    count = int(mask.sum())
+    if len(json.dumps(runs, separators=(",", ":"))) <= len(bits):
+        return {"count": count, "runs": runs}
+    return {"count": count, "bits": bits}
+
+
+def decode_bitmap(entry, size):
+    """The bool mask of `size` rows an encode_bitmap() entry stands for"""
+    if "bits" in entry:
+        packed = np.frombuffer(base64.b64decode(entry["bits"]), dtype=np.uint8)
+        return np.unpackbits(packed, count=size, bitorder="little").astype(bool)
+    mask = np.zeros(size, dtype=bool)
+    position = 0
+    runs = entry["runs"]
+    for gap, length in zip(runs[0::2], runs[1::2]):
+        position += gap
+        mask[position:position + length] = True
+        position += length
+    return mask
+
+
+def build_facet_index(catalog):
+    """One compressed bitmap per facet value, plus the id table the rows refer to"""
+    collections, masks = facet_masks(catalog)
+    return {
+        "version": FACET_INDEX_VERSION,
+        "size": sum(count for _, _, count in collections),
+        "collections": collections,
+        "ids": {name: column(catalog["collections"][name], "id") for name, _, _ in collections},
+        "facets": {key: encode_bitmap(masks[key]) for key in sorted(masks)},
+    }
+
+
+def _row_facets(name, collection):
+    # Facet keys of every row, by looking at the values themselves
+    fields = collection["fields"]
+    facets = [field for field in collection["index"] if field != "id"]
+    for record in collection["rows"]:
+        record = dict(zip(fields, record))
+        keys = {f"{name}.{field}={record[field]}" for field in facets if record.get(field) is not None}
+        keys.update(f"{field}={value}" for field in SHARED_FACETS for value in record.get(field) or ())
+        for field, ranges in RANGE_FACETS.items():
+            if record.get(field) is not None:
+                value = round(record[field])
+                keys.update(f"{field}={range_name}" for range_name, low, high in ranges
+                            if low <= value and (high is None or value <= high))
+        yield keys
+
+
+def check_facet_index(index, catalog):
+    """Compare every bitmap against a linear scan of the catalog; return the mismatches"""
+    size = index["size"]
+    expected = {key: np.zeros(size, dtype=bool) for key in index["facets"]}
+    problems = []
+    for name, start, count in index["collections"]:
+        for row, keys in enumerate(_row_facets(name, catalog["collections"][name])):
+            for key in keys:
+                if key not in expected:
+                    problems.append(f"{name}/{index['ids'][name][row]}: no bitmap for {key}")
+                    continue
+                expected[key][start + row] = True
+    for key, entry in index["facets"].items():
+        mask = decode_bitmap(entry, size)
+        if not np.array_equal(mask, expected[key]) or int(mask.sum()) != entry["count"]:
+            problems.append(f"{key}: bitmap differs from a scan")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute a bitmap per facet value for the filter panels")
+    parser.add_argument("--catalog", default=CATALOG_PATH,
+                        help=f"catalog written by catalog_compiler.py (default: {CATALOG_PATH})")
+    parser.add_argument("--out", default=FACET_INDEX_PATH,
+                        help=f"where to write the index (default: {FACET_INDEX_PATH})")
+    parser.add_argument("--check", action="store_true",
+                        help="also compare every bitmap against a linear scan")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - FACET INDEX")
+    print("=" * 70)
+
+    catalog = read_catalog(args.catalog)
+    started = time.perf_counter()
+    index = build_facet_index(catalog)
+    elapsed = time.perf_counter() - started
+    dense = sum("bits" in entry for entry in index["facets"].values())
+    print(f"  🗂️  {index['size']} items, {len(index['facets'])} facet bitmaps "
+          f"({len(index['facets']) - dense} run-length, {dense} packed) in {elapsed:.2f}s")
+
+    if args.check:
+        problems = check_facet_index(index, catalog)
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("  ✅ Every bitmap matches a linear scan")
+
+    size = write_json(index, args.out)
+    print(f"\n📝 Wrote {args.out}: {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
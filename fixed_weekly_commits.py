@@ -3,212 +3,874 @@ import subprocess
 import datetime
 import random
 import json
+import argparse
+import concurrent.futures
+import time
+import hashlib
+import itertools
+import re
+import asyncio
 
-def ensure_directory(file_path):
-    """Ensure directory exists for the given file path"""
-    directory = os.path.dirname(file_path)
-    if directory and not os.path.exists(directory):
-        os.makedirs(directory, exist_ok=True)
+from commit_backends import (PINNED_IDENTITY, FastImportBackend, ObjectWriterBackend, git_raw_date,
+                             last_commit, resolve_head, tracked_paths)
+from fixture_cache import FixtureCache, finalize_repository
+from generation_metrics import GenerationMetrics
+from commit_plan import iter_weekly_commits, read_plan, write_plan
+from path_index import PathSampler
+from mutators import PROFILES, is_legacy, mutation_profile, parse_diff_sizes
+from mutation_buffer import MutationBuffer, ensure_directory
+from topology import DEFAULT_TOPOLOGY, is_linear, plan_topology
 
-def add_weekly_commits():
-    """Add commits for every week over past 120 days"""
-    
-    print("📅 Adding weekly commits for past 120 days...")
-    
-    # Weekly-focused commit messages for saree customization app
-    weekly_messages = [
-        "feat: enhanced saree customization features",
-        "fix: resolved 3D preview rendering issues",
-        "style: improved UI components and layouts",
-        "docs: updated documentation and user guides",
-        "refactor: optimized component structure",
-        "perf: improved application performance",
-        "content: added new fabric patterns",
-        "chore: updated dependencies and configurations",
-        "test: added unit tests for core functionality",
-        "security: implemented security improvements",
-        "feat: added blouse design customization",
-        "fix: corrected color picker functionality",
-        "style: enhanced mobile responsive design",
-        "docs: added saree draping tutorials",
-        "feat: implemented save design feature",
-        "fix: resolved image export issues"
-    ]
+BACKENDS = ("porcelain", "pipelined", "fast-import", "objects")
+
+# Backends that write commits themselves instead of running `git commit`
+WRITERS = {"fast-import": FastImportBackend, "objects": ObjectWriterBackend}
+# Backends that can write feature/release branches and merges
+BRANCH_BACKENDS = tuple(name for name, writer in WRITERS.items() if writer.supports_branches)
+
+# Weekly-focused commit messages for saree customization app
+WEEKLY_MESSAGES = [
+    "feat: enhanced saree customization features",
+    "fix: resolved 3D preview rendering issues",
+    "style: improved UI components and layouts",
+    "docs: updated documentation and user guides",
+    "refactor: optimized component structure",
+    "perf: improved application performance",
+    "content: added new fabric patterns",
+    "chore: updated dependencies and configurations",
+    "test: added unit tests for core functionality",
+    "security: implemented security improvements",
+    "feat: added blouse design customization",
+    "fix: corrected color picker functionality",
+    "style: enhanced mobile responsive design",
+    "docs: added saree draping tutorials",
+    "feat: implemented save design feature",
+    "fix: resolved image export issues"
+]
+
+# Project files that exist in your Heeko Sarees project
+PROJECT_FILES = [
+    "src/App.tsx",
+    "src/main.tsx",
+    "src/index.css",
+    "src/components/BlouseSelection.tsx",
+    "src/components/ColorSelection.tsx",
+    "src/components/FabricSelector.tsx", 
+    "src/components/MaterialSelection.tsx",
+    "src/data/sareeData.ts",
+    "package.json",
+    "vite.config.ts",
+    "tailwind.config.js",
+    "README.md",
+    "index.html"
+]
+
+TOTAL_WEEKS = 17  # 120 days ÷ 7 = ~17 weeks
+
+# Bump whenever a change to planning or content generation would alter the
+# history produced for the same inputs, so stale fixtures are not reused
+GENERATOR_VERSION = 2
+
+FIXTURE_STAMP = os.path.join(".git", "heeko_fixture.json")
+
+# "legacy" draws commits one at a time with `random`; "numpy" draws the
+# whole window in one batch (see vector_schedule.py, needs NumPy)
+SCHEDULERS = ("legacy", "numpy")
+
+# Streaming mode: records applied per batch (each batch gets a fresh
+# writer process), the default file-content budget, and how many days
+# the NumPy scheduler draws at a time
+STREAM_BATCH_SIZE = 50_000
+STREAM_MEMORY_LIMIT = 64 * 1024 * 1024
+STREAM_CHUNK_DAYS = 4096
+
+# Pipelined porcelain backend: commits prepared ahead of the running `git commit`
+PIPELINE_DEPTH = 8
+
+def check_topology_backend(topology, backend):
+    """Raise ValueError if `backend` cannot write `topology`, before anything is planned or written"""
+    if not is_linear(topology) and backend not in BRANCH_BACKENDS:
+        raise ValueError(f"branch topology needs the {' or '.join(BRANCH_BACKENDS)} backend, not {backend}")
+
+def select_files(source="fixed", weights=None):
+    """PROJECT_FILES, or a weighted sampler over the files git tracks (see path_index.py)"""
+    if source == "index" or weights:
+        return PathSampler.from_index(weights)
+    return PROJECT_FILES
+
+def plan_commits(end_date=None, days=120, rng=random, scheduler="legacy", start_date=None, first_week=1,
+                 topology=None, files=None, lazy=False):
+    """Plan (but do not apply) the commits for the `days` before `end_date`
+
+    A non-linear `topology` (see topology.DEFAULT_TOPOLOGY) spreads the
+    commits over feature and release branches. Target paths are drawn
+    from `files` (default: PROJECT_FILES), a list or a PathSampler.
+    With `lazy`, an iterator is returned and records are only drawn as
+    they are consumed; the legacy scheduler then gives the same linear
+    plan, but NumPy draws and topology seeding happen in a different order.
+    """
+    if files is None:
+        files = PROJECT_FILES
+    if scheduler == "numpy":
+        from vector_schedule import plan_vectorized
+        # Derive the NumPy seed from `rng` so --seed covers both schedulers
+        plan = plan_vectorized(WEEKLY_MESSAGES, files, end_date=end_date, days=days,
+                               seed=rng.getrandbits(64), start_date=start_date, first_week=first_week,
+                               chunk_days=STREAM_CHUNK_DAYS if lazy else None)
+    elif start_date is not None:
+        days = (end_date - start_date).days + 1
+        plan = iter_weekly_commits(WEEKLY_MESSAGES, files, end_date=end_date, days=days,
+                                   total_weeks=-(-days // 7), rng=rng, start_date=start_date,
+                                   first_week=first_week, clip=True)
+    else:
+        plan = iter_weekly_commits(WEEKLY_MESSAGES, files, end_date=end_date,
+                                   days=days, total_weeks=days // 7, rng=rng)
+    return _with_topology(plan, rng, topology, lazy)
+
+def _with_topology(plan, rng, topology, lazy):
+    if not lazy:
+        plan = list(plan)
+    if not is_linear(topology):
+        plan = plan_topology(plan, rng=random.Random(rng.getrandbits(64)), **topology)
+        if not lazy:
+            plan = list(plan)
+    return plan
+
+def _monday(moment):
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - datetime.timedelta(days=day.weekday())
+
+def plan_week(week, week_start, seed, scheduler="legacy", files=None):
+    """Every commit of one Monday-to-Sunday week, drawn from a state of its own
+
+    The state comes from `seed` and the week number alone, so a week is
+    the same whichever run (or how many runs) it is planned in.
+    """
+    if files is None:
+        files = PROJECT_FILES
+    rng = random.Random(f"{seed}:{week}")
+    week_end = week_start + datetime.timedelta(days=7, seconds=-1)
+    if scheduler == "numpy":
+        from vector_schedule import plan_vectorized
+        return plan_vectorized(WEEKLY_MESSAGES, files, end_date=week_end, seed=rng.getrandbits(64),
+                               start_date=week_start, first_week=week)
+    return iter_weekly_commits(WEEKLY_MESSAGES, files, end_date=week_end, days=7, total_weeks=1, rng=rng,
+                               start_date=week_start, first_week=week)
+
+def extension_origin(end_date, days=120):
+    """Return (origin, last planned end, seed) for the next --extend run
+
+    They come from the fixture stamp of the previous extension. A history
+    that was never extended is picked up from HEAD: its "Week N" subject
+    puts week 1 N-1 weeks before HEAD's Monday. An empty repo starts on
+    the Monday `days` before `end_date`.
+    """
+    extension = (read_fixture_stamp() or {}).get("extension")
+    if extension:
+        return (datetime.datetime.fromisoformat(extension["origin"]),
+                datetime.datetime.fromisoformat(extension["end"]), extension["seed"])
+    last = last_commit()
+    if last is None:
+        return _monday(end_date - datetime.timedelta(days=days)), None, None
     
-    # Project files that exist in your Heeko Sarees project
-    project_files = [
-        "src/App.tsx",
-        "src/main.tsx",
-        "src/index.css",
-        "src/components/BlouseSelection.tsx",
-        "src/components/ColorSelection.tsx",
-        "src/components/FabricSelector.tsx", 
-        "src/components/MaterialSelection.tsx",
-        "src/data/sareeData.ts",
-        "package.json",
-        "vite.config.ts",
-        "tailwind.config.js",
-        "README.md",
-        "index.html"
-    ]
+    last_time, subject = last
+    match = re.search(r"Week (\d+)", subject)
+    last_week = int(match.group(1)) if match else 0
+    return _monday(last_time) - datetime.timedelta(weeks=last_week - 1), last_time, None
+
+def plan_extension(end_date=None, rng=random, scheduler="legacy", topology=None, files=None, lazy=False,
+                   days=120):
+    """Plan only the commits after the last planned end; return (plan, extension)
+
+    Weeks run Monday to Sunday from the window's origin and are numbered
+    from it, and each is drawn from the seed and its week number, so any
+    sequence of extensions up to a date gives the commits one run up to
+    that date would. An `end_date` at or before the last planned end
+    plans nothing. `extension` is what write_fixture_stamp() records once
+    the plan is applied.
+    """
+    if end_date is None:
+        end_date = datetime.datetime.now()
+    origin, last_end, seed = extension_origin(end_date, days)
+    if seed is None:
+        seed = rng.getrandbits(64)
+    extension = {"origin": origin.isoformat(), "end": end_date.isoformat(), "seed": seed}
+    if last_end is not None and end_date <= last_end:
+        return [], None
     
-    # Calculate date range - past 120 days (approx 17 weeks)
-    end_date = datetime.datetime.now()
-    start_date = end_date - datetime.timedelta(days=120)
+    # Planned timestamps are naive "%Y-%m-%dT%H:%M:%S" strings, which sort like the times they stand for
+    after = last_end.strftime("%Y-%m-%dT%H:%M:%S") if last_end is not None else ""
+    until = end_date.strftime("%Y-%m-%dT%H:%M:%S")
+    first = 0 if last_end is None else max(0, (_monday(last_end) - origin).days // 7)
+    weeks = range(first, (_monday(end_date) - origin).days // 7 + 1)
+    plan = (record for index in weeks
+            for record in plan_week(index + 1, origin + datetime.timedelta(weeks=index), seed, scheduler, files)
+            if after < record.timestamp <= until)
+    return _with_topology(plan, rng, topology, lazy), extension
+
+LEGACY_MUTATIONS = mutation_profile()
+
+def apply_mutation(buffer, record, commit_time, profile=LEGACY_MUTATIONS):
+    """Apply one planned content change in `buffer` and return the path changed"""
+    week = record.week
+    file_to_modify = record.path
+    try:
+        # Add content based on file type (see mutators.py)
+        profile.apply(buffer, record, commit_time)
+                
+    except Exception as e:
+        print(f"⚠️  Could not modify {file_to_modify}: {e}")
+        # Create backup update file
+        backup_file = f"src/utils/weekly_updates/week_{week}_update_{record.commit_num}.txt"
+        buffer.write(backup_file,
+                     f"Week {week} development update\n"
+                     f"Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
+        return backup_file
     
-    commit_count = 0
-    total_weeks = 17  # 120 days ÷ 7 = ~17 weeks
+    return file_to_modify
+
+def _silent(*args, **kwargs):
+    pass
+
+def _batches(plan, batch_size):
+    """Yield `plan` as lists of at most `batch_size` records (as one batch without a size)"""
+    if batch_size is None:
+        yield plan
+        return
+    plan = iter(plan)
+    while True:
+        batch = list(itertools.islice(plan, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def apply_plan(plan, backend="porcelain", verbose=False, identity=None, metrics=None, mutations=None,
+               batch_size=None, memory_limit=None):
+    """Apply planned commits in order and return how many were created
+
+    With an `identity`, author/committer and timezone are pinned instead
+    of coming from git config and the local clock settings. Counters and
+    phase timings go to `metrics`; `verbose` also prints every commit.
+    `mutations` selects the mutator profile (see mutators.mutation_profile).
+    backend="pipelined" runs the porcelain commands from an asyncio
+    pipeline (see _apply_pipelined()).
     
-    print(f"📅 Generating commits for {total_weeks} weeks")
-    print(f"📅 Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    For streaming, `plan` can be any iterator: it is consumed `batch_size`
+    records at a time and file contents are kept under `memory_limit`
+    bytes (see MutationBuffer), so memory does not grow with the plan.
+    """
+    echo = print if verbose else _silent
+    if metrics is None:
+        metrics = GenerationMetrics(progress=False)
     
     # Create necessary directories
     ensure_directory("src/components/")
     ensure_directory("src/data/")
     ensure_directory("src/utils/")
     
-    # Loop through each week
-    for week in range(1, total_weeks + 1):
-        print(f"\n📍 Processing Week {week}/{total_weeks}")
-        
-        # Calculate start of this week
-        week_start = start_date + datetime.timedelta(days=(week-1)*7)
-        
-        # 2-4 commit days per week
-        commit_days = random.randint(2, 4)
+    profile = mutation_profile(mutations)
+    if backend == "pipelined":
+        return asyncio.run(_apply_pipelined(plan, echo, identity, metrics, profile, memory_limit))
+    writer = WRITERS[backend](identity=identity) if backend in WRITERS else None
+    # Porcelain commits stage just the touched file; new files need `git add` once
+    tracked = tracked_paths() if writer is None else None
+    buffer = MutationBuffer(memory_limit=memory_limit)
+    # Branch topology (see topology.py): one buffer per open branch, plus
+    # the paths each side branch changed since it was forked
+    buffers = {None: buffer}
+    branch_paths = {}
+    current_week = None
+    
+    for batch_number, batch in enumerate(_batches(plan, batch_size)):
+        if batch_number and writer is not None:
+            # A fresh writer per batch keeps git fast-import's memory bounded;
+            # branch tips carry over through the refs the last one wrote
+            with metrics.phase("finish"):
+                writer.close()
+                writer = WRITERS[backend](identity=identity)
         
-        for day_in_week in range(commit_days):
-            # Pick a random weekday (0=Monday, 4=Friday)
-            day_offset = random.randint(0, 4)
-            commit_date = week_start + datetime.timedelta(days=day_offset)
+        for record in batch:
+            if record.week != current_week:
+                current_week = record.week
+                echo(f"\n📍 Processing Week {current_week}/{TOTAL_WEEKS}")
+            
+            commit_time = datetime.datetime.fromisoformat(record.timestamp)
+            git_date_str = record.timestamp
+            week = record.week
+            full_message = record.message
+            
+            if record.branch is not None or record.kind in ("fork", "merge"):
+                if writer is None or not writer.supports_branches:
+                    raise ValueError(f"branch topology needs the fast-import backend, not {backend}")
             
-            # Don't go beyond current date
-            if commit_date > datetime.datetime.now():
+            if record.kind == "fork":
+                buffers[record.branch] = buffers[record.source].fork()
+                branch_paths[record.branch] = set()
+                writer.fork(record.branch, record.source)
                 continue
             
-            # 1-3 commits per day
-            commits_today = random.randint(1, 3)
+            if record.kind == "merge":
+                # Side branches only touch paths no other open branch touches,
+                # so the merge result is the target plus the source's versions
+                target = buffers[record.branch]
+                source = buffers.pop(record.source)
+                merged_paths = branch_paths.pop(record.source)
+                with metrics.phase("stage"):
+                    for path in merged_paths:
+                        target.adopt(path, source)
+                    source.close()
+                    changes = [(path, target.content(path)) for path in sorted(merged_paths)]
+                with metrics.phase("commit"):
+                    writer.commit(changes, full_message, commit_time, branch=record.branch, merge=record.source)
+                if record.branch is not None:
+                    branch_paths[record.branch] |= merged_paths
+                metrics.commit_created()
+                echo(f"  🔀 {commit_time.strftime('%Y-%m-%d')}: {full_message}")
+                continue
             
-            for commit_num in range(commits_today):
-                # Random time during working hours (9 AM - 6 PM)
-                hour = random.randint(9, 18)
-                minute = random.randint(0, 59)
-                second = random.randint(0, 59)
-                
-                commit_time = commit_date.replace(hour=hour, minute=minute, second=second)
-                git_date_str = commit_time.strftime("%Y-%m-%dT%H:%M:%S")
-                
-                # Select a random file to modify
-                file_to_modify = random.choice(project_files)
-                
-                try:
-                    # Add content based on file type
-                    if file_to_modify.endswith(('.js', '.ts', '.tsx')):
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n// Development update - Week {week}\n")
-                            f.write(f"// Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
-                            f.write("// Saree customization feature improvements\n")
-                            
-                    elif file_to_modify.endswith('.css'):
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n/* Development update - Week {week} */\n")
-                            f.write(f"/* Date: {commit_time.strftime('%Y-%m-%d %H:%M')} */\n")
-                            f.write("/* UI and styling enhancements */\n")
-                            
-                    elif file_to_modify.endswith('.json'):
-                        ensure_directory(file_to_modify)
-                        if os.path.exists(file_to_modify):
-                            with open(file_to_modify, "r+", encoding="utf-8") as f:
-                                try:
-                                    data = json.load(f)
-                                    # Add update timestamp
-                                    if "development_updates" not in data:
-                                        data["development_updates"] = []
-                                    data["development_updates"].append({
-                                        "week": week,
-                                        "date": commit_time.strftime('%Y-%m-%d %H:%M'),
-                                        "description": "Feature enhancements"
-                                    })
-                                    f.seek(0)
-                                    json.dump(data, f, indent=2)
-                                    f.truncate()
-                                except json.JSONDecodeError:
-                                    # If JSON is invalid, append as comment
-                                    f.write(f"\n// Week {week} - {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
-                        else:
-                            with open(file_to_modify, "w", encoding="utf-8") as f:
-                                json.dump({
-                                    "development_updates": [{
-                                        "week": week,
-                                        "date": commit_time.strftime('%Y-%m-%d %H:%M'),
-                                        "description": "Initial development"
-                                    }]
-                                }, f, indent=2)
-                                
-                    elif file_to_modify == "README.md":
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n### Week {week} Development\n")
-                            f.write(f"- **Date**: {commit_time.strftime('%Y-%m-%d')}\n")
-                            f.write("- **Updates**: Enhanced saree customization features\n")
-                            f.write("- **Progress**: Improved user experience and performance\n\n")
-                            
-                    else:
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n# Development Update - Week {week}\n")
-                            f.write(f"# Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
-                            f.write("# Project: Heeko Sarees Customization\n\n")
-                            
-                except Exception as e:
-                    print(f"⚠️  Could not modify {file_to_modify}: {e}")
-                    # Create backup update file
-                    backup_file = f"src/utils/weekly_updates/week_{week}_update_{commit_num}.txt"
-                    ensure_directory(backup_file)
-                    with open(backup_file, "w", encoding="utf-8") as f:
-                        f.write(f"Week {week} development update\n")
-                        f.write(f"Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
-                
-                # Stage all changes
-                add_result = subprocess.run(["git", "add", "."], capture_output=True, text=True)
-                if add_result.returncode != 0:
-                    print(f"❌ git add failed: {add_result.stderr}")
-                    continue
-                
-                # Set up environment with custom date
-                env = os.environ.copy()
-                env["GIT_AUTHOR_DATE"] = git_date_str
-                env["GIT_COMMITTER_DATE"] = git_date_str
-                
-                # Create commit message
-                message = random.choice(weekly_messages)
-                full_message = f"{message} - Week {week}"
+            branch_buffer = buffers[record.branch]
+            with metrics.phase("mutate"):
+                touched_file = apply_mutation(branch_buffer, record, commit_time, profile)
+            
+            if writer is not None:
+                with metrics.phase("stage"):
+                    changes = [(touched_file, branch_buffer.content(touched_file))]
+                    if record.branch is not None:
+                        branch_paths[record.branch].add(touched_file)
+                with metrics.phase("commit"):
+                    writer.commit(changes, full_message, commit_time, branch=record.branch)
+                metrics.commit_created()
+                echo(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: {full_message}")
+                continue
+            
+            with metrics.phase("stage"):
+                buffer.flush([touched_file])
                 
-                # Create commit
+                # Stage only the file this commit touched
+                if touched_file not in tracked:
+                    add_result = subprocess.run(["git", "add", "--", touched_file], capture_output=True, text=True)
+                    if add_result.returncode != 0:
+                        print(f"❌ git add failed: {add_result.stderr}")
+                        metrics.commit_failed()
+                        continue
+                    tracked.add(touched_file)
+            
+            # Set up environment with custom date
+            env = os.environ.copy()
+            if identity is not None:
+                git_date_str = git_raw_date(commit_time, identity.tz)
+                env["GIT_AUTHOR_NAME"] = env["GIT_COMMITTER_NAME"] = identity.name
+                env["GIT_AUTHOR_EMAIL"] = env["GIT_COMMITTER_EMAIL"] = identity.email
+            env["GIT_AUTHOR_DATE"] = git_date_str
+            env["GIT_COMMITTER_DATE"] = git_date_str
+            
+            # Create commit from just that path; -uno skips the untracked-file scan
+            with metrics.phase("commit"):
                 commit_result = subprocess.run([
-                    "git", "commit", "-m", full_message
+                    "git", "commit", "-q", "-uno", "-m", full_message, "--only", "--", touched_file
                 ], env=env, capture_output=True, text=True)
-                
-                if commit_result.returncode == 0:
-                    commit_count += 1
-                    print(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: {full_message}")
-                else:
-                    print(f"  ❌ Commit failed: {commit_result.stderr}")
-                    # Fallback: create a simple file and commit
-                    try:
-                        with open(f"fallback_update_{commit_count}.txt", "w") as f:
-                            f.write(f"Development update {commit_count}\n")
-                        subprocess.run(["git", "add", "."], check=True)
-                        subprocess.run(["git", "commit", "-m", f"Development update - Week {week}"], env=env, check=True)
-                        commit_count += 1
-                        print(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: Development update - Week {week}")
-                    except Exception as fallback_error:
-                        print(f"  💥 Fallback also failed: {fallback_error}")
+            
+            if commit_result.returncode == 0:
+                metrics.commit_created()
+                echo(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: {full_message}")
+            else:
+                print(f"  ❌ Commit failed: {commit_result.stderr}")
+                # Fallback: create a simple file and commit
+                try:
+                    with metrics.phase("commit"):
+                        fallback_file = f"fallback_update_{metrics.commits}.txt"
+                        with open(fallback_file, "w") as f:
+                            f.write(f"Development update {metrics.commits}\n")
+                        subprocess.run(["git", "add", "--", fallback_file], check=True)
+                        subprocess.run(["git", "commit", "-q", "-uno", "-m", f"Development update - Week {week}",
+                                        "--only", "--", fallback_file], env=env, check=True)
+                    metrics.commit_created(fallback=True)
+                    echo(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: Development update - Week {week}")
+                except Exception as fallback_error:
+                    print(f"  💥 Fallback also failed: {fallback_error}")
+                    metrics.commit_failed()
+        
+    if writer is not None:
+        with metrics.phase("finish"):
+            # Bring the working tree up to date once, then let the writer finish
+            buffer.flush()
+            writer.close()
+    for branch_buffer in buffers.values():
+        if branch_buffer is not buffer:
+            branch_buffer.close()
+    buffer.close()
+    
+    return metrics.commits
+
+async def _run_git(pipeline, *args, env=None):
+    """Run one git command without blocking the event loop; return (status, stderr)"""
+    started = time.perf_counter()
+    pipeline["in_flight"] = True
+    try:
+        process = await asyncio.create_subprocess_exec("git", *args, env=env, stdout=asyncio.subprocess.DEVNULL,
+                                                       stderr=asyncio.subprocess.PIPE)
+        _, stderr = await process.communicate()
+    finally:
+        pipeline["in_flight"] = False
+        pipeline["git_seconds"] += time.perf_counter() - started
+    return process.returncode, stderr.decode("utf-8", errors="replace")
+
+async def _apply_pipelined(plan, echo, identity, metrics, profile, memory_limit=None):
+    """Porcelain commits with the next commits prepared while git runs
+
+    A producer applies mutations in the buffer and snapshots the bytes and
+    environment of each commit into a bounded queue; a consumer writes
+    each snapshot to the work tree and runs `git add`/`git commit` (hooks
+    included) for it. Preparation that happens while a git command is in
+    flight is counted as overlap and reported in metrics.pipeline.
+    """
+    buffer = MutationBuffer(memory_limit=memory_limit)
+    tracked = tracked_paths()
+    queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    pipeline = {"in_flight": False, "prepare_seconds": 0.0, "overlap_seconds": 0.0, "git_seconds": 0.0}
+    base_env = os.environ.copy()
+    if identity is not None:
+        base_env["GIT_AUTHOR_NAME"] = base_env["GIT_COMMITTER_NAME"] = identity.name
+        base_env["GIT_AUTHOR_EMAIL"] = base_env["GIT_COMMITTER_EMAIL"] = identity.email
+    
+    async def produce():
+        try:
+            for record in plan:
+                if record.branch is not None or record.kind in ("fork", "merge"):
+                    raise ValueError("branch topology needs the fast-import backend, not pipelined")
+                # Nothing awaits in here, so git's in-flight state cannot change mid-way
+                overlapped = pipeline["in_flight"]
+                started = time.perf_counter()
+                commit_time = datetime.datetime.fromisoformat(record.timestamp)
+                with metrics.phase("mutate"):
+                    touched_file = apply_mutation(buffer, record, commit_time, profile)
+                    content = buffer.content(touched_file)
+                git_date_str = git_raw_date(commit_time, identity.tz) if identity is not None else record.timestamp
+                env = dict(base_env, GIT_AUTHOR_DATE=git_date_str, GIT_COMMITTER_DATE=git_date_str)
+                elapsed = time.perf_counter() - started
+                pipeline["prepare_seconds"] += elapsed
+                if overlapped:
+                    pipeline["overlap_seconds"] += elapsed
+                await queue.put((record, commit_time, touched_file, content, env))
+        finally:
+            # Even after an error, let the consumer finish what is queued
+            await queue.put(None)
+    
+    async def consume():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            record, commit_time, touched_file, content, env = item
+            
+            with metrics.phase("stage"):
+                # The buffer may be commits ahead; write this commit's snapshot
+                ensure_directory(touched_file)
+                with open(touched_file, "wb") as f:
+                    f.write(content)
+                if touched_file not in tracked:
+                    status, stderr = await _run_git(pipeline, "add", "--", touched_file)
+                    if status != 0:
+                        print(f"❌ git add failed: {stderr}")
+                        metrics.commit_failed()
+                        continue
+                    tracked.add(touched_file)
+            
+            with metrics.phase("commit"):
+                status, stderr = await _run_git(pipeline, "commit", "-q", "-uno", "-m", record.message,
+                                                "--only", "--", touched_file, env=env)
+            if status == 0:
+                metrics.commit_created()
+                echo(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: {record.message}")
+                continue
+            
+            print(f"  ❌ Commit failed: {stderr}")
+            # Fallback: create a simple file and commit
+            fallback_file = f"fallback_update_{metrics.commits}.txt"
+            fallback_message = f"Development update - Week {record.week}"
+            with metrics.phase("commit"):
+                with open(fallback_file, "w") as f:
+                    f.write(f"Development update {metrics.commits}\n")
+                status, stderr = await _run_git(pipeline, "add", "--", fallback_file)
+                if status == 0:
+                    status, stderr = await _run_git(pipeline, "commit", "-q", "-uno", "-m", fallback_message,
+                                                    "--only", "--", fallback_file, env=env)
+            if status == 0:
+                metrics.commit_created(fallback=True)
+                echo(f"  ✅ {commit_time.strftime('%Y-%m-%d')}: {fallback_message}")
+            else:
+                print(f"  💥 Fallback also failed: {stderr}")
+                metrics.commit_failed()
+    
+    producer = asyncio.ensure_future(produce())
+    try:
+        await consume()
+    finally:
+        producer.cancel()
+        # Every snapshot went straight to disk, so there is nothing left to flush
+        buffer.close()
+    producer.result()
     
+    del pipeline["in_flight"]
+    pipeline["overlap_ratio"] = (round(pipeline["overlap_seconds"] / pipeline["prepare_seconds"], 4)
+                                 if pipeline["prepare_seconds"] else 0.0)
+    metrics.pipeline = {name: round(value, 4) for name, value in pipeline.items()}
+    return metrics.commits
+
+def add_weekly_commits(backend="porcelain", plan=None, seed=None, end_date=None, extend=False,
+                       verbose=False, metrics=None, scheduler="legacy", topology=None, mutations=None,
+                       files=None, days=120, stream=False, batch_size=STREAM_BATCH_SIZE,
+                       memory_limit=STREAM_MEMORY_LIMIT):
+    """Add commits for every week over the past `days` (default 120)
+
+    backend="porcelain" runs `git commit` per commit, staging only the touched file;
+    backend="pipelined" does the same but prepares the next commits while git runs;
+    backend="fast-import" streams the whole history into one `git fast-import`;
+    backend="objects" writes the git objects directly from Python.
+    A previously saved `plan` is replayed as-is instead of planning a new one.
+    Passing a `seed` makes the run reproducible: the schedule comes from
+    random.Random(seed) and commits use the pinned identity, so the same
+    seed, end date and starting commit always give the same HEAD.
+    With `extend`, only the commits after the last extension's end date
+    are planned (see plan_extension()).
+    A non-linear `topology` adds feature/release branches and merges, and
+    `mutations` picks how files change (default: the legacy appends);
+    `files` is what they are drawn from (see select_files()).
+    Progress is reported through `metrics` (one line per second by
+    default); `verbose` prints every commit as well.
+    With `stream`, the plan is never materialised: records are drawn
+    lazily and applied `batch_size` at a time with file contents held
+    under `memory_limit` bytes, so memory stays flat however long the
+    window is.
+    """
+    
+    check_topology_backend(topology, backend)
+    identity = PINNED_IDENTITY if seed is not None else None
+    rng = random.Random(seed) if seed is not None else random
+    
+    extension = None
+    if plan is None and extend:
+        plan, extension = plan_extension(end_date=end_date, rng=rng, scheduler=scheduler, topology=topology,
+                                         files=files, lazy=stream, days=days)
+        if stream:
+            print("📅 Extending history (streaming)...")
+        else:
+            print(f"📅 Extending history with {len(plan)} new commits...")
+    
+    elif plan is None:
+        print(f"📅 Adding weekly commits for past {days} days...")
+        if end_date is None:
+            end_date = datetime.datetime.now()
+        start_date = end_date - datetime.timedelta(days=days)
+        print(f"📅 Generating commits for {days // 7} weeks")
+        print(f"📅 Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        plan = plan_commits(end_date=end_date, days=days, rng=rng, scheduler=scheduler, topology=topology,
+                            files=files, lazy=stream)
+    
+    if not stream:
+        plan = list(plan)
+    if metrics is None:
+        metrics = GenerationMetrics()
+    metrics.total = None if stream else len(plan)
+    if stream:
+        print(f"🌊 Streaming in batches of {batch_size} with {memory_limit // (1024 * 1024)} MB for file contents")
+    commit_count = apply_plan(plan, backend=backend, verbose=verbose, identity=identity, metrics=metrics,
+                              mutations=mutations, batch_size=batch_size if stream else None,
+                              memory_limit=memory_limit if stream else None)
+    if extension is not None:
+        # No fixture key: keys describe plan_commits() runs, not extensions
+        write_fixture_stamp(None, None, resolve_head(), extension)
+    
+    summary = metrics.finish()
+    phases = " · ".join(f"{name} {seconds:.2f}s" for name, seconds in summary["phases"].items())
+    print(f"⏱️  {summary['commits_per_second']:.0f} commits/s ({phases})")
+    if stream and summary["max_rss_mb"] is not None:
+        print(f"🧠 Peak RSS {summary['max_rss_mb']:.0f} MB")
+    if summary["pipeline"]:
+        pipeline = summary["pipeline"]
+        print(f"🔁 Pipeline overlap: {pipeline['overlap_seconds']:.2f}s of {pipeline['prepare_seconds']:.2f}s "
+              f"preparation ran during git commands ({pipeline['overlap_ratio']:.0%}), "
+              f"git busy {pipeline['git_seconds']:.2f}s")
     return commit_count
 
-def main():
+def fixture_key(seed, end_date, days, base=None, scheduler="legacy", topology=None, mutations=None,
+                files=None, stream=False):
+    """Content key for a seeded fixture: same key, same history"""
+    if files is None:
+        files = PROJECT_FILES
+    inputs = {
+        "version": GENERATOR_VERSION,
+        "seed": seed,
+        "end_date": end_date.isoformat() if end_date else None,
+        "days": days,
+        # An indexed sampler is fixed by its weights plus the tree at `base`
+        "files": files if isinstance(files, list) else {"index": files.config},
+        "messages": WEEKLY_MESSAGES,
+        "identity": list(PINNED_IDENTITY),
+        "base": base,
+    }
+    if scheduler != "legacy":
+        inputs["scheduler"] = scheduler
+    if not is_linear(topology):
+        inputs["topology"] = topology
+    if stream and (scheduler != "legacy" or not is_linear(topology)):
+        # Lazy planning only changes the draws for these (see plan_commits())
+        inputs["stream"] = True
+    if not is_legacy(mutations):
+        profile = mutation_profile(mutations)
+        inputs["mutations"] = {"profile": profile.name, "diff_sizes": profile.diff_sizes,
+                               "operations": profile.operations}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+def read_fixture_stamp():
+    """Return the stamp left by the last seeded run, or None"""
+    try:
+        with open(FIXTURE_STAMP, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_fixture_stamp(key, base, head, extension=None):
+    stamp = {"key": key, "base": base, "head": head}
+    if extension is not None:
+        stamp["extension"] = extension
+    with open(FIXTURE_STAMP, "w", encoding="utf-8") as f:
+        json.dump(stamp, f, indent=2)
+
+def fixture_is_current(seed, end_date, days, scheduler="legacy", topology=None, mutations=None, files=None,
+                       stream=False):
+    """True if HEAD is exactly what a seeded run with these inputs produced"""
+    stamp = read_fixture_stamp()
+    if stamp is None or stamp.get("head") != resolve_head():
+        return False
+    return stamp.get("key") == fixture_key(seed, end_date, days, stamp.get("base"), scheduler, topology,
+                                           mutations, files, stream)
+
+def read_manifest(manifest_path):
+    """Read fixture jobs from a JSON Lines manifest
+
+    Each line has a "path" and optionally seed, days, end_date, scheduler,
+    topology, mutations, files, file_weights and stream (true, or
+    {"batch_size": ..., "memory_limit_mb": ...}).
+    """
+    jobs = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            jobs.append({
+                "path": os.path.abspath(entry["path"]),
+                "seed": entry.get("seed"),
+                "days": entry.get("days", 120),
+                "end_date": entry.get("end_date"),
+                "scheduler": entry.get("scheduler", "legacy"),
+                "topology": entry.get("topology"),
+                "mutations": entry.get("mutations"),
+                "files": entry.get("files", "fixed"),
+                "file_weights": entry.get("file_weights"),
+                "stream": entry.get("stream", False),
+            })
+    return jobs
+
+def generate_fixture(job, backend="fast-import", finalize=False, cache_dir=None):
+    """Generate one fixture repo from a manifest entry
+
+    Runs inside a pool worker: the worker process changes into the job's
+    repo directory (initialising it if needed) and back afterwards, so
+    relative paths used by the planner and backends never leak between
+    repos. `cache_dir` and the job's path should be absolute.
+    
+    With `cache_dir`, seeded fixtures are finalized and archived under
+    their fixture key; a new repo whose key is already cached is unpacked
+    from the archive instead of being generated.
+    """
+    result = {"path": job["path"], "commits": 0, "seconds": 0.0, "skipped": False, "artifact": None}
+    seed = job["seed"]
+    end_date = job["end_date"]
+    if end_date is not None:
+        end_date = datetime.datetime.fromisoformat(end_date)
+    
+    reproducible = seed is not None and end_date is not None
+    scheduler = job.get("scheduler", "legacy")
+    topology = job.get("topology")
+    mutations = job.get("mutations")
+    stream = job.get("stream") or False
+    stream_options = stream if isinstance(stream, dict) else {}
+    check_topology_backend(topology, backend)
+    cache = FixtureCache(cache_dir) if cache_dir and reproducible else None
+    
+    # Sampling from the index needs the repo, so only fixed file lists can skip creating it
+    indexed = job.get("files", "fixed") == "index" or job.get("file_weights")
+    if cache is not None and not indexed and not os.path.exists(os.path.join(job["path"], ".git")):
+        key = fixture_key(seed, end_date, job["days"], None, scheduler, topology, mutations, stream=bool(stream))
+        if cache.extract(key, job["path"]):
+            result.update(skipped=True, artifact=cache.path_for(key))
+            return result
+    
+    os.makedirs(job["path"], exist_ok=True)
+    previous = os.getcwd()
+    os.chdir(job["path"])
+    try:
+        if not os.path.exists(".git"):
+            subprocess.run(["git", "init", "-q"], check=True)
+        
+        files = select_files(job.get("files", "fixed"), job.get("file_weights"))
+        if reproducible and fixture_is_current(seed, end_date, job["days"], scheduler, topology, mutations, files,
+                                               bool(stream)):
+            result["skipped"] = True
+            key = read_fixture_stamp()["key"]
+        else:
+            base = resolve_head()
+            plan = plan_commits(end_date=end_date, days=job["days"], rng=random.Random(seed), scheduler=scheduler,
+                                topology=topology, files=files, lazy=bool(stream))
+            
+            started = time.perf_counter()
+            memory_limit = stream_options.get("memory_limit_mb", STREAM_MEMORY_LIMIT // (1024 * 1024))
+            batch_size = stream_options.get("batch_size", STREAM_BATCH_SIZE)
+            result["commits"] = apply_plan(plan, backend=backend, verbose=False,
+                                           identity=PINNED_IDENTITY if seed is not None else None,
+                                           mutations=mutations,
+                                           batch_size=batch_size if stream else None,
+                                           memory_limit=memory_limit * 1024 * 1024 if stream else None)
+            result["seconds"] = time.perf_counter() - started
+            
+            if reproducible:
+                key = fixture_key(seed, end_date, job["days"], base, scheduler, topology, mutations, files,
+                                  bool(stream))
+                write_fixture_stamp(key, base, resolve_head())
+        
+        if cache is not None:
+            result["artifact"] = cache.lookup(key) or cache.store_repository(key)
+        elif finalize and not result["skipped"]:
+            finalize_repository()
+        return result
+    finally:
+        # Pool workers are reused, and the next job may use paths relative to where we started
+        os.chdir(previous)
+
+def generate_fixtures(jobs, backend="fast-import", workers=None, finalize=False, cache_dir=None):
+    """Generate many fixture repos in parallel and return aggregate stats"""
+    started = time.perf_counter()
+    total_commits = 0
+    failures = 0
+    # Workers change into each job's repo, so relative paths are resolved here
+    jobs = [dict(job, path=os.path.abspath(job["path"])) for job in jobs]
+    if cache_dir:
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_fixture, job, backend, finalize, cache_dir): job for job in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"  💥 {job['path']}: {e}")
+                continue
+            if result["skipped"]:
+                cached = f" ({result['artifact']})" if result["artifact"] else ""
+                print(f"  ⏭️  {result['path']}: up to date{cached}")
+                continue
+            total_commits += result["commits"]
+            print(f"  ✅ {result['path']}: {result['commits']} commits in {result['seconds']:.2f}s")
+            if result["artifact"]:
+                print(f"     📦 cached as {result['artifact']}")
+    
+    elapsed = time.perf_counter() - started
+    return {
+        "repos": len(jobs) - failures,
+        "failures": failures,
+        "commits": total_commits,
+        "seconds": elapsed,
+        "commits_per_second": total_commits / elapsed if elapsed else 0.0,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate 17 weeks of commit history")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="how commits are written (default: porcelain, fast-import with --manifest)")
+    parser.add_argument("--plan-out", metavar="PATH",
+                        help="write the planned commits as JSON Lines and exit without touching git")
+    parser.add_argument("--plan", metavar="PATH",
+                        help="replay a plan written by --plan-out instead of planning a new one")
+    parser.add_argument("--seed", type=int,
+                        help="seed the schedule and pin the commit identity for reproducible history")
+    parser.add_argument("--end-date", type=datetime.datetime.fromisoformat,
+                        help="end of the 120-day window (ISO date/time, default: now)")
+    parser.add_argument("--scheduler", choices=SCHEDULERS, default="legacy",
+                        help="how commit times are drawn (numpy: one vectorized batch, needs NumPy)")
+    parser.add_argument("--feature-width", type=int, default=0,
+                        help="parallel feature branches merged back per feature week (default: 0, linear)")
+    parser.add_argument("--feature-ratio", type=float, default=DEFAULT_TOPOLOGY["feature_ratio"],
+                        help="share of weeks developed on feature branches (default: 0.5)")
+    parser.add_argument("--release-every", type=int, default=0,
+                        help="fork a long-running release branch every N weeks (default: 0, never)")
+    parser.add_argument("--hotfix-ratio", type=float, default=DEFAULT_TOPOLOGY["hotfix_ratio"],
+                        help="chance per week of a commit on the newest release branch (default: 0.3)")
+    parser.add_argument("--mutators", choices=PROFILES, default="legacy",
+                        help="how files change (realistic: insertions, edits and deletions of varied size)")
+    parser.add_argument("--diff-sizes", type=parse_diff_sizes, metavar="SPEC",
+                        help='realistic diff-size buckets as "max_lines:weight,..." (default: 1:35,3:25,10:20,40:12,200:8)')
+    parser.add_argument("--files", choices=("fixed", "index"), default="fixed",
+                        help="draw targets from the fixed project list or from every file git tracks")
+    parser.add_argument("--file-weights", metavar="PATH",
+                        help="JSON weights for --files index: extensions, directories, exclude, size "
+                             "(log, linear or inverse); implies --files index")
+    parser.add_argument("--days", type=int, default=120,
+                        help="length of the window in days (default: 120)")
+    parser.add_argument("--stream", action="store_true",
+                        help="plan lazily and apply in batches with bounded memory, for very long windows")
+    parser.add_argument("--batch-size", type=int, default=STREAM_BATCH_SIZE,
+                        help=f"commits per batch with --stream (default: {STREAM_BATCH_SIZE})")
+    parser.add_argument("--memory-limit", type=int, default=STREAM_MEMORY_LIMIT // (1024 * 1024), metavar="MB",
+                        help="file contents kept in memory with --stream before spilling to disk (default: 64)")
+    parser.add_argument("--extend", action="store_true",
+                        help="only add commits after the last extension's end date, in Monday-aligned weeks")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print every commit instead of periodic progress")
+    parser.add_argument("--progress-interval", type=float, default=1.0,
+                        help="seconds between progress reports (default: 1)")
+    parser.add_argument("--metrics-out", metavar="PATH",
+                        help="append progress snapshots and the final summary as JSON Lines")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="generate every repo listed in a JSON Lines manifest "
+                             '({"path": ..., "seed": ..., "days": ..., "end_date": ...} per line)')
+    parser.add_argument("--finalize", action="store_true",
+                        help="repack with bitmaps and write a commit-graph after generating")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                        help="with --manifest: archive seeded fixtures here by fixture key and "
+                             "unpack new repos from the archive when the key is already cached")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes for --manifest (default: all cores)")
+    args = parser.parse_args(argv)
+    if args.cache_dir and not args.manifest:
+        parser.error("--cache-dir needs --manifest")
+    # Without --backend a branch topology defaults to fast-import (see main());
+    # manifest jobs carry their own topology and are checked per job
+    branches = (args.feature_width or args.release_every) and not args.manifest
+    if branches and args.backend and args.backend not in BRANCH_BACKENDS:
+        parser.error(f"--feature-width/--release-every need --backend {' or '.join(BRANCH_BACKENDS)}, "
+                     f"not {args.backend}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    topology = {"width": args.feature_width, "feature_ratio": args.feature_ratio,
+                "release_every": args.release_every, "hotfix_ratio": args.hotfix_ratio}
+    if is_linear(topology):
+        topology = None
+    file_weights = None
+    if args.file_weights:
+        with open(args.file_weights, "r", encoding="utf-8") as f:
+            file_weights = json.load(f)
+    mutations = None
+    if args.mutators != "legacy":
+        mutations = {"profile": args.mutators}
+        if args.diff_sizes:
+            mutations["diff_sizes"] = args.diff_sizes
+    
     print("=" * 70)
     print("👗 HEKO SARES - WEEKLY COMMIT HISTORY GENERATOR")
     print("=" * 70)
@@ -216,6 +878,26 @@ def main():
     print("to make your GitHub contributions show consistent activity.")
     print("=" * 70)
     
+    if args.plan_out:
+        rng = random.Random(args.seed) if args.seed is not None else random
+        plan = plan_commits(end_date=args.end_date, days=args.days, rng=rng, scheduler=args.scheduler,
+                            topology=topology, files=select_files(args.files, file_weights), lazy=args.stream)
+        count = write_plan(plan, args.plan_out)
+        print(f"📝 Wrote {count} planned commits to {args.plan_out}")
+        return
+    
+    if args.manifest:
+        jobs = read_manifest(args.manifest)
+        backend = args.backend or "fast-import"
+        print(f"🏭 Generating {len(jobs)} fixture repos with {args.jobs} workers ({backend})")
+        stats = generate_fixtures(jobs, backend=backend, workers=args.jobs, finalize=args.finalize,
+                                  cache_dir=args.cache_dir)
+        print(f"\n📊 {stats['commits']} commits across {stats['repos']} repos "
+              f"in {stats['seconds']:.2f}s ({stats['commits_per_second']:.0f} commits/s)")
+        if stats["failures"]:
+            print(f"⚠️  {stats['failures']} repos failed")
+        return
+    
     # Check if we're in a git repository
     if not os.path.exists(".git"):
         print("❌ Error: Not a git repository!")
@@ -228,18 +910,46 @@ def main():
         print("❌ Error: Git is not properly initialized")
         return
     
+    files = select_files(args.files, file_weights)
+    reproducible = args.seed is not None and args.end_date is not None and not (args.plan or args.extend)
+    if reproducible and fixture_is_current(args.seed, args.end_date, args.days, args.scheduler, topology,
+                                           mutations, files, args.stream):
+        print("✅ History already matches this seed and end date - nothing to do")
+        return
+    
     try:
         print("🚀 Starting commit generation...")
-        total_commits = add_weekly_commits()
+        base = resolve_head()
+        plan = None
+        if args.plan:
+            plan = read_plan(args.plan) if args.stream else list(read_plan(args.plan))
+        metrics = GenerationMetrics(interval=args.progress_interval, progress=not args.verbose,
+                                    jsonl_path=args.metrics_out)
+        backend = args.backend or ("porcelain" if topology is None else "fast-import")
+        total_commits = add_weekly_commits(backend=backend, plan=plan,
+                                           seed=args.seed, end_date=args.end_date, extend=args.extend,
+                                           verbose=args.verbose, metrics=metrics, scheduler=args.scheduler,
+                                           topology=topology, mutations=mutations, files=files,
+                                           days=args.days, stream=args.stream, batch_size=args.batch_size,
+                                           memory_limit=args.memory_limit * 1024 * 1024)
+        if reproducible:
+            key = fixture_key(args.seed, args.end_date, args.days, base, args.scheduler, topology, mutations,
+                              files, args.stream)
+            write_fixture_stamp(key, base, resolve_head())
+            print(f"🔑 Fixture key: {key}")
+        if args.finalize:
+            finalize_repository()
+            print("📦 Repacked with bitmaps and wrote the commit-graph")
         
         print("\n" + "=" * 70)
         print("🎉 COMMIT GENERATION COMPLETE!")
         print("=" * 70)
         print(f"📊 Results:")
-        print(f"   • Total weeks processed: 17")
+        weeks = max(args.days // 7, 1)
+        print(f"   • Total weeks processed: {weeks}")
         print(f"   • Total commits created: {total_commits}")
-        print(f"   • Average commits per week: {total_commits/17:.1f}")
-        print(f"   • Time period: Past 120 days")
+        print(f"   • Average commits per week: {total_commits/weeks:.1f}")
+        print(f"   • Time period: Past {args.days} days")
         
         print("\n➡️  Next Steps:")
         print("   1. Run: git log --oneline --graph to view commit history")
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import tarfile
+import tempfile
+
+
+def finalize_repository(path="."):
+    """Pack a freshly generated repo for fast cloning and scanning
+
+    Folds every loose object and pack into one pack with a reachability
+    bitmap, packs the refs and writes a commit-graph, so later `git log`,
+    clones and archiving no longer walk thousands of loose files.
+    """
+    for command in (["git", "repack", "-a", "-d", "-q", "--write-bitmap-index"],
+                    ["git", "pack-refs", "--all"],
+                    ["git", "commit-graph", "write", "--reachable"]):
+        subprocess.run(command, cwd=path, check=True, capture_output=True)
+
+
+def archive_repository(path, archive_path):
+    """Write the repo (work tree and .git) to a .tar.gz, atomically"""
+    directory = os.path.dirname(os.path.abspath(archive_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        # Pack files are already zlib-compressed; a light level keeps it quick
+        with os.fdopen(fd, "wb") as f, tarfile.open(fileobj=f, mode="w:gz", compresslevel=1) as tar:
+            tar.add(path, arcname=".")
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class FixtureCache:
+    """Archived fixture repos stored under their fixture key
+
+    The key (see fixed_weekly_commits.fixture_key) hashes every generator
+    input, so a hit is exactly the history a fresh run would produce and a
+    lookup is a single stat().
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(os.path.expanduser(root))
+
+    def path_for(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.tar.gz")
+
+    def lookup(self, key):
+        """Return the cached archive for `key`, or None"""
+        path = self.path_for(key)
+        return path if os.path.exists(path) else None
+
+    def store_repository(self, key, repo="."):
+        """Finalize `repo`, archive it under `key` and return the archive path"""
+        finalize_repository(repo)
+        path = self.path_for(key)
+        archive_repository(repo, path)
+        return path
+
+    def extract(self, key, destination):
+        """Unpack the archive for `key` into `destination`; False on a miss"""
+        path = self.lookup(key)
+        if path is None:
+            return False
+        os.makedirs(destination, exist_ok=True)
+        with tarfile.open(path, "r:gz") as tar:
+            # The archives are our own, but never let a member escape `destination`
+            tar.extractall(destination, filter="data")
+        return True
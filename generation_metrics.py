@@ -0,0 +1,105 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("mutate", "stage", "commit", "finish")
+
+
+def max_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class GenerationMetrics:
+    """Counters, per-phase timers and rate-limited progress for one run.
+
+    `commits` counts every commit created, `fallbacks` the ones that only
+    made it in through the fallback_update_*.txt path, and `failures` the
+    planned commits that produced nothing. Progress lines are printed (and
+    snapshots appended to `jsonl_path`) at most once per `interval` seconds.
+    Executors may set `pipeline` to a dict of overlap stats for the summary.
+    """
+
+    def __init__(self, total=None, interval=1.0, progress=True, jsonl_path=None):
+        self.total = total
+        self.interval = interval
+        self.progress = progress
+        self.commits = 0
+        self.failures = 0
+        self.fallbacks = 0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self.pipeline = None
+        self.started = time.perf_counter()
+        self._next_report = self.started + interval
+        self._jsonl = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block under `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] += time.perf_counter() - started
+
+    def commit_created(self, fallback=False):
+        self.commits += 1
+        if fallback:
+            self.fallbacks += 1
+        self.tick()
+
+    def commit_failed(self):
+        self.failures += 1
+        self.tick()
+
+    def snapshot(self, event="progress"):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "event": event,
+            "elapsed": round(elapsed, 4),
+            "commits": self.commits,
+            "total": self.total,
+            "failures": self.failures,
+            "fallbacks": self.fallbacks,
+            "commits_per_second": round(self.commits / elapsed, 2) if elapsed else 0.0,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phase_seconds.items()},
+            "max_rss_mb": max_rss_mb(),
+            "pipeline": self.pipeline,
+        }
+
+    def tick(self):
+        """Report progress if at least `interval` seconds passed since the last report"""
+        now = time.perf_counter()
+        if now < self._next_report:
+            return
+        self._next_report = now + self.interval
+        snapshot = self.snapshot()
+        self._export(snapshot)
+        if self.progress:
+            done = f"{snapshot['commits']}/{self.total}" if self.total else str(snapshot["commits"])
+            print(f"  ⏳ {done} commits, {snapshot['commits_per_second']:.0f}/s, "
+                  f"{self.failures} failed, {self.fallbacks} fallback")
+
+    def finish(self):
+        """Export the final summary and return it"""
+        summary = self.snapshot("summary")
+        self._export(summary)
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+        return summary
+
+    def _export(self, snapshot):
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(snapshot) + "\n")
+            self._jsonl.flush()
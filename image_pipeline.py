@@ -0,0 +1,329 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+import tempfile
+import concurrent.futures
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is only needed to build images
+    Image = ImageOps = None
+
+from catalog_compiler import ASSETS_MANIFEST, write_json
+
+SOURCE_DIR = os.path.join("assets", "source")
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".avif", ".tif", ".tiff", ".bmp")
+IMAGE_PIPELINE_VERSION = 1
+
+# Responsive widths; the catalog's remote photos are requested at w=400
+WIDTHS = (200, 400, 800)
+# Derivative formats, best first, with their encoder options
+FORMATS = {
+    "avif": ("AVIF", {"quality": 55, "speed": 6}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+# Blur placeholders are this wide and inlined as data URIs
+PLACEHOLDER_WIDTH = 16
+
+# Collections whose images are also 3D textures (PatternMaterial), packed
+# as square cells into atlases of ATLAS_COLUMNS x ATLAS_COLUMNS
+TEXTURE_COLLECTIONS = ("patterns",)
+TEXTURE_SIZE = 256
+ATLAS_COLUMNS = 8
+
+# Names the pipeline writes: <id>-<hash>-<width>.<format>, <id>-<hash>.png
+# and atlas-<hash>.webp, one directory below the manifest
+_DERIVATIVE_NAME = re.compile(r".-[0-9a-f]{12}(-[0-9]+)?\.[a-z]+$")
+
+
+def available_formats():
+    """The derivative formats this Pillow build can write"""
+    if Image is None:
+        return []
+    Image.init()
+    return [name for name, (pillow_format, _) in FORMATS.items() if pillow_format in Image.SAVE]
+
+
+def pipeline_settings(formats):
+    """Everything besides the source bytes that decides the derivatives"""
+    return {
+        "version": IMAGE_PIPELINE_VERSION,
+        "widths": list(WIDTHS),
+        "formats": {name: FORMATS[name][1] for name in formats},
+        "placeholder": PLACEHOLDER_WIDTH,
+        "texture": TEXTURE_SIZE,
+    }
+
+
+def scan_sources(source_dir):
+    """Return ({"collection/id": path}, problems) for <source_dir>/<collection>/<id>.<ext>"""
+    sources = {}
+    problems = []
+    for collection in sorted(os.listdir(source_dir)):
+        directory = os.path.join(source_dir, collection)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            item_id, extension = os.path.splitext(filename)
+            if extension.lower() not in SOURCE_EXTENSIONS:
+                continue
+            key = f"{collection}/{item_id}"
+            if key in sources:
+                problems.append(f"{key}: several sources, using {os.path.basename(sources[key])}")
+                continue
+            sources[key] = os.path.join(directory, filename)
+    return sources, problems
+
+
+def content_hash(path, settings):
+    """SHA-256 of the source bytes and the settings it is rendered with"""
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _save(image, path, pillow_format, options):
+    # Through a temporary file, so a crash never leaves a truncated derivative behind
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, pillow_format, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return os.path.getsize(path)
+
+
+def render_image(key, source, digest, out_dir, formats):
+    """Write one source's derivatives and return its manifest entry (runs in a worker)"""
+    collection, item_id = key.split("/", 1)
+    stem = f"{collection}/{item_id}-{digest[:12]}"
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    width, height = image.size
+    entry = {"width": width, "height": height, "srcset": {}, "files": [], "bytes": 0}
+
+    # Never upscale: widths above the source's collapse into the source width
+    targets = sorted({min(target, width) for target in WIDTHS})
+    for target in targets:
+        resized = image if target == width else image.resize((target, max(1, round(height * target / width))),
+                                                              Image.LANCZOS)
+        for name in formats:
+            pillow_format, options = FORMATS[name]
+            path = f"{stem}-{target}.{name}"
+            entry["bytes"] += _save(resized, os.path.join(out_dir, path), pillow_format, options)
+            entry["files"].append(path)
+            entry["srcset"].setdefault(name, []).append([target, path])
+
+    tiny = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BOX)
+    buffer = io.BytesIO()
+    if "webp" in formats:
+        mime = "image/webp"
+        tiny.save(buffer, "WEBP", quality=30)
+    else:
+        mime = "image/png"
+        tiny.save(buffer, "PNG", optimize=True)
+    entry["placeholder"] = f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+    if collection in TEXTURE_COLLECTIONS:
+        path = f"textures/{item_id}-{digest[:12]}.png"
+        cell = ImageOps.fit(image.convert("RGB"), (TEXTURE_SIZE, TEXTURE_SIZE), Image.LANCZOS)
+        _save(cell, os.path.join(out_dir, path), "PNG", {"optimize": True})
+        entry["texture"] = path
+    return entry
+
+
+def atlas_layout(keys):
+    """Cell of each texture key: (atlas number, uv box), uv as three.js reads it (v up)"""
+    cells = ATLAS_COLUMNS * ATLAS_COLUMNS
+    layout = {}
+    for position, key in enumerate(keys):
+        atlas, cell = divmod(position, cells)
+        row, col = divmod(cell, ATLAS_COLUMNS)
+        step = 1 / ATLAS_COLUMNS
+        layout[key] = (atlas, [col * step, 1 - (row + 1) * step, (col + 1) * step, 1 - row * step])
+    return layout
+
+
+def render_atlas(path, textures, out_dir):
+    """Pack texture cells (row by row) into one atlas image (runs in a worker)"""
+    side = TEXTURE_SIZE * ATLAS_COLUMNS
+    atlas = Image.new("RGB", (side, side))
+    for cell, texture in enumerate(textures):
+        row, col = divmod(cell, ATLAS_COLUMNS)
+        with Image.open(os.path.join(out_dir, texture)) as tile:
+            atlas.paste(tile, (col * TEXTURE_SIZE, row * TEXTURE_SIZE))
+    return _save(atlas, os.path.join(out_dir, path), "WEBP", {"quality": 85, "method": 4})
+
+
+def read_manifest(path, settings):
+    """The previous run's manifest, or an empty one if it was built with other settings"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"images": {}}
+    if manifest.get("settings") != settings:
+        return {"images": {}}
+    return manifest
+
+
+def build_assets(source_dir=SOURCE_DIR, manifest_path=ASSETS_MANIFEST, workers=None, force=False):
+    """Render derivatives for every source image that changed; return (manifest, stats, problems)
+
+    An image is re-rendered only when the hash of its bytes and the
+    pipeline settings differs from the manifest's or one of its files is
+    gone; the hash itself is only recomputed when size or mtime changed.
+    Images and atlases are rendered across a process pool.
+    """
+    formats = available_formats()
+    if not formats:
+        raise RuntimeError("Pillow with WebP or AVIF support is required (pip install Pillow)")
+    out_dir = os.path.dirname(os.path.abspath(manifest_path))
+    settings = pipeline_settings(formats)
+    previous = {} if force else read_manifest(manifest_path, settings)["images"]
+    sources, problems = scan_sources(source_dir)
+    stats = {"images": len(sources), "rendered": 0, "cached": 0, "failed": 0, "atlases": 0, "bytes": 0}
+
+    images = {}
+    pending = {}
+    for key, source in sources.items():
+        status = os.stat(source)
+        stamp = [status.st_size, status.st_mtime_ns]
+        old = previous.get(key)
+        if old is not None and old["stamp"] == stamp and old["source"] == source:
+            digest = old["hash"]
+        else:
+            digest = content_hash(source, settings)
+        if old is not None and old["hash"] == digest and all(
+                os.path.exists(os.path.join(out_dir, path)) for path in old["files"] + [old.get("texture")] if path):
+            images[key] = dict(old, source=source, stamp=stamp)
+            stats["cached"] += 1
+        else:
+            pending[key] = (source, stamp, digest)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_image, key, source, digest, out_dir, formats): key
+                   for key, (source, _, digest) in pending.items()}
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            source, stamp, digest = pending[key]
+            try:
+                entry = future.result()
+            except Exception as e:
+                stats["failed"] += 1
+                problems.append(f"{key}: {e}")
+                continue
+            images[key] = dict(entry, source=source, stamp=stamp, hash=digest)
+            stats["rendered"] += 1
+
+        # Atlases are named by their cells' content, so an unchanged atlas is never redrawn
+        textures = sorted(key for key, entry in images.items() if entry.get("texture"))
+        groups = {}
+        for key, (atlas, uv) in atlas_layout(textures).items():
+            groups.setdefault(atlas, []).append(key)
+            images[key]["atlas"] = {"uv": uv}
+        atlas_futures = {}
+        for keys in groups.values():
+            members = [images[key]["texture"] for key in keys]
+            name = hashlib.sha256("\n".join(members).encode("utf-8")).hexdigest()[:12]
+            path = f"textures/atlas-{name}.webp"
+            for key in keys:
+                images[key]["atlas"]["file"] = path
+            if not os.path.exists(os.path.join(out_dir, path)):
+                atlas_futures[pool.submit(render_atlas, path, members, out_dir)] = path
+        for future in concurrent.futures.as_completed(atlas_futures):
+            try:
+                future.result()
+                stats["atlases"] += 1
+            except Exception as e:
+                problems.append(f"{atlas_futures[future]}: {e}")
+
+    stats["bytes"] = sum(entry["bytes"] for entry in images.values())
+    manifest = {"version": IMAGE_PIPELINE_VERSION, "settings": settings,
+                "images": {key: images[key] for key in sorted(images)}}
+    return manifest, stats, problems
+
+
+def prune_assets(manifest, out_dir):
+    """Delete the derivatives and atlases under `out_dir` that `manifest` no longer uses; return their paths
+
+    Only files named like the pipeline's output are touched, so anything
+    else kept next to the manifest stays.
+    """
+    used = set()
+    for entry in manifest["images"].values():
+        used.update(entry["files"])
+        used.update(path for path in (entry.get("texture"), entry.get("atlas", {}).get("file")) if path)
+    removed = []
+    for directory in sorted(os.listdir(out_dir)):
+        if not os.path.isdir(os.path.join(out_dir, directory)):
+            continue
+        for filename in sorted(os.listdir(os.path.join(out_dir, directory))):
+            path = f"{directory}/{filename}"
+            if path not in used and _DERIVATIVE_NAME.search(filename):
+                os.unlink(os.path.join(out_dir, path))
+                removed.append(path)
+    return removed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render responsive image derivatives for the catalog")
+    parser.add_argument("--source", default=SOURCE_DIR,
+                        help=f"source images as <collection>/<id>.<ext> (default: {SOURCE_DIR})")
+    parser.add_argument("--manifest", default=ASSETS_MANIFEST,
+                        help=f"manifest to write; derivatives go next to it (default: {ASSETS_MANIFEST})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render every image, ignoring the previous manifest")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - IMAGE PIPELINE")
+    print("=" * 70)
+
+    if Image is None:
+        print("❌ Pillow is not installed (pip install Pillow)")
+        sys.exit(1)
+    if not os.path.isdir(args.source):
+        print(f"❌ No source directory at {args.source}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    manifest, stats, problems = build_assets(args.source, args.manifest, args.workers, args.force)
+    elapsed = time.perf_counter() - started
+    for problem in problems:
+        print(f"  ⚠️  {problem}")
+    print(f"  🖼️  {stats['images']} images: {stats['rendered']} rendered, {stats['cached']} unchanged, "
+          f"{stats['failed']} failed")
+    print(f"  🧩 {stats['atlases']} texture atlases drawn")
+    print(f"  ⏱️  {elapsed:.2f}s, {stats['bytes']:,} bytes of derivatives "
+          f"({', '.join(manifest['settings']['formats'])})")
+
+    size = write_json(manifest, args.manifest)
+    print(f"\n📝 Wrote {args.manifest}: {size} bytes")
+    # Only once the manifest is written, so a crash never leaves it pointing at deleted files
+    removed = prune_assets(manifest, os.path.dirname(os.path.abspath(args.manifest)))
+    if removed:
+        print(f"🧹 Removed {len(removed)} stale derivatives")
+    if stats["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+UPDATES_KEY = "development_updates"
+
+# Rough per-object overhead of a str in a list, for resident-size estimates
+_STR_OVERHEAD = 56
+_PLACEHOLDER = "__heeko_development_updates__"
+
+
+def ensure_directory(file_path):
+    """Ensure directory exists for the given file path"""
+    directory = os.path.dirname(file_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+
+def _encode(text):
+    return text.encode("utf-8", errors="surrogateescape")
+
+
+def _render_update(entry):
+    # An item of a top-level list, as json.dump(indent=2) lays it out
+    return "\n".join("    " + line for line in json.dumps(entry, indent=2).split("\n"))
+
+
+class TextFile:
+    """Plain file content that only ever grows at the end"""
+
+    def __init__(self, text):
+        self.text = text
+
+    def append(self, text):
+        self.text += text
+
+    def render(self):
+        return self.text
+
+    def encode(self):
+        return _encode(self.text)
+
+    def nbytes(self):
+        return len(self.text)
+
+    def copy(self):
+        return TextFile(self.text)
+
+
+class LineFile:
+    """File content held as blocks of lines (with their line endings).
+
+    Each block caches its own encoded bytes, so splicing lines in or out
+    of a large file only re-encodes the blocks it touches and encode()
+    joins a few hundred byte strings instead of rebuilding every line.
+    """
+
+    BLOCK_LINES = 512
+
+    def __init__(self, text):
+        lines = text.splitlines(keepends=True)
+        self.blocks = self._chunk(lines)
+        self.chunks = [_encode("".join(block)) for block in self.blocks]
+        self.length = len(lines)
+        self.size = sum(map(len, self.chunks))
+        self._data = None
+
+    def _chunk(self, lines):
+        size = self.BLOCK_LINES
+        return [lines[i:i + size] for i in range(0, len(lines), size)]
+
+    def __len__(self):
+        return self.length
+
+    def append(self, text):
+        lines = self.blocks.pop() if self.blocks else []
+        self.size -= sum(map(len, self.chunks[len(self.blocks):]))
+        self.chunks = self.chunks[:len(self.blocks)]
+        self.length -= len(lines)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            text = lines.pop() + text
+        lines.extend(text.splitlines(keepends=True))
+        self.length += len(lines)
+        blocks = self._chunk(lines)
+        self.blocks.extend(blocks)
+        chunks = [_encode("".join(block)) for block in blocks]
+        self.chunks.extend(chunks)
+        self.size += sum(map(len, chunks))
+        self._data = None
+
+    def splice(self, start, stop, lines):
+        # Find the blocks holding lines [start, stop], then rebuild just those
+        first = last = None
+        offset = first_offset = 0
+        for index, block in enumerate(self.blocks):
+            if first is None and start <= offset + len(block):
+                first, first_offset = index, offset
+            if stop <= offset + len(block):
+                last = index
+                break
+            offset += len(block)
+        if first is None:
+            first, first_offset = len(self.blocks), offset
+        if last is None:
+            last = len(self.blocks) - 1
+
+        affected = [line for block in self.blocks[first:last + 1] for line in block]
+        start -= first_offset
+        stop -= first_offset
+        # Keep the line before an insertion at the very end terminated
+        if lines and affected and start == len(affected) and last == len(self.blocks) - 1 \
+                and not affected[-1].endswith(("\n", "\r")):
+            affected[-1] += "\n"
+        self.length += len(lines) - len(affected[start:stop])
+        affected[start:stop] = lines
+
+        blocks = self._chunk(affected)
+        self.blocks[first:last + 1] = blocks
+        chunks = [_encode("".join(block)) for block in blocks]
+        self.size += sum(map(len, chunks)) - sum(map(len, self.chunks[first:last + 1]))
+        self.chunks[first:last + 1] = chunks
+        self._data = None
+
+    def encode(self):
+        if self._data is None:
+            self._data = b"".join(self.chunks)
+        return self._data
+
+    def render(self):
+        return self.encode().decode("utf-8", errors="surrogateescape")
+
+    def nbytes(self):
+        # The encoded blocks plus the line strings they were built from
+        return 2 * self.size + _STR_OVERHEAD * self.length
+
+    def copy(self):
+        clone = LineFile.__new__(LineFile)
+        clone.blocks = [list(block) for block in self.blocks]
+        clone.chunks, clone._data, clone.length, clone.size = list(self.chunks), self._data, self.length, self.size
+        return clone
+
+
+class JsonUpdatesFile:
+    """A JSON object whose `development_updates` list is appended to in place.
+
+    The document is split once into the text before the list, the rendered
+    list items and the text after it, so appending an update is O(entry)
+    instead of a full parse and dump. render() matches json.dump(indent=2).
+    """
+
+    def __init__(self, data):
+        updates = data.get(UPDATES_KEY, [])
+        data[UPDATES_KEY] = _PLACEHOLDER
+        self.head, self.tail = json.dumps(data, indent=2).split(f'"{_PLACEHOLDER}"', 1)
+        self.items = [_render_update(entry) for entry in updates]
+        self.size = sum(map(len, self.items))
+        self._text = None
+
+    def copy(self):
+        clone = JsonUpdatesFile.__new__(JsonUpdatesFile)
+        clone.head, clone.tail, clone._text = self.head, self.tail, self._text
+        clone.items, clone.size = list(self.items), self.size
+        return clone
+
+    def add_update(self, entry):
+        item = _render_update(entry)
+        self.items.append(item)
+        self.size += len(item)
+        self._text = None
+
+    def splice(self, start, stop, entries):
+        items = [_render_update(entry) for entry in entries]
+        self.size += sum(map(len, items)) - sum(map(len, self.items[start:stop]))
+        self.items[start:stop] = items
+        self._text = None
+
+    def render(self):
+        if self._text is None:
+            if self.items:
+                body = "[\n" + ",\n".join(self.items) + "\n  ]"
+            else:
+                body = "[]"
+            self._text = self.head + body + self.tail
+        return self._text
+
+    def encode(self):
+        return _encode(self.render())
+
+    def nbytes(self):
+        return len(self.head) + len(self.tail) + self.size + _STR_OVERHEAD * len(self.items)
+
+
+class _Residency:
+    """Byte budget and LRU order shared by a buffer and all its forks"""
+
+    def __init__(self, limit, spill_dir=None):
+        self.limit = limit
+        self.spill_dir = tempfile.mkdtemp(prefix="heeko-spill-", dir=spill_dir)
+        # (buffer serial, path) -> (buffer, estimated bytes), least recent first
+        self.order = OrderedDict()
+        self.total = 0
+        self.spills = 0
+        self.serials = itertools.count()
+
+    def touch(self, buffer, path, nbytes):
+        key = (buffer.serial, path)
+        previous = self.order.pop(key, None)
+        if previous is not None:
+            self.total -= previous[1]
+        self.order[key] = (buffer, nbytes)
+        self.total += nbytes
+        # Never evict the file being used; one oversized file may exceed the budget
+        while self.total > self.limit and len(self.order) > 1:
+            (serial, victim_path), (victim, victim_bytes) = self.order.popitem(last=False)
+            self.total -= victim_bytes
+            victim._evict(victim_path)
+
+    def forget(self, buffer, path):
+        previous = self.order.pop((buffer.serial, path), None)
+        if previous is not None:
+            self.total -= previous[1]
+
+
+class MutationBuffer:
+    """In-memory view of the files a generator run touches.
+
+    Files are loaded from disk on first use, mutated in memory and only
+    written back (or handed to a backend as blobs) when a commit needs them.
+
+    With a `memory_limit` (bytes, shared with every fork), the least
+    recently used files are evicted once the estimated resident size goes
+    over it: unchanged files are simply dropped and re-read from the work
+    tree, changed ones are spilled to a temporary directory first.
+    """
+
+    def __init__(self, memory_limit=None, spill_dir=None, _residency=None):
+        self.files = {}
+        self.dirty = set()
+        self.spilled = set()
+        self.residency = _residency
+        if self.residency is None and memory_limit is not None:
+            self.residency = _Residency(memory_limit, spill_dir)
+        self.serial = next(self.residency.serials) if self.residency is not None else 0
+
+    def _touch(self, path):
+        if self.residency is not None:
+            self.residency.touch(self, path, self.files[path].nbytes())
+
+    def _changed(self, path):
+        self.dirty.add(path)
+        self._touch(path)
+
+    def _spill_path(self, path):
+        name = hashlib.sha1(path.encode("utf-8", errors="surrogateescape")).hexdigest()
+        return os.path.join(self.residency.spill_dir, f"{self.serial}-{name}")
+
+    def _evict(self, path):
+        state = self.files.pop(path)
+        if path in self.dirty:
+            with open(self._spill_path(path), "wb") as f:
+                f.write(state.encode())
+            self.spilled.add(path)
+            self.residency.spills += 1
+
+    def _load(self, path):
+        state = self.files.get(path)
+        if state is None:
+            text = ""
+            source = path
+            if path in self.spilled:
+                source = self._spill_path(path)
+                self.spilled.discard(path)
+            if os.path.exists(source):
+                with open(source, "r", encoding="utf-8", errors="surrogateescape", newline="") as f:
+                    text = f.read()
+            if source != path:
+                os.unlink(source)
+            state = self.files[path] = TextFile(text)
+            self._touch(path)
+        return state
+
+    def exists(self, path):
+        return path in self.files or path in self.spilled or os.path.exists(path)
+
+    def append(self, path, text):
+        """Append text to a file, creating it if needed"""
+        state = self._load(path)
+        if isinstance(state, JsonUpdatesFile):
+            state = self.files[path] = TextFile(state.render())
+        state.append(text)
+        self._changed(path)
+
+    def write(self, path, text):
+        """Replace a file's content"""
+        self.spilled.discard(path)
+        self.files[path] = TextFile(text)
+        self._changed(path)
+
+    def _lines(self, path):
+        state = self._load(path)
+        if not isinstance(state, LineFile):
+            state = self.files[path] = LineFile(state.render())
+        return state
+
+    def line_count(self, path):
+        return len(self._lines(path))
+
+    def splice(self, path, start, stop, lines):
+        """Replace lines [start:stop) of a file with `lines` (each ending in a newline)"""
+        self._lines(path).splice(start, stop, lines)
+        self._changed(path)
+
+    def _json_updates(self, path):
+        state = self._load(path)
+        if not isinstance(state, JsonUpdatesFile):
+            data = json.loads(state.render())
+            if not isinstance(data, dict):
+                raise json.JSONDecodeError("expected a JSON object", state.render(), 0)
+            state = self.files[path] = JsonUpdatesFile(data)
+        return state
+
+    def add_json_update(self, path, entry):
+        """Append `entry` to the file's development_updates list.
+
+        Raises json.JSONDecodeError if the file is not a JSON object.
+        """
+        self._json_updates(path).add_update(entry)
+        self._changed(path)
+
+    def json_update_count(self, path):
+        """Length of the file's development_updates list (raises like add_json_update)"""
+        return len(self._json_updates(path).items)
+
+    def splice_json_updates(self, path, start, stop, entries):
+        """Replace development_updates[start:stop] with `entries`"""
+        self._json_updates(path).splice(start, stop, entries)
+        self._changed(path)
+
+    def fork(self):
+        """Return an independent buffer starting from this one's contents"""
+        child = MutationBuffer(_residency=self.residency)
+        child.dirty = set(self.dirty)
+        for path in self.spilled:
+            shutil.copyfile(self._spill_path(path), child._spill_path(path))
+        child.spilled = set(self.spilled)
+        for path, state in list(self.files.items()):
+            child.files[path] = state.copy()
+            child._touch(path)
+        return child
+
+    def adopt(self, path, other):
+        """Take `path`'s content from another buffer (used for merges)"""
+        state = other._load(path).copy()
+        self.spilled.discard(path)
+        self.files[path] = state
+        self._changed(path)
+
+    def content(self, path):
+        """Return the current bytes of a tracked file"""
+        state = self._load(path)
+        self._touch(path)
+        return state.encode()
+
+    def flush(self, paths=None):
+        """Write dirty files (or just `paths`) to disk"""
+        for path in list(self.dirty if paths is None else paths):
+            if path not in self.dirty:
+                continue
+            ensure_directory(path)
+            with open(path, "wb") as f:
+                f.write(self.content(path))
+            self.dirty.discard(path)
+
+    def close(self):
+        """Drop this buffer's contents and spill files (call after flush())"""
+        if self.residency is not None:
+            for path in list(self.files):
+                self.residency.forget(self, path)
+            for path in self.spilled:
+                os.unlink(self._spill_path(path))
+            if self.serial == 0:
+                shutil.rmtree(self.residency.spill_dir, ignore_errors=True)
+        self.files.clear()
+        self.spilled.clear()
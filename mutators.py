@@ -0,0 +1,213 @@
+import bisect
+import itertools
+import json
+import random
+
+# Diff sizes for the realistic profile: (most lines changed, weight) buckets;
+# a size is drawn uniformly within its bucket. Roughly the long tail of
+# real-world commits: mostly small fixes, occasionally a large block.
+DEFAULT_DIFF_SIZES = ((1, 35), (3, 25), (10, 20), (40, 12), (200, 8))
+
+# How a realistic commit changes a file, with weights
+DEFAULT_OPERATIONS = (("insert", 50), ("edit", 30), ("delete", 20))
+
+# Line templates for generated blocks, formatted with week, date, line
+# number and a random token so repeated blocks still diff line by line
+LINE_TEMPLATES = {
+    "code": (
+        "// Week {week} ({date}): saree customization tweak #{line} [{token}]\n",
+        "const weeklyUpdate_{token} = {{ week: {week}, step: {line} }};\n",
+        "export const isEnabled_{token} = () => {week} > {line};\n",
+    ),
+    "css": (
+        "/* Week {week} ({date}): styling pass #{line} */\n",
+        ".weekly-{token} {{ margin: {line}px; }}\n",
+        ".saree-variant-{token}:hover {{ opacity: 0.{line}; }}\n",
+    ),
+    "readme": (
+        "- Week {week} ({date}): refined saree customization step {line}\n",
+        "- Improved performance of the design preview ({token})\n",
+        "- Updated documentation for feature {token}\n",
+    ),
+    "text": (
+        "# Week {week} ({date}): development note {line}\n",
+        "# Change {token}: Heeko Sarees customization\n",
+    ),
+}
+_FORMATTERS = {kind: tuple(template.format for template in templates)
+               for kind, templates in LINE_TEMPLATES.items()}
+
+MUTATORS = {}
+
+
+def register(profile, *kinds):
+    """Register a mutator function for `kinds` of file in `profile`"""
+    def decorator(mutator):
+        for kind in kinds:
+            MUTATORS.setdefault(profile, {})[kind] = mutator
+        return mutator
+    return decorator
+
+
+def _cumulative(weighted):
+    return list(itertools.accumulate(weight for _, weight in weighted))
+
+
+class MutationProfile:
+    """A registered set of mutators plus the diff-size distribution they draw from"""
+
+    def __init__(self, name="legacy", diff_sizes=DEFAULT_DIFF_SIZES, operations=DEFAULT_OPERATIONS):
+        if name not in MUTATORS:
+            raise ValueError(f"unknown mutation profile {name!r}")
+        self.name = name
+        self.mutators = MUTATORS[name]
+        self.diff_sizes = tuple(tuple(bucket) for bucket in diff_sizes)
+        self.operations = tuple(tuple(operation) for operation in operations)
+        self._size_totals = _cumulative(self.diff_sizes)
+        self._operation_totals = _cumulative(self.operations)
+
+    def apply(self, buffer, record, commit_time):
+        mutator = self.mutators.get(record.kind, self.mutators["text"])
+        mutator(self, buffer, record, commit_time)
+
+    def rng(self, record):
+        # Seeded by the record itself, so replaying a plan repeats every edit
+        return random.Random(f"{record.timestamp}|{record.path}|{record.commit_num}")
+
+    def draw_size(self, rng):
+        index = bisect.bisect(self._size_totals, rng.random() * self._size_totals[-1])
+        low = self.diff_sizes[index - 1][0] + 1 if index else 1
+        return rng.randint(low, self.diff_sizes[index][0])
+
+    def draw_operation(self, rng):
+        index = bisect.bisect(self._operation_totals, rng.random() * self._operation_totals[-1])
+        return self.operations[index][0]
+
+
+def mutation_profile(config=None):
+    """Build a MutationProfile from a {"profile": ..., "diff_sizes": ...} config"""
+    config = config or {}
+    return MutationProfile(config.get("profile", "legacy"),
+                           diff_sizes=config.get("diff_sizes", DEFAULT_DIFF_SIZES),
+                           operations=config.get("operations", DEFAULT_OPERATIONS))
+
+
+def is_legacy(config):
+    return not config or config.get("profile", "legacy") == "legacy"
+
+
+def parse_diff_sizes(spec):
+    """Parse "1:35,3:25,10:20" into ((1, 35), (3, 25), (10, 20))"""
+    buckets = []
+    for item in spec.split(","):
+        size, _, weight = item.partition(":")
+        buckets.append((int(size), float(weight or 1)))
+    if [size for size, _ in buckets] != sorted({size for size, _ in buckets}) or buckets[0][0] < 1:
+        raise ValueError(f"diff sizes must be increasing positive line counts: {spec!r}")
+    return tuple(buckets)
+
+
+@register("legacy", "code")
+def append_code_comment(profile, buffer, record, commit_time):
+    buffer.append(record.path,
+                  f"\n// Development update - Week {record.week}\n"
+                  f"// Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n"
+                  "// Saree customization feature improvements\n")
+
+
+@register("legacy", "css")
+def append_css_comment(profile, buffer, record, commit_time):
+    buffer.append(record.path,
+                  f"\n/* Development update - Week {record.week} */\n"
+                  f"/* Date: {commit_time.strftime('%Y-%m-%d %H:%M')} */\n"
+                  "/* UI and styling enhancements */\n")
+
+
+@register("legacy", "json")
+def append_json_update(profile, buffer, record, commit_time):
+    update = {
+        "week": record.week,
+        "date": commit_time.strftime('%Y-%m-%d %H:%M'),
+        "description": "Feature enhancements" if buffer.exists(record.path) else "Initial development"
+    }
+    try:
+        buffer.add_json_update(record.path, update)
+    except json.JSONDecodeError:
+        # If JSON is invalid, append as comment
+        buffer.append(record.path, f"\n// Week {record.week} - {commit_time.strftime('%Y-%m-%d %H:%M')}\n")
+
+
+@register("legacy", "readme")
+def append_readme_section(profile, buffer, record, commit_time):
+    buffer.append(record.path,
+                  f"\n### Week {record.week} Development\n"
+                  f"- **Date**: {commit_time.strftime('%Y-%m-%d')}\n"
+                  "- **Updates**: Enhanced saree customization features\n"
+                  "- **Progress**: Improved user experience and performance\n\n")
+
+
+@register("legacy", "text")
+def append_text_note(profile, buffer, record, commit_time):
+    buffer.append(record.path,
+                  f"\n# Development Update - Week {record.week}\n"
+                  f"# Date: {commit_time.strftime('%Y-%m-%d %H:%M')}\n"
+                  "# Project: Heeko Sarees Customization\n\n")
+
+
+def _generate_lines(kind, count, rng, week, date):
+    formatters = rng.choices(_FORMATTERS[kind], k=count)
+    return [format_line(week=week, date=date, line=line, token=f"{rng.getrandbits(32):08x}")
+            for line, format_line in enumerate(formatters, start=1)]
+
+
+@register("realistic", "code", "css", "readme", "text")
+def edit_lines(profile, buffer, record, commit_time):
+    """Insert, rewrite or delete a block of lines at a random position"""
+    rng = profile.rng(record)
+    kind = record.kind if record.kind in _FORMATTERS else "text"
+    date = commit_time.strftime('%Y-%m-%d %H:%M')
+    operation = profile.draw_operation(rng)
+    size = profile.draw_size(rng)
+    count = buffer.line_count(record.path)
+
+    # Never delete a file down to nothing; small files grow instead
+    if operation == "delete" and count > size:
+        start = rng.randint(0, count - size)
+        buffer.splice(record.path, start, start + size, [])
+    elif operation == "edit" and count:
+        size = min(size, count)
+        start = rng.randint(0, count - size)
+        buffer.splice(record.path, start, start + size,
+                      _generate_lines(kind, size, rng, record.week, date))
+    else:
+        start = rng.randint(0, count)
+        buffer.splice(record.path, start, start, _generate_lines(kind, size, rng, record.week, date))
+
+
+@register("realistic", "json")
+def edit_json_updates(profile, buffer, record, commit_time):
+    """Add, rewrite or drop a run of development_updates entries"""
+    rng = profile.rng(record)
+    try:
+        count = buffer.json_update_count(record.path)
+    except json.JSONDecodeError:
+        edit_lines(profile, buffer, record._replace(kind="text"), commit_time)
+        return
+
+    date = commit_time.strftime('%Y-%m-%d %H:%M')
+    operation = profile.draw_operation(rng)
+    size = profile.draw_size(rng)
+    entries = [{"week": record.week, "date": date, "description": f"Feature enhancements ({rng.getrandbits(32):08x})"}
+               for _ in range(size)]
+    if operation == "delete" and count > size:
+        start = rng.randint(0, count - size)
+        buffer.splice_json_updates(record.path, start, start + size, [])
+    elif operation == "edit" and count:
+        size = min(size, count)
+        start = rng.randint(0, count - size)
+        buffer.splice_json_updates(record.path, start, start + size, entries[:size])
+    else:
+        buffer.splice_json_updates(record.path, count, count, entries)
+
+
+PROFILES = tuple(MUTATORS)
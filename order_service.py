@@ -0,0 +1,381 @@
+import os
+import sys
+import json
+import time
+import signal
+import sqlite3
+import asyncio
+import argparse
+import concurrent.futures
+from http import HTTPStatus
+
+from catalog_compiler import CATALOG_PATH, TYPES_MODULE, column, parse_types, read_catalog, validate
+from price_table import SURCHARGES
+
+ORDERS_DB = "orders.db"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+
+# The catalog collection each part of a design is picked from
+DESIGN_PARTS = {
+    "saree": {"material": "materials", "color": "colors", "pattern": "patterns", "border": "borders",
+              "size": "sizes", "blouse": "blouses"},
+    "blouse": {"material": "blouseMaterials", "color": "colors", "style": "blouseStyles", "size": "blouseSizes"},
+}
+DESIGN_TYPES = {"saree": "CustomSaree", "blouse": "CustomBlouse"}
+# App.tsx's add-ons, charged when the design field is truthy
+ADD_ONS = {
+    "saree": SURCHARGES,
+    "blouse": {"embroidery": 300, "embroideryText": 200},
+}
+
+# Rows written per transaction at most; a batch is whatever queued up
+# while the previous one was committing
+BATCH_SIZE = 512
+# Writes waiting for the database; beyond this requests get a 503 at
+# once instead of queueing into unbounded latency
+QUEUE_LIMIT = 8192
+MAX_BODY = 64 * 1024
+# WAL with synchronous=NORMAL survives a crashed service; FULL also
+# survives power loss at the cost of an fsync per batch
+SYNCHRONOUS = "NORMAL"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    product TEXT NOT NULL,
+    email TEXT NOT NULL,
+    total_price REAL NOT NULL,
+    ordered_at TEXT,
+    received_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS designs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    total_price REAL NOT NULL,
+    created_at TEXT,
+    received_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+_INSERTS = {
+    "orders": "INSERT OR IGNORE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "designs": "INSERT OR IGNORE INTO designs VALUES (?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+class OrderStore:
+    """SQLite in WAL mode, written by one thread in group-committed batches"""
+
+    def __init__(self, path=ORDERS_DB, synchronous=SYNCHRONOUS):
+        # sqlite3 connections belong to the thread that opened them
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="order-store")
+        self.connection = self.executor.submit(self._open, path, synchronous).result()
+
+    @staticmethod
+    def _open(path, synchronous):
+        connection = sqlite3.connect(path, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={synchronous}")
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _write(self, batch):
+        # One transaction for the whole batch; False marks a duplicate id
+        inserted = []
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for table, row in batch:
+                cursor.execute(_INSERTS[table], row)
+                inserted.append(cursor.rowcount == 1)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return inserted
+
+    async def write(self, batch):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._write, batch)
+
+    def close(self):
+        self.executor.submit(self.connection.close).result()
+        self.executor.shutdown()
+
+
+def catalog_prices(catalog):
+    """{collection: {id: price}} for every collection a design part comes from"""
+    prices = {}
+    for name in {name for parts in DESIGN_PARTS.values() for name in parts.values()}:
+        collection = catalog["collections"].get(name)
+        if collection is None:
+            prices[name] = {}
+            continue
+        ids = column(collection, "id")
+        values = column(collection, "price") if "price" in collection["fields"] else [0] * len(ids)
+        prices[name] = {item_id: price or 0 for item_id, price in zip(ids, values)}
+    return prices
+
+
+def design_price(product, design, prices):
+    """Return (catalog total, problems) for a CustomSaree/CustomBlouse, as App.tsx prices it"""
+    total = 0
+    problems = []
+    for part, collection in DESIGN_PARTS[product].items():
+        choice = design.get(part)
+        if choice is None:
+            continue
+        price = prices[collection].get(choice.get("id"))
+        if price is None:
+            problems.append(f"design.{part}: no {collection} item {choice.get('id')!r} in the catalog")
+            continue
+        total += price
+    total += sum(amount for field, amount in ADD_ONS[product].items() if design.get(field))
+    return total, problems
+
+
+class OrderService:
+    """Validates orders and saved designs and queues them for group commit"""
+
+    def __init__(self, catalog, types, store, batch_size=BATCH_SIZE, queue_limit=QUEUE_LIMIT):
+        self.prices = catalog_prices(catalog)
+        self.types = types
+        self.store = store
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue(queue_limit)
+        self.stats = {"accepted": 0, "invalid": 0, "duplicates": 0, "rejected": 0, "failed": 0, "batches": 0,
+                      "largest_batch": 0, "commit_seconds": 0.0}
+
+    def _check_design(self, product, design, where):
+        problems = validate(design, ("name", DESIGN_TYPES[product]), self.types, where)
+        if problems:
+            return problems
+        total, problems = design_price(product, design, self.prices)
+        if not problems and abs(total - design["totalPrice"]) > 0.005:
+            problems.append(f"{where}.totalPrice: {design['totalPrice']} but the catalog prices it at {total}")
+        return problems
+
+    def check_order(self, order):
+        """Problems with an order as App.tsx's handleCustomerSubmit builds it"""
+        if not isinstance(order, dict):
+            return ["expected an object"]
+        if not isinstance(order.get("orderId"), str) or not order["orderId"]:
+            return ["orderId: missing"]
+        product = order.get("product")
+        if product not in DESIGN_PARTS:
+            return [f"product: expected one of {sorted(DESIGN_PARTS)}, got {product!r}"]
+        problems = validate(order.get("customer"), ("name", "CustomerInfo"), self.types, "customer")
+        problems.extend(self._check_design(product, order.get("design"), "design"))
+        if not problems and order.get("totalPrice") != order["design"]["totalPrice"]:
+            problems.append("totalPrice: differs from design.totalPrice")
+        return problems
+
+    def check_design(self, saved):
+        """Problems with a SavedDesign"""
+        if not isinstance(saved, dict):
+            return ["expected an object"]
+        problems = validate(saved, ("name", "SavedDesign"), self.types, "savedDesign")
+        if problems:
+            return problems
+        return self._check_design(saved["type"], saved["design"], "savedDesign.design")
+
+    async def submit(self, table, row):
+        """Queue a row for the next batch; True once committed, False for a duplicate id"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((table, row, future))
+        return await future
+
+    async def run_writer(self):
+        """Commit queued rows batch by batch until a None is queued"""
+        while True:
+            first = await self.queue.get()
+            if first is None:
+                return
+            batch = [first]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is None:
+                    self.queue.put_nowait(None)
+                    break
+                batch.append(item)
+            started = time.perf_counter()
+            try:
+                inserted = await self.store.write([(table, row) for table, row, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+            self.stats["commit_seconds"] += time.perf_counter() - started
+            for (_, _, future), ok in zip(batch, inserted):
+                if not future.done():
+                    future.set_result(ok)
+
+    async def handle(self, method, path, body):
+        """Return (status, document) for one request"""
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, dict(self.stats, queued=self.queue.qsize())
+        if path not in ("/orders", "/designs"):
+            return HTTPStatus.NOT_FOUND, {"error": f"no route {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{path} only accepts POST"}
+        try:
+            # Strict UTF-8 first: json.loads() also takes UTF-16/32 bytes, which the stored payload text is not
+            text = body.decode("utf-8")
+            payload = json.loads(text)
+        except UnicodeDecodeError as e:
+            self.stats["invalid"] += 1
+            return HTTPStatus.BAD_REQUEST, {"errors": [f"body is not UTF-8: {e}"]}
+        except ValueError as e:
+            self.stats["invalid"] += 1
+            return HTTPStatus.BAD_REQUEST, {"errors": [f"invalid JSON: {e}"]}
+
+        received = time.time()
+        if path == "/orders":
+            problems = self.check_order(payload)
+            if not problems:
+                item_id = payload["orderId"]
+                row = ("orders", (item_id, payload["product"], payload["customer"]["email"], payload["totalPrice"],
+                                  payload.get("orderDate"), received, text))
+        else:
+            problems = self.check_design(payload)
+            if not problems:
+                item_id = payload["id"]
+                row = ("designs", (item_id, payload["type"], payload["name"], payload["design"]["totalPrice"],
+                                   payload["createdAt"], received, text))
+        if problems:
+            self.stats["invalid"] += 1
+            return HTTPStatus.BAD_REQUEST, {"errors": problems}
+
+        try:
+            inserted = await self.submit(*row)
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "too many writes queued, retry shortly"}
+        except Exception as e:
+            # Its batch failed to commit (see run_writer()), so nothing of this request was stored
+            self.stats["failed"] += 1
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"could not store {item_id}: {e}"}
+        if not inserted:
+            self.stats["duplicates"] += 1
+            return HTTPStatus.CONFLICT, {"error": f"{item_id} was already received"}
+        self.stats["accepted"] += 1
+        return HTTPStatus.CREATED, {"id": item_id}
+
+
+def _response(status, document, keep_alive):
+    body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    headers = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+               f"Content-Length: {len(body)}"]
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        headers.append("Retry-After: 1")
+    if not keep_alive:
+        headers.append("Connection: close")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def serve_connection(service, reader, writer):
+    """Answer HTTP/1.1 requests on one keep-alive connection, one at a time"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError:
+                writer.write(_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "headers too large"},
+                                       False))
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+                headers = {name.strip().lower(): value.strip()
+                           for name, _, value in (line.partition(":") for line in lines[1:] if line)}
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, {"error": "malformed request"}, False))
+                return
+            if length > MAX_BODY:
+                writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"over {MAX_BODY} bytes"},
+                                       False))
+                return
+            body = await reader.readexactly(length) if length else b""
+            status, document = await service.handle(method, target.split("?", 1)[0], body)
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            writer.write(_response(status, document, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                return
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_service(catalog_path=CATALOG_PATH, db_path=ORDERS_DB, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                      batch_size=BATCH_SIZE, queue_limit=QUEUE_LIMIT, synchronous=SYNCHRONOUS, ready=None):
+    """Serve until cancelled, then commit whatever is still queued"""
+    store = OrderStore(db_path, synchronous)
+    service = OrderService(read_catalog(catalog_path), parse_types(TYPES_MODULE), store, batch_size, queue_limit)
+    writer = asyncio.create_task(service.run_writer())
+    server = await asyncio.start_server(lambda reader, stream: serve_connection(service, reader, stream),
+                                        host, port, backlog=1024)
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.queue.put(None)
+        await writer
+        store.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Receive orders and saved designs over HTTP into SQLite")
+    parser.add_argument("--catalog", default=CATALOG_PATH,
+                        help=f"catalog written by catalog_compiler.py (default: {CATALOG_PATH})")
+    parser.add_argument("--db", default=ORDERS_DB, help=f"SQLite database (default: {ORDERS_DB})")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"most rows per transaction (default: {BATCH_SIZE})")
+    parser.add_argument("--queue-limit", type=int, default=QUEUE_LIMIT,
+                        help=f"queued writes before answering 503 (default: {QUEUE_LIMIT})")
+    parser.add_argument("--synchronous", choices=("NORMAL", "FULL"), default=SYNCHRONOUS,
+                        help=f"SQLite synchronous mode (default: {SYNCHRONOUS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - ORDER SERVICE")
+    print("=" * 70)
+
+    if not os.path.exists(args.catalog):
+        print(f"❌ No catalog at {args.catalog} (run catalog_compiler.py first)")
+        sys.exit(1)
+
+    def ready(server):
+        # SIGTERM stops the service like Ctrl-C: queued rows are committed first
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:  # Windows
+            pass
+        print(f"  🛒 Listening on http://{args.host}:{args.port} (POST /orders, POST /designs, GET /stats)")
+        print(f"  🗄️  {args.db}: WAL, synchronous={args.synchronous}, batches of up to {args.batch_size}")
+        sys.stdout.flush()
+
+    try:
+        asyncio.run(run_service(args.catalog, args.db, args.host, args.port, args.batch_size, args.queue_limit,
+                                args.synchronous, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import json
+import math
+import os
+import subprocess
+
+INDEX_CACHE = os.path.join(".git", "heeko_path_index.json")
+
+# Default sampling weights. Only text files the mutators know how to edit
+# get a weight; lockfiles and tool config directories are left alone, as
+# are Vue and HTML files, where no mutator's comment syntax is valid.
+DEFAULT_WEIGHTS = {
+    "extensions": {
+        ".tsx": 1.0, ".ts": 1.0, ".jsx": 1.0, ".js": 1.0, ".css": 1.0,
+        ".json": 0.5, ".md": 0.5,
+    },
+    "directories": {".bolt": 0.0},
+    "exclude": ["package-lock.json", "yarn.lock"],
+    "size": None,
+}
+
+SIZE_WEIGHTS = {
+    "log": lambda size: math.log2(size + 2),
+    "linear": lambda size: size + 1,
+    "inverse": lambda size: 1 / math.log2(size + 2),
+}
+
+# Each alias column is split into this many slots, so one uniform integer
+# draw picks both the column and the coin flip
+_RESOLUTION = 1 << 20
+
+
+def _index_stamp():
+    try:
+        stat = os.stat(os.path.join(".git", "index"))
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_path_index():
+    """Return (paths, sizes) for every tracked file, cached until the git index changes"""
+    stamp = _index_stamp()
+    try:
+        with open(INDEX_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if stamp is not None and cached.get("stamp") == stamp:
+            return cached["paths"], cached["sizes"]
+    except (OSError, ValueError):
+        pass
+
+    result = subprocess.run(["git", "ls-files", "-z"], capture_output=True, check=True)
+    paths = [path for path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if path]
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.stat(path).st_size)
+        except OSError:
+            sizes.append(0)
+
+    if stamp is not None:
+        with open(INDEX_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "paths": paths, "sizes": sizes}, f)
+    return paths, sizes
+
+
+def merge_weights(overrides=None):
+    """Layer a user weight config over DEFAULT_WEIGHTS, section by section"""
+    weights = {key: (dict(value) if isinstance(value, dict) else value) for key, value in DEFAULT_WEIGHTS.items()}
+    for key, value in (overrides or {}).items():
+        if isinstance(weights.get(key), dict):
+            weights[key].update(value)
+        else:
+            weights[key] = value
+    return weights
+
+
+def _directory_factor(directory, directories, memo):
+    # Factor of the deepest configured directory containing `directory`
+    factor = memo.get(directory)
+    if factor is None:
+        if directory in directories:
+            factor = directories[directory]
+        elif directory:
+            factor = _directory_factor(directory.rpartition("/")[0], directories, memo)
+        else:
+            factor = 1.0
+        memo[directory] = factor
+    return factor
+
+
+def path_weights(paths, sizes, weights):
+    """Weight of every path: extension x deepest matching directory x size factor"""
+    extensions, directories = weights["extensions"], weights["directories"]
+    exclude = set(weights["exclude"])
+    size_weight = SIZE_WEIGHTS[weights["size"]] if weights["size"] else None
+    memo = {}
+    result = []
+    for path, size in zip(paths, sizes):
+        directory, _, name = path.rpartition("/")
+        stem = name.lstrip(".")
+        dot = stem.rfind(".")
+        weight = extensions.get(stem[dot:], 0.0) if dot != -1 else 0.0
+        if weight and path not in exclude:
+            weight *= _directory_factor(directory, directories, memo)
+            if weight and size_weight:
+                weight *= size_weight(size)
+        else:
+            weight = 0.0
+        result.append(weight)
+    return result
+
+
+class PathSampler:
+    """Weighted choice over paths in O(1) per draw (Vose's alias method)
+
+    Behaves like a sequence for random.choice() and NumPy integer draws:
+    len() is the number of paths times a fixed resolution and indexing
+    maps a uniform slot to its alias-table column or that column's alias,
+    so the planners sample from it exactly as from a plain list.
+    Iterating yields each path with a non-zero weight once.
+    """
+
+    def __init__(self, paths, weights, config=None):
+        self.config = config
+        pairs = [(path, weight) for path, weight in zip(paths, weights) if weight > 0]
+        if not pairs:
+            raise ValueError("no files to sample: every path has weight 0")
+        self.paths = [path for path, _ in pairs]
+        count = len(pairs)
+        total = sum(weight for _, weight in pairs)
+        scaled = [weight * count / total for _, weight in pairs]
+
+        self.threshold = [_RESOLUTION] * count
+        self.alias = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.threshold[low] = int(scaled[low] * _RESOLUTION)
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    @classmethod
+    def from_index(cls, overrides=None):
+        """Sampler over the tracked files, weighted by DEFAULT_WEIGHTS plus `overrides`"""
+        weights = merge_weights(overrides)
+        paths, sizes = load_path_index()
+        return cls(paths, path_weights(paths, sizes, weights), weights)
+
+    def __len__(self):
+        return len(self.paths) * _RESOLUTION
+
+    def __getitem__(self, slot):
+        column, coin = divmod(slot, _RESOLUTION)
+        if coin >= self.threshold[column]:
+            column = self.alias[column]
+        return self.paths[column]
+
+    def __iter__(self):
+        return iter(self.paths)
@@ -0,0 +1,231 @@
+import os
+import sys
+import argparse
+
+import numpy as np
+
+from catalog_compiler import CATALOG_PATH, column, read_catalog, write_json
+
+PRICE_TABLE_PATH = os.path.join("public", "price_table.json")
+PRICE_TABLE_VERSION = 1
+
+# The axes of a saree configuration, as (collection, optional). Optional
+# axes can be left unselected (price 0), like border and blouse in
+# App.tsx's total; collections without a price field cost nothing.
+SAREE_AXES = (
+    ("materials", False),
+    ("colors", False),
+    ("patterns", False),
+    ("borders", True),
+    ("sizes", False),
+    ("blouses", True),
+)
+
+# Flat add-ons App.tsx puts on top of the configuration's total
+SURCHARGES = {"embroidery": 500}
+
+# FilterPanel's priceRange options, as inclusive whole-rupee bounds
+PRICE_RANGES = (("budget", 0, 999), ("mid", 1000, 3000), ("premium", 3001, None))
+
+# Width of the histogram buckets, in rupees
+BUCKET_WIDTH = 500
+
+# Largest tensor --check will materialise (cells)
+TENSOR_LIMIT = 50_000_000
+
+
+def axis_prices(catalog, axes=SAREE_AXES):
+    """Return [(name, ids, prices)] per axis; optional axes start with a None id priced 0
+
+    An axis the catalog has no items for (synthetic chunks have no sizes,
+    say) is left unpicked: its only option is that None id.
+    """
+    result = []
+    for name, optional in axes:
+        collection = catalog["collections"].get(name)
+        ids, prices = [], []
+        if collection is not None:
+            ids = column(collection, "id")
+            if "price" in collection["fields"]:
+                prices = [price or 0 for price in column(collection, "price")]
+            else:
+                prices = [0] * len(ids)
+        if optional or not ids:
+            ids, prices = [None] + ids, [0] + prices
+        vector = np.rint(np.asarray(prices, dtype=np.float64)).astype(np.int64)
+        if vector.min() < 0:
+            raise ValueError(f"{name} has negative prices")
+        result.append((name, ids, vector))
+    return result
+
+
+def price_tensor(prices):
+    """Every combination's total: one price vector per axis, broadcast and summed"""
+    total = np.zeros((1,) * len(prices), dtype=np.int64)
+    for axis, vector in enumerate(prices):
+        shape = [1] * len(prices)
+        shape[axis] = vector.size
+        total = total + vector.reshape(shape)
+    return total
+
+
+def _convolve_all(histograms):
+    result = np.ones(1, dtype=np.int64)
+    for histogram in histograms:
+        result = np.convolve(result, histogram)
+    return result
+
+
+def _count_between(cumulative, low, high, step=1):
+    # Configurations whose total lies in [low, high], from a cumulative
+    # histogram whose bucket k holds the totals equal to k * step
+    size = cumulative.size - 1
+    low = np.clip(-(-low // step), 0, size)
+    high = size if high is None else np.clip(high // step + 1, 0, size)
+    return cumulative[high] - cumulative[low]
+
+
+def build_price_table(catalog, axes=SAREE_AXES, ranges=PRICE_RANGES, bucket_width=BUCKET_WIDTH):
+    """Price bounds, range counts and histogram over every configuration
+
+    A total is a sum of one independent price per axis, so nothing here
+    materialises the full tensor: per-option bounds are the option's price
+    plus the other axes' minima/maxima, and the distribution of totals is
+    the convolution of the per-axis price histograms. Cost grows with the
+    number of options and the price span, not with their product; the
+    histograms count prices in units of their greatest common divisor
+    (catalog prices are multiples of 50), which shortens them that much.
+    """
+    axes_prices = axis_prices(catalog, axes)
+    prices = [vector for _, _, vector in axes_prices]
+    combinations = 1
+    for vector in prices:
+        combinations *= vector.size
+    if combinations > np.iinfo(np.int64).max:
+        raise ValueError(f"{combinations} configurations overflow the int64 counts")
+    step = int(np.gcd.reduce(np.concatenate(prices))) or 1
+    histograms = [np.bincount(vector // step) for vector in prices]
+    lowest = sum(int(vector.min()) for vector in prices)
+    highest = sum(int(vector.max()) for vector in prices)
+
+    totals = _convolve_all(histograms)
+    cumulative = np.concatenate(([0], np.cumsum(totals)))
+    # Bucket b holds the totals in [b * bucket_width, (b + 1) * bucket_width)
+    edges = np.minimum(-(-np.arange(highest // bucket_width + 2) * bucket_width // step), totals.size)
+    table = {
+        "version": PRICE_TABLE_VERSION,
+        "combinations": combinations,
+        "min": lowest,
+        "max": highest,
+        "surcharges": SURCHARGES,
+        "ranges": {name: int(_count_between(cumulative, low, high, step)) for name, low, high in ranges},
+        "buckets": {"width": bucket_width, "counts": (cumulative[edges[1:]] - cumulative[edges[:-1]]).tolist()},
+        "axes": {},
+        "groups": {},
+    }
+
+    for axis, (name, ids, vector) in enumerate(axes_prices):
+        others = _convolve_all(histograms[:axis] + histograms[axis + 1:])
+        others_cumulative = np.concatenate(([0], np.cumsum(others)))
+        entry = {
+            "ids": ids,
+            "prices": vector.tolist(),
+            "min": (vector + lowest - int(vector.min())).tolist(),
+            "max": (vector + highest - int(vector.max())).tolist(),
+            "ranges": {range_name: _count_between(others_cumulative, low - vector,
+                                                  None if high is None else high - vector, step).tolist()
+                       for range_name, low, high in ranges},
+        }
+        table["axes"][name] = entry
+
+        # Facet groups (e.g. materials.category) from the catalog's indexes
+        collection = catalog["collections"].get(name, {"index": {}})
+        offset = 1 if ids[0] is None else 0
+        for facet, values in collection["index"].items():
+            if facet == "id":
+                continue
+            table["groups"][f"{name}.{facet}"] = {
+                value: {
+                    "min": min(entry["min"][row + offset] for row in rows),
+                    "max": max(entry["max"][row + offset] for row in rows),
+                    "ranges": {range_name: sum(counts[row + offset] for row in rows)
+                               for range_name, counts in entry["ranges"].items()},
+                }
+                for value, rows in values.items()
+            }
+    return table
+
+
+def check_price_table(table, catalog, axes=SAREE_AXES, ranges=PRICE_RANGES):
+    """Compare a table against the fully materialised tensor; return the mismatches"""
+    prices = [vector for _, _, vector in axis_prices(catalog, axes)]
+    cells = int(np.prod([vector.size for vector in prices]))
+    if cells > TENSOR_LIMIT:
+        raise ValueError(f"the tensor has {cells} cells, more than --check handles ({TENSOR_LIMIT})")
+    tensor = price_tensor(prices)
+    problems = []
+    if (int(tensor.min()), int(tensor.max()), int(tensor.size)) != (table["min"], table["max"],
+                                                                    table["combinations"]):
+        problems.append("overall bounds or combination count differ")
+    for name, low, high in ranges:
+        inside = (tensor >= low) & (tensor <= (high if high is not None else tensor.max()))
+        if int(inside.sum()) != table["ranges"][name]:
+            problems.append(f"range {name} differs")
+    for axis, (name, _) in enumerate(axes):
+        moved = np.moveaxis(tensor, axis, 0).reshape(tensor.shape[axis], -1)
+        entry = table["axes"][name]
+        if moved.min(axis=1).tolist() != entry["min"] or moved.max(axis=1).tolist() != entry["max"]:
+            problems.append(f"{name}: per-option bounds differ")
+        for range_name, low, high in ranges:
+            inside = (moved >= low) & (moved <= (high if high is not None else moved.max()))
+            if inside.sum(axis=1).tolist() != entry["ranges"][range_name]:
+                problems.append(f"{name}: {range_name} counts differ")
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute saree prices over every configuration")
+    parser.add_argument("--catalog", default=CATALOG_PATH,
+                        help=f"catalog written by catalog_compiler.py (default: {CATALOG_PATH})")
+    parser.add_argument("--out", default=PRICE_TABLE_PATH,
+                        help=f"where to write the price table (default: {PRICE_TABLE_PATH})")
+    parser.add_argument("--bucket-width", type=int, default=BUCKET_WIDTH,
+                        help=f"histogram bucket width in rupees (default: {BUCKET_WIDTH})")
+    parser.add_argument("--check", action="store_true",
+                        help="also build the full price tensor by broadcasting and compare")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - PRICE TABLE")
+    print("=" * 70)
+
+    catalog = read_catalog(args.catalog)
+    try:
+        table = build_price_table(catalog, bucket_width=args.bucket_width)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"  🧮 {table['combinations']:,} configurations, ₹{table['min']:,} - ₹{table['max']:,}")
+    for name, count in table["ranges"].items():
+        print(f"  💰 {name:<8} {count:>12,}")
+
+    if args.check:
+        try:
+            problems = check_price_table(table, catalog)
+        except ValueError as e:
+            problems = [str(e)]
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("  ✅ Matches the broadcast price tensor")
+
+    size = write_json(table, args.out)
+    print(f"\n📝 Wrote {args.out}: {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import argparse
+import time
+
+import numpy as np
+
+from catalog_compiler import CATALOG_PATH, column, read_catalog, write_json
+
+RECOMMENDATIONS_PATH = os.path.join("public", "recommendations.json")
+RECOMMENDATIONS_VERSION = 1
+
+# Item features per collection (the kinds of item a Recommendation holds):
+#   categorical  one-hot per value, private to the collection
+#   lists        multi-hot per value, shared by every collection, so items
+#                of different kinds meet through a common occasion
+#   numeric      min-max scaled within the collection (missing: the mean)
+#   color        RGB of the first hex colour field that is set
+ITEM_FEATURES = {
+    "materials": {"categorical": ("category", "weight", "shimmer"), "numeric": ("price",)},
+    "colors": {"categorical": ("category",), "lists": ("occasion",), "numeric": ("popularity",),
+               "color": ("hexCode", "value")},
+    "patterns": {"categorical": ("type", "complexity", "region"), "lists": ("occasion",),
+                 "numeric": ("popularity", "price")},
+}
+
+# Relative weight of each kind of feature in the similarity
+FEATURE_WEIGHTS = {"categorical": 1.0, "lists": 1.5, "numeric": 0.5, "color": 1.0}
+
+DEFAULT_K = 8
+
+# Neighbours scoring below this share little more than a nearby price
+MIN_SCORE = 0.05
+
+# Rows of the similarity matrix computed at a time
+BLOCK_ROWS = 1024
+
+
+def _hex_rgb(value):
+    if not isinstance(value, str) or not value.startswith("#") or len(value) not in (4, 7):
+        return None
+    digits = value[1:] if len(value) == 7 else "".join(char * 2 for char in value[1:])
+    try:
+        return [int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+    except ValueError:
+        return None
+
+
+def item_vectors(catalog, features=ITEM_FEATURES, weights=FEATURE_WEIGHTS):
+    """Return (keys, vectors): "collection/id" keys and their unit-length feature rows"""
+    keys = []
+    # Sparse rows as {dimension: value}, turned into one dense matrix at the end
+    rows = []
+    dimensions = {}
+
+    def dimension(key):
+        return dimensions.setdefault(key, len(dimensions))
+
+    for name, spec in features.items():
+        collection = catalog["collections"].get(name)
+        if collection is None:
+            continue
+        fields = collection["fields"]
+        columns = {field: column(collection, field) for field in fields}
+        ids = columns["id"]
+        start = len(rows)
+        keys.extend(f"{name}/{item_id}" for item_id in ids)
+        rows.extend({} for _ in ids)
+        items = rows[start:]
+
+        for field in spec.get("categorical", ()):
+            for row, value in zip(items, columns.get(field, ())):
+                if value is not None:
+                    row[dimension((name, field, value))] = weights["categorical"]
+        for field in spec.get("lists", ()):
+            for row, values in zip(items, columns.get(field, ())):
+                for value in values or ():
+                    row[dimension((field, value))] = weights["lists"]
+        for field in spec.get("numeric", ()):
+            raw = columns.get(field, [None] * len(ids))
+            values = np.array([np.nan if value is None else value for value in raw], dtype=np.float64)
+            if np.isnan(values).all():
+                continue
+            low, high = np.nanmin(values), np.nanmax(values)
+            scaled = (values - low) / (high - low) if high > low else np.zeros_like(values)
+            scaled[np.isnan(scaled)] = np.nanmean(scaled)
+            key = dimension((name, field))
+            for row, value in zip(items, scaled):
+                row[key] = weights["numeric"] * value
+        color_fields = [columns[field] for field in spec.get("color", ()) if field in columns]
+        if color_fields:
+            channels = [dimension((name, "rgb", channel)) for channel in range(3)]
+            for position, row in enumerate(items):
+                rgb = next((rgb for rgb in (_hex_rgb(values[position]) for values in color_fields) if rgb), None)
+                for channel, value in zip(channels, rgb or ()):
+                    row[channel] = weights["color"] * value
+
+    vectors = np.zeros((len(rows), len(dimensions)), dtype=np.float32)
+    for position, row in enumerate(rows):
+        for key, value in row.items():
+            vectors[position, key] = value
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return keys, vectors
+
+
+def top_k(vectors, k=DEFAULT_K, block_rows=BLOCK_ROWS):
+    """Cosine top-k neighbours of every row, excluding itself: (indexes, scores), best first
+
+    The similarity matrix is computed `block_rows` rows at a time, so
+    memory stays at block_rows x n whatever the catalog size.
+    """
+    count = len(vectors)
+    k = min(k, count - 1)
+    neighbors = np.zeros((count, max(k, 0)), dtype=np.int64)
+    scores = np.zeros((count, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return neighbors, scores
+    for start in range(0, count, block_rows):
+        similarity = vectors[start:start + block_rows] @ vectors.T
+        rows = np.arange(similarity.shape[0])
+        similarity[rows, start + rows] = -np.inf
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        # Best score first; equal scores in catalog order
+        order = np.lexsort((candidates, -candidate_scores))
+        neighbors[start:start + len(rows)] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:start + len(rows)] = np.take_along_axis(candidate_scores, order, axis=1)
+    return neighbors, scores
+
+
+def build_recommendations(catalog, k=DEFAULT_K, block_rows=BLOCK_ROWS, min_score=MIN_SCORE):
+    """Top-k similar items per "collection/id", dropping neighbours below `min_score`"""
+    keys, vectors = item_vectors(catalog)
+    neighbors, scores = top_k(vectors, k, block_rows)
+    index = {"version": RECOMMENDATIONS_VERSION, "k": k, "items": keys, "neighbors": {}, "scores": {}}
+    for key, row_neighbors, row_scores in zip(keys, neighbors.tolist(), scores.tolist()):
+        related = [(neighbor, round(score, 3)) for neighbor, score in zip(row_neighbors, row_scores)
+                   if score >= min_score]
+        index["neighbors"][key] = [neighbor for neighbor, _ in related]
+        index["scores"][key] = [score for _, score in related]
+    return index
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the top-K similar items for every catalog item")
+    parser.add_argument("--catalog", default=CATALOG_PATH,
+                        help=f"catalog written by catalog_compiler.py (default: {CATALOG_PATH})")
+    parser.add_argument("--out", default=RECOMMENDATIONS_PATH,
+                        help=f"where to write the index (default: {RECOMMENDATIONS_PATH})")
+    parser.add_argument("-k", type=int, default=DEFAULT_K,
+                        help=f"neighbours per item (default: {DEFAULT_K})")
+    parser.add_argument("--block-rows", type=int, default=BLOCK_ROWS,
+                        help=f"similarity rows computed at a time (default: {BLOCK_ROWS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 70)
+    print("👗 HEKO SARES - RECOMMENDATION INDEX")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    index = build_recommendations(read_catalog(args.catalog), args.k, args.block_rows)
+    elapsed = time.perf_counter() - started
+    print(f"  🔎 {len(index['items'])} items, top {args.k} neighbours each in {elapsed:.2f}s")
+
+    size = write_json(index, args.out)
+    print(f"\n📝 Wrote {args.out}: {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
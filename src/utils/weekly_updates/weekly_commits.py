@@ -1,8 +1,18 @@
 import os
+import sys
 import subprocess
 import datetime
 import random
-import json
+import argparse
+
+# The shared generator modules live in the project root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from commit_backends import PINNED_IDENTITY, git_raw_date
+from commit_plan import PlannedCommit, mutation_kind
+from mutation_buffer import MutationBuffer
+from mutators import mutation_profile
+from path_index import PathSampler
 
 def ensure_directory(file_path):
     """Ensure directory exists without creating root directory"""
@@ -10,8 +20,15 @@ def ensure_directory(file_path):
     if directory and not os.path.exists(directory):
         os.makedirs(directory, exist_ok=True)
 
-def add_weekly_commits():
-    """Add commits for every week over past 120 days"""
+def add_weekly_commits(seed=None, end_date=None):
+    """Add commits for every week over the 120 days before `end_date`
+
+    A `seed` makes the schedule, file and message choices reproducible
+    and pins the author/committer and timezone (PINNED_IDENTITY), so the
+    same seed, end date and starting commit always give the same HEAD.
+    """
+    rng = random.Random(seed)
+    identity = PINNED_IDENTITY if seed is not None else None
     
     print("📅 Adding weekly commits for past 120 days...")
     
@@ -29,25 +46,15 @@ def add_weekly_commits():
         "security: implemented security improvements"
     ]
     
-    # Your project files - only files that exist or should exist
-    project_files = [
-        "src/App.tsx",
-        "src/main.tsx",
-        "src/index.css",
-        "src/components/BlouseSelection.tsx",
-        "src/components/ColorSelection.tsx",
-        "src/components/FabricSelector.vue", 
-        "src/components/MaterialSelection.tsx",
-        "src/data/sareeData.ts",
-        "package.json",
-        "vite.config.ts",
-        "tailwind.config.js",
-        "README.md",
-        "index.html"
-    ]
+    # Sample from the files git already tracks (see path_index.py), so a run
+    # never creates stray files that are not part of the project
+    project_files = PathSampler.from_index()
+    # Files are changed by kind the way fixed_weekly_commits.py does (see mutators.py)
+    profile = mutation_profile()
     
     # Calculate 120 days ago
-    end_date = datetime.datetime.now()
+    if end_date is None:
+        end_date = datetime.datetime.now()
     start_date = end_date - datetime.timedelta(days=120)
     
     commit_count = 0
@@ -69,12 +76,12 @@ def add_weekly_commits():
         print(f"\n📍 Week {week_count}: {current_week_start.strftime('%Y-%m-%d')}")
         
         # Each week, commit on 2-4 different days
-        days_in_week = random.randint(2, 4)
+        days_in_week = rng.randint(2, 4)
         days_committed = 0
         
         while days_committed < days_in_week:
             # Pick a random weekday in this week (avoid weekends for more realism)
-            days_offset = random.randint(0, 6)
+            days_offset = rng.randint(0, 6)
             commit_date = current_week_start + datetime.timedelta(days=days_offset)
             
             # Don't go beyond end date
@@ -82,66 +89,30 @@ def add_weekly_commits():
                 break
                 
             # Skip weekends 70% of the time for more realistic pattern
-            if commit_date.weekday() >= 5 and random.random() > 0.3:
+            if commit_date.weekday() >= 5 and rng.random() > 0.3:
                 continue
             
             # 1-3 commits per commit day
-            commits_today = random.randint(1, 3)
+            commits_today = rng.randint(1, 3)
             
             for commit_num in range(commits_today):
                 # Working hours
-                hour = random.randint(9, 18)
-                minute = random.randint(0, 59)
+                hour = rng.randint(9, 18)
+                minute = rng.randint(0, 59)
                 
                 commit_time = commit_date.replace(hour=hour, minute=minute)
                 git_date_str = commit_time.strftime("%Y-%m-%dT%H:%M:%S")
                 
                 # Select file to modify
-                file_to_modify = random.choice(project_files)
+                file_to_modify = rng.choice(project_files)
                 
                 # Add content to file with proper error handling
                 try:
-                    if file_to_modify.endswith(('.js', '.ts', '.tsx', '.vue')):
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n// Week {week_count} update - {commit_time.strftime('%Y-%m-%d')}\n")
-                            f.write("// Saree customization improvements\n")
-                            
-                    elif file_to_modify.endswith('.css'):
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n/* Week {week_count} update - {commit_time.strftime('%Y-%m-%d')} */\n")
-                            f.write("/* Style enhancements */\n")
-                            
-                    elif file_to_modify.endswith('.json'):
-                        ensure_directory(file_to_modify)
-                        if os.path.exists(file_to_modify):
-                            with open(file_to_modify, "r+", encoding="utf-8") as f:
-                                try:
-                                    data = json.load(f)
-                                    if "updates" not in data:
-                                        data["updates"] = []
-                                    data["updates"].append(f"Week {week_count} - {commit_time.strftime('%Y-%m-%d')}")
-                                    f.seek(0)
-                                    json.dump(data, f, indent=2)
-                                    f.truncate()
-                                except:
-                                    # If JSON is invalid, append comment
-                                    f.write(f"\n// Week {week_count} - {commit_time.strftime('%Y-%m-%d')}\n")
-                        else:
-                            with open(file_to_modify, "w", encoding="utf-8") as f:
-                                json.dump({"updates": [f"Week {week_count} - {commit_time.strftime('%Y-%m-%d')}"]}, f, indent=2)
-                                
-                    elif file_to_modify == "README.md":
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\n### Week {week_count} Updates\n")
-                            f.write(f"- Enhanced features on {commit_time.strftime('%Y-%m-%d')}\n")
-                            f.write("- Improved saree customization experience\n")
-                            
-                    else:
-                        ensure_directory(file_to_modify)
-                        with open(file_to_modify, "a", encoding="utf-8") as f:
-                            f.write(f"\nUpdate Week {week_count} - {commit_time.strftime('%Y-%m-%d')}\n")
+                    record = PlannedCommit(timestamp=git_date_str, week=week_count, commit_num=commit_num,
+                                           path=file_to_modify, kind=mutation_kind(file_to_modify), message="")
+                    buffer = MutationBuffer()
+                    profile.apply(buffer, record, commit_time)
+                    buffer.flush()
                             
                 except Exception as e:
                     print(f"⚠️  Could not modify {file_to_modify}: {e}")
@@ -159,10 +130,14 @@ def add_weekly_commits():
                     continue
                 
                 env = os.environ.copy()
+                if identity is not None:
+                    git_date_str = git_raw_date(commit_time, identity.tz)
+                    env["GIT_AUTHOR_NAME"] = env["GIT_COMMITTER_NAME"] = identity.name
+                    env["GIT_AUTHOR_EMAIL"] = env["GIT_COMMITTER_EMAIL"] = identity.email
                 env["GIT_AUTHOR_DATE"] = git_date_str
                 env["GIT_COMMITTER_DATE"] = git_date_str
                 
-                message = random.choice(weekly_messages)
+                message = rng.choice(weekly_messages)
                 full_message = f"{message} - Week {week_count}"
                 
                 commit_result = subprocess.run([
@@ -193,7 +168,16 @@ def add_weekly_commits():
     
     return commit_count
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Add weekly commits over the past 120 days")
+    parser.add_argument("--seed", type=int,
+                        help="seed the schedule and pin the commit identity for reproducible history")
+    parser.add_argument("--end-date", type=datetime.datetime.fromisoformat,
+                        help="end of the 120-day window (ISO date/time, default: now)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("=" * 60)
     print("👗 HEKO SARES - WEEKLY COMMITS (120 DAYS) - FIXED")
     print("=" * 60)
@@ -203,9 +187,9 @@ def main():
         return
     
     try:
-        total_commits = add_weekly_commits()
+        total_commits = add_weekly_commits(seed=args.seed, end_date=args.end_date)
         
-        print(f"\n🎉 SUCCESS! Added {total_commits} commits over {week_count} weeks!")
+        print(f"\n🎉 SUCCESS! Added {total_commits} commits over {120//7} weeks!")
         print("\n➡️  Next: Run 'git push origin main'")
         
     except Exception as e:
@@ -0,0 +1,331 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import colorsys
+
+from catalog_compiler import (CATALOG_VERSION, TYPES_MODULE, build_collection, facet_fields, parse_types,
+                              validate, write_json)
+
+# Collections generated and the interface each one's items conform to
+SYNTHETIC_COLLECTIONS = {
+    "materials": "SareeMaterial",
+    "colors": "SareeColor",
+    "patterns": "SareePattern",
+    "borders": "SareeBorder",
+    "blouses": "SareeBlouse",
+}
+
+# Share of the items that go to each collection
+COLLECTION_MIX = {"materials": 0.15, "colors": 0.25, "patterns": 0.3, "borders": 0.15, "blouses": 0.15}
+
+# Chance an optional field is set
+OPTIONAL_RATE = 0.8
+
+# Fields typed as plain strings whose values come from a declared type alias
+FIELD_DOMAINS = {"occasion": "OccasionType"}
+
+# Median price in rupees by (collection, field the price depends on, value);
+# prices are log-normal around it, rounded to a multiple of 50
+PRICE_MEDIANS = {
+    "materials": ("category", {"standard": 900, "premium": 1500, "luxury": 3200}),
+    "patterns": ("complexity", {"simple": 300, "medium": 450, "intricate": 650}),
+    "borders": ("width", {"thin": 600, "medium": 800, "wide": 1100}),
+    "blouses": (None, {None: 1000}),
+}
+PRICE_SIGMA = 0.35
+
+# Popularity is 100 x Beta(5, 2): most items are liked, a few are niche
+POPULARITY_SHAPE = (5, 2)
+
+CHUNK_SIZE = 100_000
+
+_WORDS = {
+    "materials": ("Silk", "Cotton", "Georgette", "Chiffon", "Linen", "Tussar", "Crepe", "Organza", "Chanderi",
+                  "Banarasi", "Kanjivaram", "Tissue", "Net", "Satin", "Muslin"),
+    "colors": ("Blue", "Green", "Red", "Yellow", "Pink", "Teal", "Wine", "White", "Purple", "Orange", "Maroon",
+               "Gold", "Peach", "Mustard", "Indigo"),
+    "patterns": ("Paisley", "Vine", "Lotus", "Mandala", "Peacock", "Chevron", "Buta", "Jaal", "Stripe", "Check",
+                 "Temple", "Elephant", "Mango", "Ikat", "Bandhani"),
+    "borders": ("Zari", "Thread", "Gota", "Sequin", "Kasavu", "Temple", "Piping", "Lace", "Mirror", "Cutwork"),
+    "blouses": ("Sleeveless", "Short Sleeve", "Elbow Sleeve", "Long Sleeve", "Halter", "Jacket", "Peplum",
+                "Corset", "Puff Sleeve", "Cape"),
+}
+_ADJECTIVES = ("Royal", "Classic", "Festive", "Everyday", "Heritage", "Modern", "Soft", "Bright", "Deep", "Pastel",
+               "Temple", "Bridal", "Handloom", "Designer", "Vintage")
+_PLACES = ("Kanchipuram, Tamil Nadu", "Varanasi, Uttar Pradesh", "Surat, Gujarat", "Mumbai, Maharashtra",
+           "Handloom, West Bengal", "Kerala, India", "Jharkhand, India", "Chanderi, Madhya Pradesh",
+           "Mysore, Karnataka", "Pochampally, Telangana")
+_REGIONS = ("Kashmir", "Bengal", "Rajasthan", "Odisha", "South India", "Gujarat", "Contemporary", "Modern Design",
+            "Assam", "Punjab")
+_TEXTURES = ("Luxurious and smooth", "Soft and breathable", "Light and flowy", "Delicate and sheer",
+             "Rich and ornate", "Crisp and natural", "Natural and textured")
+_CARE = ("Dry clean only", "Machine wash cold", "Hand wash or dry clean", "Dry clean recommended",
+         "Machine wash gentle")
+_PREVIEWS = ("🌿", "🌸", "◇", "⚜️", "🪷", "⫸", "🦚", "🎨", "✨", "🌟", "🌺")
+_IMAGES = (6069951, 7148647, 8853450, 6765019)
+_NECKLINES = ("Round neck", "Boat neck", "High neck", "Deep V-neck", "Sweetheart", "Square neck")
+_SLEEVES = ("Sleeveless", "Cap sleeves", "Short sleeves", "Elbow sleeves", "Long sleeves")
+_FITS = ("Fitted", "Regular", "Tailored", "Relaxed")
+# Fields holding a hex colour (SareeColor.value/hexCode, SareeBorder.color)
+_COLOR_FIELDS = ("value", "hexCode", "color")
+# Tailwind colour families by hue, for gradients
+_HUES = ((15, "red"), (35, "orange"), (55, "yellow"), (90, "lime"), (150, "emerald"), (185, "cyan"), (215, "blue"),
+         (260, "purple"), (300, "fuchsia"), (335, "pink"), (360, "red"))
+
+
+def literal_domain(field_type, types):
+    """The values of a string-literal union (through type aliases), or None"""
+    while field_type[0] == "name" and field_type[1] in types:
+        field_type = types[field_type[1]]
+    if field_type[0] == "union" and all(alternative[0] == "literal" for alternative in field_type[1]):
+        return [alternative[1] for alternative in field_type[1]]
+    if field_type[0] == "literal":
+        return [field_type[1]]
+    return None
+
+
+def _price(rng, collection, record):
+    field, medians = PRICE_MEDIANS.get(collection, (None, {None: 1000}))
+    median = medians.get(record.get(field), 1000)
+    return max(0, int(round(rng.lognormvariate(math.log(median), PRICE_SIGMA) / 50)) * 50)
+
+
+def _color(rng, record):
+    hue, saturation, lightness = rng.random(), rng.uniform(0.35, 0.9), rng.uniform(0.25, 0.75)
+    red, green, blue = colorsys.hls_to_rgb(hue, lightness, saturation)
+    hex_code = "#{:02x}{:02x}{:02x}".format(round(red * 255), round(green * 255), round(blue * 255))
+    family = next(name for limit, name in _HUES if hue * 360 <= limit)
+    shade = 500 if lightness > 0.5 else 700
+    return hex_code, f"from-{family}-{shade - 100} to-{family}-{shade + 100}"
+
+
+# Field generators: (rng, collection, record so far, position) -> value.
+# Fields without one get a value from their declared type.
+def _name(rng, collection, record, position):
+    return f"{rng.choice(_ADJECTIVES)} {rng.choice(_WORDS[collection])} {position + 1}"
+
+
+def _description(rng, collection, record, position):
+    return f"{record['name']}: {rng.choice(_TEXTURES).lower()} with {rng.choice(_WORDS['patterns']).lower()} detailing"
+
+
+def _image(rng, collection, record, position):
+    photo = rng.choice(_IMAGES)
+    return f"https://images.pexels.com/photos/{photo}/pexels-photo-{photo}.jpeg?auto=compress&cs=tinysrgb&w=400"
+
+
+def _popularity(rng, collection, record, position):
+    return max(1, round(100 * rng.betavariate(*POPULARITY_SHAPE)))
+
+
+FIELD_GENERATORS = {
+    "name": _name,
+    "description": _description,
+    "image": _image,
+    "price": lambda rng, collection, record, position: _price(rng, collection, record),
+    "popularity": _popularity,
+    "texture": lambda rng, collection, record, position: rng.choice(_TEXTURES),
+    "careInstructions": lambda rng, collection, record, position: rng.choice(_CARE),
+    "origin": lambda rng, collection, record, position: rng.choice(_PLACES),
+    "region": lambda rng, collection, record, position: rng.choice(_REGIONS),
+    "preview": lambda rng, collection, record, position: rng.choice(_PREVIEWS),
+    "texturePattern": lambda rng, collection, record, position: f"{record['name'].split()[1].lower()}-weave",
+    "style": lambda rng, collection, record, position: f"{rng.choice(_ADJECTIVES)} "
+                                                       f"{rng.choice(_WORDS['blouses']).lower()} design",
+    "neckline": lambda rng, collection, record, position: rng.choice(_NECKLINES),
+    "sleeves": lambda rng, collection, record, position: rng.choice(_SLEEVES),
+    "fit": lambda rng, collection, record, position: rng.choice(_FITS),
+    "pantone": lambda rng, collection, record, position: f"PANTONE {rng.randint(100, 7700)} C",
+}
+
+
+class ItemGenerator:
+    """Seeded generator of one collection's items, valid for its interface in products.ts
+
+    Literal-union fields are drawn from their declared domains first, so
+    that prices can depend on them (e.g. luxury materials cost more);
+    other fields come from FIELD_GENERATORS or, failing that, their type.
+    """
+
+    def __init__(self, collection, types, seed=0):
+        self.collection = collection
+        self.type_name = SYNTHETIC_COLLECTIONS[collection]
+        self.interface = types[self.type_name]
+        self.types = types
+        self.fields = list(self.interface[1])
+        self.rng = random.Random(f"{seed}|{collection}")
+        self.position = 0
+        self.domains = {field: literal_domain(field_type, types)
+                        for field, (field_type, _) in self.interface[1].items()}
+        self.order = sorted(self.fields, key=lambda field: self.domains[field] is None)
+        self.colored = any(field in _COLOR_FIELDS for field in self.fields)
+
+    def _typed(self, field, field_type):
+        rng = self.rng
+        domain = literal_domain(field_type, self.types)
+        if domain is not None:
+            return rng.choice(domain)
+        if field_type[0] == "array":
+            element = ("name", FIELD_DOMAINS[field]) if field in FIELD_DOMAINS else field_type[1]
+            domain = literal_domain(element, self.types)
+            if domain is not None:
+                return rng.sample(domain, rng.randint(1, min(3, len(domain))))
+            return [self._typed(field, field_type[1]) for _ in range(rng.randint(1, 3))]
+        name = field_type[1] if field_type[0] == "name" else None
+        if name == "number":
+            return rng.randint(1, 100)
+        if name == "boolean":
+            return rng.random() < 0.5
+        if name == "Date":
+            return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if field_type[0] == "union":
+            return self._typed(field, field_type[1][0])
+        return f"{field} {self.position + 1}"
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        rng = self.rng
+        record = {"id": f"{self.collection}-{self.position + 1:07d}"}
+        hex_code = gradient = None
+        if self.colored:
+            hex_code, gradient = _color(rng, record)
+        for field in self.order:
+            if field in record:
+                continue
+            field_type, optional = self.interface[1][field]
+            if optional and rng.random() >= OPTIONAL_RATE:
+                continue
+            if field in _COLOR_FIELDS and hex_code:
+                record[field] = hex_code
+            elif field == "gradient" and gradient:
+                record[field] = gradient
+            elif field in FIELD_GENERATORS and self.domains[field] is None:
+                record[field] = FIELD_GENERATORS[field](rng, self.collection, record, self.position)
+            else:
+                record[field] = self._typed(field, field_type)
+        self.position += 1
+        return {field: record[field] for field in self.fields if field in record}
+
+
+def collection_counts(items, mix=COLLECTION_MIX):
+    """Split `items` over the collections by `mix`, rounding so the counts add up"""
+    total = sum(mix.values())
+    exact = {name: items * share / total for name, share in mix.items()}
+    counts = {name: int(value) for name, value in exact.items()}
+    # The largest remainders take what rounding down left over
+    leftover = items - sum(counts.values())
+    for name in sorted(exact, key=lambda name: counts[name] - exact[name])[:leftover]:
+        counts[name] += 1
+    return counts
+
+
+def generate_items(items, seed=0, types=None):
+    """Yield (collection, record) for `items` synthetic items, collection by collection"""
+    types = types or parse_types(TYPES_MODULE)
+    for name, count in collection_counts(items).items():
+        generator = ItemGenerator(name, types, seed)
+        for _ in range(count):
+            yield name, next(generator)
+
+
+def write_jsonl(items, path, seed=0):
+    """Write {"collection": ..., "item": {...}} lines to `path` ("-" for stdout); return the count"""
+    out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+    written = 0
+    try:
+        for name, record in generate_items(items, seed):
+            out.write(json.dumps({"collection": name, "item": record}, ensure_ascii=False,
+                                 separators=(",", ":")) + "\n")
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written
+
+
+def write_chunks(items, directory, seed=0, chunk_size=CHUNK_SIZE):
+    """Write compiled catalogs of up to `chunk_size` items each, plus a manifest; return the paths
+
+    Every chunk holds the same share of each collection, so each one is a
+    usable catalog on its own (catalog_compiler.read_catalog() reads it).
+    """
+    types = parse_types(TYPES_MODULE)
+    counts = collection_counts(items)
+    generators = {name: ItemGenerator(name, types, seed) for name in counts}
+    remaining = dict(counts)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for chunk in range(max(1, math.ceil(items / chunk_size))):
+        chunk_counts = collection_counts(min(chunk_size, sum(remaining.values())), remaining)
+        catalog = {"version": CATALOG_VERSION, "collections": {}}
+        for name, count in chunk_counts.items():
+            generator = generators[name]
+            records = [next(generator) for _ in range(count)]
+            remaining[name] -= count
+            catalog["collections"][name] = build_collection(generator.type_name, generator.fields, records,
+                                                            facet_fields(generator.interface[1], types))
+        path = os.path.join(directory, f"catalog-{chunk:05d}.json")
+        write_json(catalog, path)
+        paths.append(path)
+    manifest = {"seed": seed, "items": items, "counts": counts, "chunks": [os.path.basename(path) for path in paths]}
+    write_json(manifest, os.path.join(directory, "manifest.json"))
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic saree catalog of any size")
+    parser.add_argument("items", type=int, help="number of items over all collections")
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument("--jsonl", metavar="PATH", help='write JSON Lines to PATH ("-" for stdout)')
+    parser.add_argument("--chunks", metavar="DIR", help="write compiled catalog chunks to DIR")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"items per catalog chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("--check", action="store_true",
+                        help="validate every item against src/types/products.ts before writing anything")
+    args = parser.parse_args(argv)
+    if args.items < 1:
+        parser.error("items must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if not (args.jsonl or args.chunks or args.check):
+        parser.error("choose --jsonl, --chunks or --check")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Keep stdout clean for --jsonl -
+    log = sys.stderr if args.jsonl == "-" else sys.stdout
+    print("👗 HEKO SARES - SYNTHETIC CATALOG", file=log)
+    started = time.perf_counter()
+
+    if args.check:
+        types = parse_types(TYPES_MODULE)
+        problems = []
+        for name, record in generate_items(args.items, args.seed, types):
+            expected = ("name", SYNTHETIC_COLLECTIONS[name])
+            problems.extend(validate(record, expected, types, f"{name}/{record['id']}"))
+        for problem in problems[:20]:
+            print(f"  ❌ {problem}", file=log)
+        if problems:
+            sys.exit(1)
+        print(f"  ✅ {args.items} items match src/types/products.ts", file=log)
+    if args.jsonl:
+        count = write_jsonl(args.items, args.jsonl, args.seed)
+        print(f"  📝 Wrote {count} items to {args.jsonl}", file=log)
+    if args.chunks:
+        paths = write_chunks(args.items, args.chunks, args.seed, args.chunk_size)
+        print(f"  📝 Wrote {len(paths)} catalog chunks to {args.chunks}", file=log)
+
+    elapsed = time.perf_counter() - started
+    print(f"  ⏱️  {elapsed:.2f}s ({args.items / elapsed:,.0f} items/s)", file=log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+import image_pipeline
+
+
+def write_source(path, color):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new("RGB", (480, 320), color).save(path)
+
+
+def output_files(out_dir):
+    return {os.path.relpath(os.path.join(directory, filename), out_dir).replace(os.sep, "/")
+            for directory, _, filenames in os.walk(out_dir) for filename in filenames}
+
+
+def referenced(manifest):
+    paths = set()
+    for entry in manifest["images"].values():
+        paths.update(entry["files"])
+        paths.update(path for path in (entry.get("texture"), entry.get("atlas", {}).get("file")) if path)
+    return paths
+
+
+@pytest.mark.skipif(not image_pipeline.available_formats(), reason="Pillow cannot write WebP or AVIF")
+def test_stale_derivatives_are_removed(tmp_path):
+    source = tmp_path / "source"
+    manifest_path = tmp_path / "assets" / "manifest.json"
+    write_source(str(source / "patterns" / "paisley.png"), "red")
+    write_source(str(source / "patterns" / "ikat.png"), "blue")
+    write_source(str(source / "colors" / "maroon.png"), "maroon")
+    argv = ["--source", str(source), "--manifest", str(manifest_path), "--workers", "1"]
+
+    image_pipeline.main(argv)
+    settings = image_pipeline.pipeline_settings(image_pipeline.available_formats())
+    first = image_pipeline.read_manifest(str(manifest_path), settings)
+
+    write_source(str(source / "patterns" / "paisley.png"), "green")
+    os.unlink(source / "colors" / "maroon.png")
+    image_pipeline.main(argv)
+    second = image_pipeline.read_manifest(str(manifest_path), settings)
+
+    assert set(second["images"]) == {"patterns/ikat", "patterns/paisley"}
+    # The edited pattern got new derivatives and a new atlas, the removed color none
+    stale = set(first["images"]["patterns/paisley"]["files"]) | set(first["images"]["colors/maroon"]["files"])
+    stale.add(first["images"]["patterns/paisley"]["atlas"]["file"])
+    remaining = output_files(str(manifest_path.parent))
+    assert not stale & remaining
+    assert remaining == referenced(second) | {"manifest.json"}
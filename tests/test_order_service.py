@@ -0,0 +1,85 @@
+import json
+import random
+import asyncio
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+
+from bench_order_service import catalog_items, make_design
+from catalog_compiler import compile_catalog, parse_types
+from order_service import OrderService, design_price
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return compile_catalog()[0]
+
+
+@pytest.fixture(scope="module")
+def service(catalog):
+    async def create():
+        # The write queue belongs to the loop the service is created in
+        return OrderService(catalog, parse_types(), store=None)
+
+    return asyncio.run(create()), catalog_items(catalog)
+
+
+class FailingStore:
+    async def write(self, batch):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def make_order(design, product="saree"):
+    customer = {"name": "Customer", "email": "customer@example.com", "phone": "9876543210",
+                "address": "1 MG Road", "city": "Bengaluru", "pincode": "560001"}
+    return {"orderId": "ORD-1", "customer": customer, "product": product, "design": design,
+            "totalPrice": design["totalPrice"], "orderDate": "2025-10-20T00:00:00"}
+
+
+def test_order_without_border_or_blouse_is_accepted(service):
+    service, items = service
+    design = make_design("saree", items, random.Random(1))
+    design["border"] = design["blouse"] = None
+    design["totalPrice"], problems = design_price("saree", design, service.prices)
+    assert not problems
+    assert service.check_order(make_order(design)) == []
+
+
+def test_order_missing_a_part_is_rejected(service):
+    service, items = service
+    design = make_design("saree", items, random.Random(1))
+    del design["border"]
+    assert service.check_order(make_order(design)) == ["design.border: missing"]
+
+
+def test_null_is_rejected_where_the_type_does_not_allow_it(service):
+    service, items = service
+    design = make_design("saree", items, random.Random(1))
+    design["embroidery"] = None
+    assert service.check_order(make_order(design)) == ["design.embroidery: expected boolean, got None"]
+
+
+def test_body_that_is_not_utf8_is_rejected(service):
+    service, items = service
+    body = json.dumps(make_order(make_design("saree", items, random.Random(1)))).encode("utf-16")
+    status, document = asyncio.run(service.handle("POST", "/orders", body))
+    assert status == HTTPStatus.BAD_REQUEST
+    assert document["errors"][0].startswith("body is not UTF-8")
+
+
+def test_failed_write_is_answered_with_500(catalog):
+    body = json.dumps(make_order(make_design("saree", catalog_items(catalog), random.Random(1)))).encode("utf-8")
+
+    async def submit():
+        service = OrderService(catalog, parse_types(), FailingStore())
+        writer = asyncio.create_task(service.run_writer())
+        try:
+            return await service.handle("POST", "/orders", body)
+        finally:
+            service.queue.put_nowait(None)
+            await writer
+
+    status, document = asyncio.run(submit())
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert "database is locked" in document["error"]
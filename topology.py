@@ -0,0 +1,70 @@
+import datetime
+import itertools
+import random
+
+# Fixture topology: how a linear plan is spread over branches.
+#   width          parallel feature branches per feature week (0 = linear)
+#   feature_ratio  share of weeks whose commits go through feature branches
+#   release_every  fork a long-running release branch every N weeks (0 = never)
+#   hotfix_ratio   chance per week that one commit lands on the newest release
+DEFAULT_TOPOLOGY = {"width": 0, "feature_ratio": 0.5, "release_every": 0, "hotfix_ratio": 0.3}
+
+
+def is_linear(topology):
+    return not topology or (not topology.get("width") and not topology.get("release_every"))
+
+
+def _later(timestamp, seconds):
+    moment = datetime.datetime.fromisoformat(timestamp) + datetime.timedelta(seconds=seconds)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def plan_topology(plan, rng=random, width=0, feature_ratio=0.5, release_every=0, hotfix_ratio=0.3):
+    """Spread a linear plan over feature and release branches
+
+    Yields the plan's records with `branch` set, plus "fork" and "merge"
+    records. In a feature week the week's commits are split over up to
+    `width` branches forked from the week's starting point and merged back
+    one by one after the week's last commit. Lanes are assigned by file,
+    so no two lanes touch the same path and every merge is conflict-free.
+    Release branches are forked at week boundaries and never merged back.
+    """
+    releases = []
+    for week, records in itertools.groupby(plan, key=lambda record: record.week):
+        records = sorted(records, key=lambda record: record.timestamp)
+        week_start = records[0].timestamp
+
+        if release_every and week % release_every == 0:
+            release = f"release/v{len(releases) + 1}"
+            releases.append(release)
+            yield records[0]._replace(commit_num=0, path=None, kind="fork", message="",
+                                      branch=release, source=None)
+
+        hotfix = None
+        if releases and rng.random() < hotfix_ratio:
+            hotfix = rng.randrange(len(records))
+
+        lanes = {}
+        if width and len(records) > 1 and rng.random() < feature_ratio:
+            paths = sorted({record.path for index, record in enumerate(records) if index != hotfix})
+            lane_count = min(width, len(paths))
+            lanes = {path: f"feature/week-{week}-{i % lane_count + 1}" for i, path in enumerate(paths)}
+
+        opened = []
+        for index, record in enumerate(records):
+            if index == hotfix:
+                yield record._replace(branch=releases[-1])
+                continue
+            branch = lanes.get(record.path)
+            if branch is not None and branch not in opened:
+                opened.append(branch)
+                yield record._replace(timestamp=week_start, commit_num=0, path=None, kind="fork",
+                                      message="", branch=branch, source=None)
+            yield record._replace(branch=branch)
+
+        last = records[-1]
+        for offset, branch in enumerate(opened, start=1):
+            yield last._replace(timestamp=_later(last.timestamp, offset),
+                                commit_num=0, path=None, kind="merge",
+                                message=f"Merge branch '{branch}' - Week {week}",
+                                branch=None, source=branch)
@@ -0,0 +1,112 @@
+import datetime
+
+import numpy as np
+
+from commit_plan import PlannedCommit, mutation_kind
+
+# Chance that a given weekday (Monday first) is a commit day. Matches the
+# legacy planner's 2-4 commit days a week, drawn from Monday-Friday only.
+DEFAULT_WEEKDAY_WEIGHTS = (0.6, 0.6, 0.6, 0.6, 0.6, 0.0, 0.0)
+
+# Probability of 0, 1, 2, 3 ... commits on a commit day (legacy: 1-3 uniform)
+DEFAULT_COMMITS_PER_DAY = (0.0, 1/3, 1/3, 1/3)
+
+# Working hours, inclusive of the whole last hour (legacy: 9:00-18:59)
+DEFAULT_HOURS = (9, 18)
+
+# 1970-01-01 was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def schedule_timestamps(start_date, end_date, rng, weekday_weights=DEFAULT_WEEKDAY_WEIGHTS,
+                        commits_per_day=DEFAULT_COMMITS_PER_DAY, hours=DEFAULT_HOURS):
+    """Draw every commit time in [start_date, end_date] in one batch
+
+    Returns sorted int64 seconds since 1970-01-01 on the naive wall clock
+    the planner uses. Each calendar day is a commit day with its weekday's
+    weight, gets a commit count from `commits_per_day` and spreads them
+    uniformly over the working hours; nothing is re-rolled, so the cost is
+    a fixed handful of array operations whatever the window length.
+    """
+    first_day = np.datetime64(start_date.date(), "D").astype(np.int64)
+    last_day = np.datetime64(end_date.date(), "D").astype(np.int64)
+    days = np.arange(first_day, last_day + 1, dtype=np.int64)
+
+    weights = np.asarray(weekday_weights, dtype=np.float64)
+    active = rng.random(days.size) < weights[(days + _EPOCH_WEEKDAY) % 7]
+
+    probabilities = np.asarray(commits_per_day, dtype=np.float64)
+    counts = rng.choice(probabilities.size, size=days.size, p=probabilities / probabilities.sum())
+    counts = np.where(active, counts, 0)
+
+    commit_days = np.repeat(days, counts)
+    seconds = rng.integers(hours[0] * 3600, (hours[1] + 1) * 3600, size=commit_days.size)
+    timestamps = commit_days * 86400 + seconds
+
+    end_seconds = int((end_date - datetime.datetime(1970, 1, 1)).total_seconds())
+    start_seconds = int((start_date - datetime.datetime(1970, 1, 1)).total_seconds())
+    timestamps = timestamps[(timestamps >= start_seconds) & (timestamps <= end_seconds)]
+    timestamps.sort()
+    return timestamps
+
+
+def plan_vectorized(messages, files, end_date=None, days=120, seed=None, start_date=None,
+                    first_week=1, chunk_days=None, **schedule_options):
+    """Plan commits with schedule_timestamps() and yield PlannedCommit records
+
+    File and message choices are drawn as arrays too; records are built
+    lazily, so the caller decides whether to materialise the whole plan.
+    With `chunk_days`, the window is drawn that many days at a time so
+    memory no longer grows with its length (the draws, and so the plan,
+    then differ from a single batch with the same seed).
+    """
+    if end_date is None:
+        end_date = datetime.datetime.now()
+    if start_date is None:
+        start_date = end_date - datetime.timedelta(days=days)
+    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    rng = np.random.default_rng(seed)
+    first_day = np.datetime64(start_date.date(), "D").astype(np.int64)
+    if chunk_days is None:
+        yield from _plan_span(messages, files, start_date, end_date, rng, first_day, first_week,
+                              schedule_options)
+        return
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(end_date, chunk_start + datetime.timedelta(days=chunk_days) - datetime.timedelta(seconds=1))
+        yield from _plan_span(messages, files, chunk_start, chunk_end, rng, first_day, first_week,
+                              schedule_options)
+        chunk_start += datetime.timedelta(days=chunk_days)
+
+
+def _plan_span(messages, files, start_date, end_date, rng, first_day, first_week, schedule_options):
+    timestamps = schedule_timestamps(start_date, end_date, rng, **schedule_options)
+    file_choices = rng.integers(0, len(files), size=timestamps.size)
+    message_choices = rng.integers(0, len(messages), size=timestamps.size)
+
+    day_numbers = timestamps // 86400
+    weeks = (day_numbers - first_day) // 7 + first_week
+    # Position of each commit within its day: index minus the day's first index
+    day_starts = np.flatnonzero(np.r_[True, day_numbers[1:] != day_numbers[:-1]])
+    commit_nums = np.arange(timestamps.size) - np.repeat(day_starts, np.diff(np.r_[day_starts, timestamps.size]))
+    iso_times = np.datetime_as_string(timestamps.astype("datetime64[s]"), unit="s")
+
+    # `files` may be a weighted sampler (see path_index.PathSampler), so
+    # index it per draw and classify paths as they come up
+    kinds = {}
+    for timestamp, week, commit_num, file_index, message_index in zip(
+            iso_times.tolist(), weeks.tolist(), commit_nums.tolist(),
+            file_choices.tolist(), message_choices.tolist()):
+        path = files[file_index]
+        kind = kinds.get(path)
+        if kind is None:
+            kind = kinds[path] = mutation_kind(path)
+        yield PlannedCommit(
+            timestamp=timestamp,
+            week=week,
+            commit_num=commit_num,
+            path=path,
+            kind=kind,
+            message=f"{messages[message_index]} - Week {week}",
+        )